@@ -0,0 +1,132 @@
+import numpy as np
+
+from src.trading.technical_analysis.streaming_indicators import (
+    StreamingRelativeStrengthIndex,
+    StreamingSimpleMovingAverage,
+)
+
+BUY = 1
+SELL = -1
+HOLD = 0
+
+
+class Strategy:
+    """
+    Per-bar trading strategy over streaming indicators.
+
+    ``on_bar`` is fed one closed candle at a time and returns BUY, SELL or
+    HOLD. The live runtime and the backtester both drive strategies through
+    it, so their signals are produced by the same code.
+    """
+
+    name = None
+
+    def __init__(self, **params):
+        self.params = params
+
+    @property
+    def warmup(self):
+        """Closed bars needed before the strategy can signal"""
+        return 0
+
+    def on_bar(self, close):
+        """
+        Update indicator state with a closed bar and evaluate the strategy.
+
+        :param close: Close price of the bar
+        :return: BUY, SELL or HOLD
+        """
+        raise NotImplementedError
+
+
+class MovingAverageCross(Strategy):
+    """Long while the fast SMA is above the slow SMA, out while it is below"""
+
+    name = 'MovingAverageCross'
+
+    def __init__(self, fast_ma=20, slow_ma=50):
+        super().__init__(fast_ma=fast_ma, slow_ma=slow_ma)
+        self.fast = StreamingSimpleMovingAverage(fast_ma)
+        self.slow = StreamingSimpleMovingAverage(slow_ma)
+
+    @property
+    def warmup(self):
+        return max(self.fast.period, self.slow.period)
+
+    def on_bar(self, close):
+        fast = self.fast.update(close)
+        slow = self.slow.update(close)
+        if fast > slow:
+            return BUY
+        if fast < slow:
+            return SELL
+        return HOLD
+
+
+class RSIStrategy(Strategy):
+    """Buy when RSI is oversold, sell when it is overbought"""
+
+    name = 'RSIStrategy'
+
+    def __init__(self, rsi_period=14, oversold=30, overbought=70):
+        super().__init__(rsi_period=rsi_period, oversold=oversold, overbought=overbought)
+        self.rsi = StreamingRelativeStrengthIndex(rsi_period)
+        self.oversold = oversold
+        self.overbought = overbought
+
+    @property
+    def warmup(self):
+        return self.rsi.period + 1
+
+    def on_bar(self, close):
+        rsi = self.rsi.update(close)
+        if rsi < self.oversold:
+            return BUY
+        if rsi > self.overbought:
+            return SELL
+        return HOLD
+
+
+STRATEGIES = {strategy.name: strategy for strategy in (MovingAverageCross, RSIStrategy)}
+
+
+def build_strategies(definitions):
+    """
+    Instantiate strategies from config entries.
+
+    :param definitions: List of {'name': ..., 'params': {...}} dicts as in config.yaml
+    :return: List of fresh Strategy instances
+    """
+    strategies = []
+    for definition in definitions:
+        name = definition['name']
+        if name not in STRATEGIES:
+            raise ValueError(f"Unknown strategy '{name}'")
+        strategies.append(STRATEGIES[name](**(definition.get('params') or {})))
+    return strategies
+
+
+def combine_signals(signals):
+    """Later strategies override earlier ones whenever they signal, as in BacktestEngine"""
+    combined = HOLD
+    for signal in signals:
+        if signal != HOLD:
+            combined = signal
+    return combined
+
+
+def evaluate_bar(strategies, close):
+    """Feed a closed bar to every strategy and return the combined signal"""
+    return combine_signals([strategy.on_bar(close) for strategy in strategies])
+
+
+def generate_signals(strategies, closes):
+    """
+    Run strategies over a close series bar by bar.
+
+    :param strategies: Fresh Strategy instances
+    :param closes: Sequence of close prices
+    :return: Array of combined signals, one per bar
+    """
+    return np.fromiter((evaluate_bar(strategies, close) for close in np.asarray(closes, dtype=np.float64).tolist()),
+                       dtype=np.int64, count=len(closes))
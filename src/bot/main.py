@@ -0,0 +1,44 @@
+import os
+import time
+
+from src.bot.strategy_runtime import StrategyRuntime
+from src.data.data_fetch.binance_data_fetch.binance_client import BinanceClient
+from src.data.data_fetch.binance_data_fetch.data_fetcher import DataFetcher
+from src.trading.execution.trade_executor import TradeExecutor
+from src.utils.config_loader import load_config
+from src.utils.logging_service import LoggingService
+
+STATS_INTERVAL_SECONDS = 300
+ORDER_JOURNAL_PATH = os.path.join('logs', 'orders.jsonl')
+
+
+def run_bot(config_path=None):
+    """Run the configured strategies live until interrupted"""
+    config = load_config(config_path) if config_path else load_config()
+    logger = LoggingService()
+    data_fetcher = DataFetcher()
+    executor = TradeExecutor(BinanceClient(), journal_path=ORDER_JOURNAL_PATH)
+    runtime = StrategyRuntime.from_config(
+        config,
+        executor,
+        history=lambda symbol, interval, limit: data_fetcher.fetch_candles(symbol, interval, limit)
+    )
+    runtime.start()
+    try:
+        while True:
+            time.sleep(STATS_INTERVAL_SECONDS)
+            stats = runtime.stats()
+            latency = stats['tick_to_order']
+            ack = stats['executor']['submit_to_ack']
+            logger.info("Bars processed: %d, orders sent: %d, tick-to-order p50/p99: %s/%s ms, "
+                        "submit-to-ack p50/p99: %s/%s ms", stats['bars_processed'], stats['orders_sent'],
+                        latency['p50_ms'], latency['p99_ms'], ack['p50_ms'], ack['p99_ms'])
+    except KeyboardInterrupt:
+        logger.info("Stopping strategy runtime")
+    finally:
+        runtime.stop()
+        executor.shutdown()
+
+
+if __name__ == "__main__":
+    run_bot()
@@ -0,0 +1,200 @@
+import threading
+import time
+
+import numpy as np
+
+from src.analysis.strategies.strategy import BUY, HOLD, SELL, build_strategies, evaluate_bar
+from src.data.data_fetch.binance_data_fetch.stream_manager import BinanceStreamManager
+from src.utils.latency_histogram import LatencyHistogram
+from src.utils.logging_service import LoggingService
+from src.utils.metrics import metrics
+
+
+class StrategyRuntime:
+    """
+    Drives the configured strategies from live klines and sends their orders
+    to a TradeExecutor.
+
+    Every closed kline is fed to the symbol's Strategy objects through
+    evaluate_bar, the same call BacktestEngine.run_strategy_backtest makes per
+    bar. Orders are queued on the executor when the combined signal flips,
+    which is when the backtester records a trade: BUY opens a long position,
+    SELL closes it. The stream thread never waits for an acknowledgement.
+    """
+
+    def __init__(self, executor, symbols, interval='1h', strategy_definitions=None, capital=10000.0,
+                 position_size=0.01, max_open_positions=3, manager=None, history=None):
+        """
+        :param executor: TradeExecutor receiving the orders
+        :param symbols: Trading pair symbols to trade
+        :param interval: Kline interval the strategies run on
+        :param strategy_definitions: Strategy entries as in config.yaml
+        :param capital: Account balance used to size positions
+        :param position_size: Fraction of capital per position
+        :param max_open_positions: Positions allowed open at once
+        :param manager: BinanceStreamManager (defaults to the shared one)
+        :param history: Callable (symbol, interval, limit) -> CandleFrame used to warm up indicators
+        """
+        self.executor = executor
+        self.symbols = [symbol.upper() for symbol in symbols]
+        self.interval = interval
+        self.capital = capital
+        self.position_size = position_size
+        self.max_open_positions = max_open_positions
+        self.manager = manager
+        self.history = history
+        self.logger = LoggingService()
+
+        definitions = strategy_definitions or []
+        self.strategies = {symbol: build_strategies(definitions) for symbol in self.symbols}
+        self.signal_state = {symbol: HOLD for symbol in self.symbols}
+        self.tick_to_order = LatencyHistogram('tick_to_order')
+        self.bar_evaluation = LatencyHistogram('bar_evaluation')
+        self.holdings = {symbol for symbol in self.symbols if executor.get_position(symbol) is not None}
+        self.bars_processed = 0
+        self.orders_sent = 0
+        self._lock = threading.Lock()
+        self._running = False
+
+    @classmethod
+    def from_config(cls, config, executor, **kwargs):
+        """
+        Build a runtime from a loaded config.yaml.
+
+        :param config: Dict from load_config
+        :param executor: TradeExecutor receiving the orders
+        :return: StrategyRuntime
+        """
+        risk = config.get('risk', {})
+        symbols = config.get('symbols') or [f"{config.get('quote_currency', 'BTC')}{config.get('base_currency', 'USDT')}"]
+        return cls(
+            executor,
+            symbols,
+            interval=config.get('timeframe', '1h'),
+            strategy_definitions=config.get('strategies', []),
+            position_size=risk.get('position_size', 0.01),
+            max_open_positions=config.get('max_open_positions', 3),
+            **kwargs
+        )
+
+    def warm_up(self):
+        """Feed recent closed candles through the strategies without trading"""
+        if self.history is None:
+            return
+        now = int(time.time() * 1000)
+        for symbol, strategies in self.strategies.items():
+            limit = max((strategy.warmup for strategy in strategies), default=0) + 1
+            try:
+                candles = self.history(symbol, self.interval, limit)
+            except Exception as e:
+                self.logger.error("Could not warm up strategies for %s: %s", symbol, e)
+                continue
+            closes = candles.close[candles.close_time < now] if candles.close_time is not None else candles.close
+            for close in np.asarray(closes, dtype=np.float64).tolist():
+                signal = evaluate_bar(strategies, close)
+                if signal != HOLD:
+                    self.signal_state[symbol] = signal
+            self.logger.info("Warmed up %s strategies on %d candles", symbol, len(closes))
+
+    def start(self):
+        """Warm up and subscribe to the kline streams"""
+        if self._running:
+            return
+        self.warm_up()
+        if self.manager is None:
+            self.manager = BinanceStreamManager.shared()
+        for symbol in self.symbols:
+            self.manager.subscribe(symbol, self.interval, self.on_kline)
+        self._running = True
+        self.logger.info("Strategy runtime started for %s on %s", ', '.join(self.symbols), self.interval)
+
+    def stop(self):
+        """Unsubscribe from the kline streams"""
+        if not self._running:
+            return
+        for symbol in self.symbols:
+            self.manager.unsubscribe(symbol, self.interval, self.on_kline)
+        self._running = False
+
+    def on_kline(self, kline):
+        """
+        Stream callback: refresh the executor's price cache and evaluate the
+        strategies on closed klines.
+
+        :param kline: Kline record from the stream manager
+        """
+        self.executor.prices.on_kline(kline)
+        if not kline.is_closed:
+            return
+        received = time.perf_counter()
+        strategies = self.strategies.get(kline.symbol)
+        if strategies is None:
+            return
+
+        with self._lock:
+            signal = evaluate_bar(strategies, kline.close)
+            self.bars_processed += 1
+            self.bar_evaluation.record(time.perf_counter() - received)
+            if signal == HOLD or signal == self.signal_state[kline.symbol]:
+                return
+            self.signal_state[kline.symbol] = signal
+            future = self._act(kline.symbol, signal, kline.close)
+
+        if future is not None:
+            latency = time.perf_counter() - received
+            self.tick_to_order.record(latency)
+            metrics.observe('strategy_tick_to_order_seconds', latency)
+            future.add_done_callback(lambda done, symbol=kline.symbol: self._on_ack(symbol, done.result()))
+
+    def _act(self, symbol, signal, price):
+        """
+        Queue the executor order for a signal flip without waiting for it.
+
+        Holdings are tracked here rather than read back from the executor,
+        whose positions only change once queued orders are acknowledged;
+        a failed order makes _on_ack reset the symbol from the executor.
+
+        :return: Order Future, or None when nothing is sent
+        """
+        if signal == BUY:
+            if symbol in self.holdings:
+                return None
+            if len(self.holdings) >= self.max_open_positions:
+                self.logger.warning("Skipping BUY %s: %d positions already open", symbol, self.max_open_positions)
+                return None
+            self.holdings.add(symbol)
+            return self.executor.submit_market_order(symbol, 'BUY', self.capital * self.position_size / price)
+        if signal == SELL and symbol in self.holdings:
+            self.holdings.discard(symbol)
+            return self.executor.submit_close_position(symbol)
+        return None
+
+    def _on_ack(self, symbol, order):
+        if 'error' in order or order.get('status') == 'PARTIALLY_FILLED':
+            # Acks arrive in order per symbol, so the executor's position is current here;
+            # a failed order or a partial close leaves it different from what _act assumed
+            with self._lock:
+                if self.executor.get_position(symbol) is None:
+                    self.holdings.discard(symbol)
+                else:
+                    self.holdings.add(symbol)
+        if 'error' in order:
+            self.logger.error("Order for %s failed: %s", symbol, order['error'])
+            return
+        with self._lock:
+            self.orders_sent += 1
+        self.logger.info("%s %.8f %s", order['side'], order['quantity'], symbol)
+
+    def stats(self):
+        """Signal state, counters and latency histograms"""
+        with self._lock:
+            return {
+                'symbols': self.symbols,
+                'interval': self.interval,
+                'signal_state': dict(self.signal_state),
+                'bars_processed': self.bars_processed,
+                'orders_sent': self.orders_sent,
+                'tick_to_order': self.tick_to_order.snapshot(),
+                'bar_evaluation': self.bar_evaluation.snapshot(),
+                'executor': self.executor.stats(),
+            }
@@ -0,0 +1,182 @@
+import asyncio
+import threading
+import time
+
+import aiohttp
+
+from .binance_client import (
+    BASE_URL, ResponseCache, response_cache,
+    TICKER_PRICE_TTL, TICKER_24HR_TTL, CLOSED_KLINES_TTL, record_rest_metrics,
+)
+from src.data.data_processing.kline_decoder import json_loads
+from src.utils.logging_service import LoggingService
+
+logger = LoggingService()
+
+
+class AsyncBinanceClient:
+    """
+    Asyncio client for Binance's REST API.
+
+    Requests share one pooled aiohttp session, at most ``max_concurrency`` are
+    in flight at once, and identical concurrent requests are coalesced into a
+    single round trip. Responses go through the same ResponseCache as
+    BinanceClient.
+    """
+
+    def __init__(self, base_url=BASE_URL, max_concurrency=10, timeout=10, cache=response_cache):
+        """
+        :param base_url: REST API root
+        :param max_concurrency: Maximum requests in flight (also the pool size)
+        :param timeout: Total request timeout in seconds
+        :param cache: ResponseCache shared with the sync client
+        """
+        self.base_url = base_url
+        self.max_concurrency = max_concurrency
+        self.timeout = timeout
+        self.cache = cache
+        self._session = None
+        self._semaphore = None
+        self._in_flight = {}
+
+    async def _get_session(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_concurrency, keepalive_timeout=60)
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._session
+
+    async def close(self):
+        """Close the pooled session"""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def _get(self, endpoint, params=None, ttl=0):
+        """
+        GET an endpoint, sharing the response with identical in-flight calls.
+
+        :param endpoint: Path below base_url, e.g. 'ticker/price'
+        :param params: Dict of query parameters
+        :param ttl: Seconds to cache the response, 0 to skip the cache, None to keep it
+        :return: Decoded JSON response
+        """
+        key = ResponseCache.make_key(endpoint, params)
+        if ttl != 0:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(self._request(endpoint, params))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        data = await asyncio.shield(task)
+        if ttl != 0:
+            self.cache.put(key, data, ttl)
+        return data
+
+    async def _request(self, endpoint, params):
+        session = await self._get_session()
+        async with self._semaphore:
+            started = time.perf_counter()
+            async with session.get(f"{self.base_url}/{endpoint}", params=params) as response:
+                record_rest_metrics(endpoint, started, response.headers)
+                response.raise_for_status()
+                return json_loads(await response.read())
+
+    async def get_ticker_price(self, symbol):
+        """
+        Fetch the current ticker price for a given symbol.
+
+        :param symbol: String. Trading pair symbol (e.g., 'BTCUSDT').
+        :return: Dict containing price details.
+        """
+        return await self._get("ticker/price", {"symbol": symbol}, ttl=TICKER_PRICE_TTL)
+
+    async def get_ticker_prices(self, symbols):
+        """
+        Fetch ticker prices for several symbols concurrently.
+
+        :param symbols: Iterable of trading pair symbols
+        :return: Dict mapping each symbol to its price details
+        """
+        symbols = list(symbols)
+        prices = await asyncio.gather(*(self.get_ticker_price(symbol) for symbol in symbols))
+        return dict(zip(symbols, prices))
+
+    async def get_trading_pairs(self):
+        """
+        Fetch all available USDT trading pairs.
+
+        :return: List of trading pairs and their current data
+        """
+        try:
+            data = await self._get("ticker/24hr", ttl=TICKER_24HR_TTL)
+            usdt_pairs = [item for item in data if item['symbol'].endswith('USDT')]
+            logger.info("Fetched %d USDT trading pairs", len(usdt_pairs))
+            return usdt_pairs
+        except Exception as e:
+            logger.error("Error fetching trading pairs: %s", e)
+            return []
+
+    async def get_historical_candles(self, symbol, interval="1d", limit=100, start_time=None, end_time=None):
+        """
+        Fetch historical OHLC (Open, High, Low, Close) data.
+
+        :param symbol: String. Trading pair symbol (e.g., 'BTCUSDT').
+        :param interval: String. Candlestick interval.
+        :param limit: Integer. Number of candles to fetch.
+        :param start_time: Integer. Unix timestamp in milliseconds (optional).
+        :param end_time: Integer. Unix timestamp in milliseconds (optional).
+        :return: List of candlestick data.
+        """
+        params = {
+            "symbol": symbol.upper(),
+            "interval": interval,
+            "limit": limit,
+        }
+        if start_time:
+            params["startTime"] = start_time
+        if end_time:
+            params["endTime"] = end_time
+
+        key = ResponseCache.make_key("klines", params)
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached
+
+        request_time = int(time.time() * 1000)
+        candles = await self._get("klines", params)
+        # Every candle in the window has closed, so it can never change
+        if end_time and end_time < request_time and candles and candles[-1][6] < request_time:
+            self.cache.put(key, candles, CLOSED_KLINES_TTL)
+        return candles
+
+
+class EventLoopThread:
+    """Runs an asyncio event loop on a daemon thread for synchronous callers."""
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        self.loop = asyncio.new_event_loop()
+        self.thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self.thread.start()
+
+    @classmethod
+    def shared(cls):
+        """Return the process-wide loop thread, starting it on first use"""
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = cls()
+            return cls._instance
+
+    def run(self, coroutine, timeout=None):
+        """Run a coroutine on the loop and block until it finishes"""
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result(timeout)
@@ -0,0 +1,90 @@
+import datetime
+
+from .async_binance_client import AsyncBinanceClient
+from ...data_processing.candle_frame import CandleFrame
+from src.utils.logging_service import LoggingService
+
+
+def date_to_milliseconds(date):
+    """Convert a YYYY-MM-DD date string to a Unix timestamp in milliseconds"""
+    if not date:
+        return None
+    return int(datetime.datetime.strptime(date, "%Y-%m-%d").timestamp() * 1000)
+
+
+class AsyncDataFetcher:
+    """Asyncio counterpart of DataFetcher built on AsyncBinanceClient."""
+
+    def __init__(self, client=None):
+        self.client = client or AsyncBinanceClient()
+        self.logger = LoggingService()
+
+    async def fetch_current_price(self, symbol="BTCUSDT"):
+        """
+        Fetch the current ticker price for a symbol.
+
+        :param symbol: String. Trading pair symbol (e.g., 'BTCUSDT').
+        :return: Dict containing the current price.
+        """
+        return await self.client.get_ticker_price(symbol)
+
+    async def fetch_current_prices(self, symbols):
+        """
+        Fetch the current ticker prices for several symbols concurrently.
+
+        :param symbols: Iterable of trading pair symbols.
+        :return: Dict mapping each symbol to its price details.
+        """
+        return await self.client.get_ticker_prices(symbols)
+
+    async def fetch_trading_pairs(self):
+        """Fetch all available USDT trading pairs"""
+        return await self.client.get_trading_pairs()
+
+    async def fetch_klines_data(self, symbol="BTCUSDT", interval="1h", limit=1000):
+        """
+        Fetch kline/candlestick data for charting.
+
+        :param symbol: Trading pair symbol
+        :param interval: Kline interval (1m, 3m, 5m, 15m, 30m, 1h, 2h, 4h, 6h, 8h, 12h, 1d, 3d, 1w, 1M)
+        :param limit: Number of klines to fetch
+        :return: List of formatted kline data
+        """
+        candles = await self.fetch_candles(symbol, interval, limit)
+        return candles.to_dicts()
+
+    async def fetch_candles(self, symbol="BTCUSDT", interval="1d", limit=100, start_time=None, end_time=None):
+        """
+        Fetch candlesticks as a columnar CandleFrame.
+
+        :param symbol: String. Trading pair symbol.
+        :param interval: String. Candlestick interval (e.g., '1d').
+        :param limit: Integer. Number of candles.
+        :param start_time: Integer. Unix timestamp in milliseconds (optional).
+        :param end_time: Integer. Unix timestamp in milliseconds (optional).
+        :return: CandleFrame
+        """
+        raw_data = await self.client.get_historical_candles(symbol, interval, limit, start_time, end_time)
+        return CandleFrame.from_raw(raw_data)
+
+    async def fetch_historical_data(self, symbol="BTCUSDT", interval="1d", limit=100, start_date=None, end_date=None):
+        """
+        Fetch historical candlestick data for a symbol.
+
+        :param symbol: String. Trading pair symbol.
+        :param interval: String. Candlestick interval (e.g., '1d').
+        :param limit: Integer. Number of candles.
+        :param start_date: String. Start date (YYYY-MM-DD, optional).
+        :param end_date: String. End date (YYYY-MM-DD, optional).
+        :return: List of formatted candlestick data.
+        """
+        candles = await self.fetch_candles(
+            symbol, interval, limit, date_to_milliseconds(start_date), date_to_milliseconds(end_date)
+        )
+        formatted_data = candles.to_historical_dicts()
+        self.logger.debug("Fetched historical data for %s - %d records", symbol, len(formatted_data))
+        return formatted_data
+
+    async def close(self):
+        """Close the underlying HTTP session"""
+        await self.client.close()
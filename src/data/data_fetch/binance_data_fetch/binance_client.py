@@ -1,11 +1,157 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
 import requests
+from requests.adapters import HTTPAdapter
+from src.data.data_processing.kline_decoder import json_loads
 from src.utils.logging_service import LoggingService
+from src.utils.metrics import metrics
 BASE_URL = "https://api.binance.us/api/v3"
 logger = LoggingService()
 
+# Connection pool and timeout defaults, see configure_session
+DEFAULT_POOL_SIZE = 10
+DEFAULT_TIMEOUT = (3.05, 10)
+
+# Seconds a cached response stays fresh; None caches until evicted
+TICKER_PRICE_TTL = 2
+TICKER_24HR_TTL = 10
+CLOSED_KLINES_TTL = None
+
+
+class ResponseCache:
+    """Thread-safe TTL/LRU cache of decoded API responses with hit/miss counters."""
+
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(endpoint, params=None):
+        """Build a cache key from the endpoint and its query parameters"""
+        return endpoint, tuple(sorted((params or {}).items()))
+
+    def get(self, key):
+        """Return the cached value, or None when missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires_at, value = entry
+                if expires_at is None or expires_at > time.monotonic():
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value, ttl):
+        """Store a value for ttl seconds (None keeps it until evicted)"""
+        with self._lock:
+            self._entries[key] = (None if ttl is None else time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop every cached response"""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        """Return hit/miss counters and the number of cached entries"""
+        with self._lock:
+            return {'hits': self.hits, 'misses': self.misses, 'entries': len(self._entries)}
+
+
+response_cache = ResponseCache()
+_session = None
+_timeout = DEFAULT_TIMEOUT
+_session_lock = threading.RLock()
+
+
+def configure_session(pool_size=DEFAULT_POOL_SIZE, timeout=DEFAULT_TIMEOUT):
+    """
+    (Re)create the shared keep-alive session used by every BinanceClient call.
+
+    :param pool_size: Maximum pooled connections per host
+    :param timeout: Request timeout in seconds, or a (connect, read) tuple
+    :return: The shared requests.Session
+    """
+    global _session, _timeout
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    with _session_lock:
+        previous, _session, _timeout = _session, session, timeout
+    if previous is not None:
+        previous.close()
+    return session
+
+
+def get_session():
+    """Return the shared pooled session, creating it on first use"""
+    with _session_lock:
+        if _session is None:
+            configure_session()
+        return _session
+
+
+def record_rest_metrics(endpoint, started, headers):
+    """
+    Export a REST call's latency and the weight Binance reports as used.
+
+    :param endpoint: Path below BASE_URL, used as the metric label
+    :param started: time.perf_counter() taken before the request
+    :param headers: Response headers
+    """
+    if not metrics.enabled:
+        return
+    metrics.observe('binance_rest_request_duration_seconds', time.perf_counter() - started, endpoint=endpoint)
+    used_weight = headers.get('X-MBX-USED-WEIGHT-1M') or headers.get('X-MBX-USED-WEIGHT')
+    if used_weight is not None:
+        metrics.set_gauge('binance_used_weight_1m', int(used_weight))
+
+
 class BinanceClient:
     """A client to interact with Binance's REST API."""
 
+    @staticmethod
+    def _get(endpoint, params=None, ttl=0):
+        """
+        GET an endpoint through the shared session and response cache.
+
+        :param endpoint: Path below BASE_URL, e.g. 'ticker/price'
+        :param params: Dict of query parameters
+        :param ttl: Seconds to cache the response, 0 to skip the cache, None to keep it
+        :return: Decoded JSON response
+        """
+        key = ResponseCache.make_key(endpoint, params)
+        if ttl != 0:
+            cached = response_cache.get(key)
+            if cached is not None:
+                return cached
+
+        started = time.perf_counter()
+        response = get_session().get(f"{BASE_URL}/{endpoint}", params=params, timeout=_timeout)
+        record_rest_metrics(endpoint, started, response.headers)
+        response.raise_for_status()  # Raise error for HTTP issues
+        data = json_loads(response.content)
+        if ttl != 0:
+            response_cache.put(key, data, ttl)
+        return data
+
+    @staticmethod
+    def cache_stats():
+        """Hit/miss counters of the shared response cache"""
+        return response_cache.stats()
+
     @staticmethod
     def get_ticker_price(symbol):
         """
@@ -14,31 +160,25 @@ class BinanceClient:
         :param symbol: String. Trading pair symbol (e.g., 'BTCUSDT').
         :return: Dict containing price details.
         """
-        url = f"{BASE_URL}/ticker/price"
-        response = requests.get(url, params={"symbol": symbol})
-        logger.debug(f"Fetching ticker price for {symbol}")
-        response.raise_for_status()
-        return response.json()
+        logger.debug("Fetching ticker price for %s", symbol)
+        return BinanceClient._get("ticker/price", {"symbol": symbol}, ttl=TICKER_PRICE_TTL)
 
     @staticmethod
     def get_trading_pairs():
         """
         Fetch all available USDT trading pairs.
-        
+
         :return: List of trading pairs and their current data
         """
         try:
-            url = f"{BASE_URL}/ticker/24hr"
-            response = requests.get(url)
-            response.raise_for_status()
-            logger.debug(f"Raw API response status: {response.status_code}")
-            data = response.json()
+            data = BinanceClient._get("ticker/24hr", ttl=TICKER_24HR_TTL)
             usdt_pairs = [item for item in data if item['symbol'].endswith('USDT')]
-            logger.info(f"Fetched {len(usdt_pairs)} USDT trading pairs")
-            logger.debug(f"First few USDT pairs: {usdt_pairs[:3]}")
+            logger.info("Fetched %d USDT trading pairs", len(usdt_pairs))
+            if logger.is_enabled(logging.DEBUG):
+                logger.debug("First few USDT pairs: %s", usdt_pairs[:3])
             return usdt_pairs
         except Exception as e:
-            logger.error(f"Error fetching trading pairs: {str(e)}")
+            logger.error("Error fetching trading pairs: %s", e)
             return []
 
     @staticmethod
@@ -46,6 +186,8 @@ class BinanceClient:
         """
         Fetch historical OHLC (Open, High, Low, Close) data.
 
+        Windows that end in the past are fully closed and cached until evicted.
+
         :param symbol: String. Trading pair symbol (e.g., 'BTCUSDT').
         :param interval: String. Candlestick interval.
         :param limit: Integer. Number of candles to fetch.
@@ -53,7 +195,6 @@ class BinanceClient:
         :param end_time: Integer. Unix timestamp in milliseconds (optional).
         :return: List of candlestick data.
         """
-        url = f"{BASE_URL}/klines"
         params = {
             "symbol": symbol.upper(),
             "interval": interval,
@@ -64,6 +205,14 @@ class BinanceClient:
         if end_time:
             params["endTime"] = end_time
 
-        response = requests.get(url, params=params)
-        response.raise_for_status()  # Raise error for HTTP issues
-        return response.json()
+        key = ResponseCache.make_key("klines", params)
+        cached = response_cache.get(key)
+        if cached is not None:
+            return cached
+
+        request_time = int(time.time() * 1000)
+        candles = BinanceClient._get("klines", params)
+        # Every candle in the window has closed, so it can never change
+        if end_time and end_time < request_time and candles and candles[-1][6] < request_time:
+            response_cache.put(key, candles, CLOSED_KLINES_TTL)
+        return candles
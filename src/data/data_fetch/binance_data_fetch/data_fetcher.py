@@ -1,14 +1,37 @@
 from .binance_client import BinanceClient
 from .websocket_client import BinanceWebSocket
-from ...data_processing.data_formatter import DataFormatter
+from .kline_downloader import KlineDownloader
+from .async_binance_client import EventLoopThread
+from .async_data_fetcher import AsyncDataFetcher, date_to_milliseconds
+from ...data_processing.candle_frame import CandleFrame
 import datetime
+import threading
 from src.utils.logging_service import LoggingService
 
+_shared_async_fetcher = None
+_shared_async_fetcher_lock = threading.Lock()
+
+
+def _default_async_fetcher():
+    """AsyncDataFetcher shared by every DataFetcher, so they share one connection pool"""
+    global _shared_async_fetcher
+    with _shared_async_fetcher_lock:
+        if _shared_async_fetcher is None:
+            _shared_async_fetcher = AsyncDataFetcher()
+        return _shared_async_fetcher
+
 class DataFetcher:
-    """Fetches and formats data by integrating the client and formatter."""
+    """
+    Fetches and formats data by integrating the client and formatter.
+
+    REST calls are a thin synchronous wrapper over AsyncDataFetcher, run on a
+    shared background event loop.
+    """
 
-    def __init__(self):
+    def __init__(self, async_fetcher=None):
         self.client = BinanceClient()
+        self.async_fetcher = async_fetcher or _default_async_fetcher()
+        self.event_loop = EventLoopThread.shared()
         self.logger = LoggingService()
 
     def fetch_current_price(self, symbol="BTCUSDT"):
@@ -18,7 +41,16 @@ class DataFetcher:
         :param symbol: String. Trading pair symbol (e.g., 'BTCUSDT').
         :return: Dict containing the current price.
         """
-        return self.client.get_ticker_price(symbol)
+        return self.event_loop.run(self.async_fetcher.fetch_current_price(symbol))
+
+    def fetch_current_prices(self, symbols):
+        """
+        Fetch the current ticker prices for several symbols concurrently.
+
+        :param symbols: Iterable of trading pair symbols.
+        :return: Dict mapping each symbol to its price details.
+        """
+        return self.event_loop.run(self.async_fetcher.fetch_current_prices(symbols))
     
     def fetch_klines_data(self, symbol="BTCUSDT", interval="1h", limit=1000):
         """
@@ -29,13 +61,11 @@ class DataFetcher:
         :param limit: Number of klines to fetch
         :return: List of formatted kline data
         """
-        raw_data = self.client.get_historical_candles(symbol, interval, limit)
-        formatted_data = DataFormatter.format_klines(raw_data)
-        return formatted_data
+        return self.event_loop.run(self.async_fetcher.fetch_klines_data(symbol, interval, limit))
 
-    def fetch_realtime_data(self, symbol="BTCUSDT", callback=None):
+    def fetch_realtime_data(self, symbol="BTCUSDT", callback=None, interval="1m"):
         """Fetch real-time data using WebSocket"""
-        websocket_client = BinanceWebSocket(symbol, callback)
+        websocket_client = BinanceWebSocket(symbol, callback, interval)
         websocket_client.connect()
         return websocket_client
 
@@ -50,16 +80,54 @@ class DataFetcher:
         :param end_date: String. End date (YYYY-MM-DD, optional).
         :return: List of formatted candlestick data.
         """
-        start_time = None
-        end_time = None
-
-        # Convert datetime if dates are provided
-        if start_date:
-            start_time = int(datetime.datetime.strptime(start_date, "%Y-%m-%d").timestamp() * 1000)
-        if end_date:
-            end_time = int(datetime.datetime.strptime(end_date, "%Y-%m-%d").timestamp() * 1000)
-
-        raw_data = self.client.get_historical_candles(symbol, interval, limit, start_time, end_time)
-        formatted_data = DataFormatter.format_historical_candles(raw_data)
-        self.logger.debug(f"Fetched historical data for {symbol} - {len(formatted_data)} records")
+        return self.event_loop.run(
+            self.async_fetcher.fetch_historical_data(symbol, interval, limit, start_date, end_date)
+        )
+
+    def fetch_candles(self, symbol="BTCUSDT", interval="1d", limit=100, start_time=None, end_time=None):
+        """
+        Fetch candlesticks as a columnar CandleFrame.
+
+        :param symbol: String. Trading pair symbol.
+        :param interval: String. Candlestick interval (e.g., '1d').
+        :param limit: Integer. Number of candles.
+        :param start_time: Integer. Unix timestamp in milliseconds (optional).
+        :param end_time: Integer. Unix timestamp in milliseconds (optional).
+        :return: CandleFrame
+        """
+        return self.event_loop.run(self.async_fetcher.fetch_candles(symbol, interval, limit, start_time, end_time))
+
+    def fetch_candle_range(self, symbol="BTCUSDT", interval="1d", start_time=None, end_time=None, max_workers=4):
+        """
+        Fetch every candle in [start_time, end_time) as one CandleFrame, paging
+        through the range with concurrent rate-limited requests.
+
+        :param symbol: String. Trading pair symbol.
+        :param interval: String. Candlestick interval (e.g., '1m').
+        :param start_time: Integer. Unix timestamp in milliseconds.
+        :param end_time: Integer. Unix timestamp in milliseconds (exclusive, defaults to now).
+        :param max_workers: Integer. Number of pages fetched concurrently.
+        :return: CandleFrame
+        """
+        end_time = end_time or int(datetime.datetime.now().timestamp() * 1000)
+        raw_data = KlineDownloader(max_workers=max_workers).download(symbol, interval, start_time, end_time)
+        return CandleFrame.from_raw(raw_data)
+
+    def fetch_historical_range(self, symbol="BTCUSDT", interval="1d", start_date=None, end_date=None, max_workers=4):
+        """
+        Fetch every candle in [start_date, end_date), paging through the range
+        with concurrent rate-limited requests.
+
+        :param symbol: String. Trading pair symbol.
+        :param interval: String. Candlestick interval (e.g., '1m').
+        :param start_date: String. Start date (YYYY-MM-DD).
+        :param end_date: String. End date (YYYY-MM-DD, exclusive, defaults to now).
+        :param max_workers: Integer. Number of pages fetched concurrently.
+        :return: List of formatted candlestick data.
+        """
+        candles = self.fetch_candle_range(
+            symbol, interval, date_to_milliseconds(start_date), date_to_milliseconds(end_date), max_workers
+        )
+        formatted_data = candles.to_historical_dicts()
+        self.logger.debug("Fetched historical range for %s - %d records", symbol, len(formatted_data))
         return formatted_data
@@ -0,0 +1,211 @@
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .binance_client import BASE_URL, get_session, record_rest_metrics
+from src.data.data_processing.kline_decoder import json_loads
+from src.utils.logging_service import LoggingService
+
+# Interval lengths in milliseconds; 1M is sized for the longest month so a
+# window never holds more than `limit` candles
+INTERVAL_MILLISECONDS = {
+    '1s': 1000,
+    '1m': 60_000,
+    '3m': 3 * 60_000,
+    '5m': 5 * 60_000,
+    '15m': 15 * 60_000,
+    '30m': 30 * 60_000,
+    '1h': 3_600_000,
+    '2h': 2 * 3_600_000,
+    '4h': 4 * 3_600_000,
+    '6h': 6 * 3_600_000,
+    '8h': 8 * 3_600_000,
+    '12h': 12 * 3_600_000,
+    '1d': 86_400_000,
+    '3d': 3 * 86_400_000,
+    '1w': 7 * 86_400_000,
+    '1M': 31 * 86_400_000,
+}
+
+RATE_LIMITED_STATUS_CODES = (429, 418)
+
+
+class RateLimiter:
+    """
+    Tracks Binance request weight from response headers and pauses callers
+    before the per-minute limit is hit or after a 429/418 response.
+    """
+
+    def __init__(self, weight_limit=1200, safety_margin=0.9):
+        """
+        :param weight_limit: Request weight allowed per minute
+        :param safety_margin: Fraction of the limit at which requests are held back
+        """
+        self.weight_limit = weight_limit
+        self.safety_margin = safety_margin
+        self.used_weight = 0
+        self._resume_at = 0.0
+        self._lock = threading.Lock()
+        self.logger = LoggingService()
+
+    def wait(self):
+        """Block until requests may be sent again"""
+        while True:
+            with self._lock:
+                delay = self._resume_at - time.monotonic()
+            if delay <= 0:
+                return
+            time.sleep(delay)
+
+    def record(self, response):
+        """Update the weight budget from a response"""
+        used_weight = response.headers.get('X-MBX-USED-WEIGHT-1M') or response.headers.get('X-MBX-USED-WEIGHT')
+        with self._lock:
+            if used_weight is not None:
+                self.used_weight = int(used_weight)
+                if self.used_weight >= self.weight_limit * self.safety_margin:
+                    # Weight is counted per wall-clock minute
+                    self._pause(60 - time.time() % 60)
+            if response.status_code in RATE_LIMITED_STATUS_CODES:
+                retry_after = response.headers.get('Retry-After')
+                self._pause(float(retry_after) if retry_after else 0)
+
+    def backoff(self, attempt, base_delay=1.0, max_delay=60.0):
+        """Pause all callers with exponential backoff and jitter"""
+        with self._lock:
+            self._pause(min(max_delay, base_delay * 2 ** attempt) * random.uniform(0.5, 1.0))
+
+    def _pause(self, seconds):
+        if seconds > 0:
+            self._resume_at = max(self._resume_at, time.monotonic() + seconds)
+            self.logger.warning("Binance rate limit reached, pausing requests for %.1fs", seconds)
+
+
+class KlineDownloader:
+    """Downloads a historical kline range as concurrent, rate-limited pages."""
+
+    def __init__(self, base_url=BASE_URL, max_workers=4, limit=1000, max_retries=5,
+                 rate_limiter=None, session=None, timeout=10):
+        """
+        :param base_url: REST API root, e.g. a local stub server in tests
+        :param max_workers: Number of pages fetched concurrently
+        :param limit: Candles per page (Binance allows up to 1000)
+        :param max_retries: Attempts per page on rate limits and transient errors
+        :param rate_limiter: Shared RateLimiter (one is created when omitted)
+        :param session: requests.Session to use (defaults to the shared BinanceClient pool)
+        :param timeout: Request timeout in seconds
+        """
+        self.base_url = base_url
+        self.max_workers = max_workers
+        self.limit = limit
+        self.max_retries = max_retries
+        self.rate_limiter = rate_limiter or RateLimiter()
+        self.timeout = timeout
+        self.logger = LoggingService()
+        self.session = session or get_session()
+
+    def split_windows(self, interval, start_time, end_time):
+        """
+        Split [start_time, end_time) into page-sized (startTime, endTime) windows.
+
+        :param interval: Candlestick interval, e.g. '1m'
+        :param start_time: Unix timestamp in milliseconds (inclusive)
+        :param end_time: Unix timestamp in milliseconds (exclusive)
+        :return: List of (start_time, end_time) tuples with inclusive end times
+        """
+        if interval not in INTERVAL_MILLISECONDS:
+            raise ValueError(f"Unsupported interval '{interval}'")
+        span = INTERVAL_MILLISECONDS[interval] * self.limit
+        return [(window_start, min(window_start + span, end_time) - 1)
+                for window_start in range(start_time, end_time, span)]
+
+    def download(self, symbol, interval, start_time, end_time):
+        """
+        Download every candle opening in [start_time, end_time).
+
+        :param symbol: Trading pair symbol (e.g., 'BTCUSDT')
+        :param interval: Candlestick interval
+        :param start_time: Unix timestamp in milliseconds (inclusive)
+        :param end_time: Unix timestamp in milliseconds (exclusive)
+        :return: List of raw Binance kline arrays ordered by open time
+        """
+        windows = self.split_windows(interval, start_time, end_time)
+        self.logger.info("Downloading %s %s klines in %d pages", symbol, interval, len(windows))
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pages = list(executor.map(lambda window: self._fetch_window(symbol, interval, *window), windows))
+        return self.merge_pages(pages, start_time, end_time)
+
+    def iter_pages(self, symbol, interval, start_time, end_time):
+        """
+        Yield pages in order while keeping at most max_workers pages in flight.
+
+        :return: Generator of lists of raw kline arrays
+        """
+        windows = self.split_windows(interval, start_time, end_time)
+        last_open_time = None
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = []
+            for window in windows:
+                pending.append(executor.submit(self._fetch_window, symbol, interval, *window))
+                if len(pending) >= self.max_workers:
+                    page = self.merge_pages([pending.pop(0).result()], start_time, end_time, last_open_time)
+                    last_open_time = page[-1][0] if page else last_open_time
+                    yield page
+            for future in pending:
+                page = self.merge_pages([future.result()], start_time, end_time, last_open_time)
+                last_open_time = page[-1][0] if page else last_open_time
+                yield page
+
+    @staticmethod
+    def merge_pages(pages, start_time, end_time, after=None):
+        """
+        Concatenate pages, dropping duplicates and candles outside the range.
+
+        :param pages: Lists of raw kline arrays in window order
+        :param start_time: Unix timestamp in milliseconds (inclusive)
+        :param end_time: Unix timestamp in milliseconds (exclusive)
+        :param after: Only keep candles opening after this timestamp
+        :return: List of raw kline arrays ordered by open time
+        """
+        merged = {}
+        for page in pages:
+            for candle in page:
+                open_time = candle[0]
+                if start_time <= open_time < end_time and (after is None or open_time > after):
+                    merged.setdefault(open_time, candle)
+        return [merged[open_time] for open_time in sorted(merged)]
+
+    def _fetch_window(self, symbol, interval, start_time, end_time):
+        params = {
+            "symbol": symbol.upper(),
+            "interval": interval,
+            "limit": self.limit,
+            "startTime": start_time,
+            "endTime": end_time,
+        }
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.wait()
+            started = time.perf_counter()
+            try:
+                response = self.session.get(f"{self.base_url}/klines", params=params, timeout=self.timeout)
+            except requests.RequestException as e:
+                if attempt == self.max_retries:
+                    raise
+                self.logger.warning("Kline page %s %s failed: %s, retrying", symbol, start_time, e)
+                self.rate_limiter.backoff(attempt)
+                continue
+
+            record_rest_metrics('klines', started, response.headers)
+            self.rate_limiter.record(response)
+            if response.status_code in RATE_LIMITED_STATUS_CODES or response.status_code >= 500:
+                if attempt == self.max_retries:
+                    response.raise_for_status()
+                if 'Retry-After' not in response.headers:
+                    self.rate_limiter.backoff(attempt)
+                continue
+
+            response.raise_for_status()
+            return json_loads(response.content)
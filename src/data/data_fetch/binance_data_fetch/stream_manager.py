@@ -0,0 +1,272 @@
+import collections
+import itertools
+import json
+import random
+import socket
+import threading
+import time
+
+import websocket
+
+from src.data.data_processing.kline_decoder import decode_kline_event, json_loads
+from src.utils.logging_service import LoggingService
+from src.utils.metrics import metrics
+
+COMBINED_STREAM_ENDPOINT = "wss://stream.binance.us:9443/stream"
+
+
+def kline_stream_name(symbol, interval="1m"):
+    """Binance stream name for a symbol's klines, e.g. 'btcusdt@kline_1m'"""
+    return f"{symbol.lower()}@kline_{interval}"
+
+
+class BinanceStreamManager:
+    """
+    Multiplexes many kline streams over one Binance combined-stream socket.
+
+    A single supervisor thread owns the connection and reconnects with
+    exponential backoff and jitter. The socket reader only parses the JSON
+    envelope and queues the frames; a dispatcher thread decodes the klines and
+    runs the callbacks, so a slow consumer never stalls the reader. While the
+    dispatcher is behind, in-progress frames of a stream are coalesced into
+    the newest one; closed klines are always delivered, in order.
+    """
+
+    _shared = None
+    _shared_lock = threading.Lock()
+
+    def __init__(self, endpoint=COMBINED_STREAM_ENDPOINT, base_delay=1.0, max_delay=60.0):
+        """
+        :param endpoint: Combined-stream URL without the streams query
+        :param base_delay: First reconnect delay in seconds
+        :param max_delay: Upper bound of the reconnect delay in seconds
+        """
+        self.endpoint = endpoint
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.logger = LoggingService()
+        # One-item [frame] slots in arrival order. The queued slot of a stream's
+        # in-progress frame is also in _live_frames, where newer frames overwrite it
+        self.frames = collections.deque()
+        self._live_frames = {}
+        self._frames_ready = threading.Condition()
+        self.coalesced_frames = 0
+
+        self._callbacks = {}
+        self._active_streams = set()
+        self._lock = threading.Lock()
+        self._has_streams = threading.Event()
+        self._stopping = threading.Event()
+        self._request_ids = itertools.count(1)
+        self.ws = None
+        self._supervisor = None
+        self._dispatcher = None
+
+    @classmethod
+    def shared(cls):
+        """Return the process-wide manager, starting it on first use"""
+        with cls._shared_lock:
+            if cls._shared is None:
+                cls._shared = cls()
+                cls._shared.start()
+            return cls._shared
+
+    def start(self):
+        """Start the supervisor and dispatcher threads"""
+        if self._supervisor is not None:
+            return
+        self._stopping.clear()
+        self._supervisor = threading.Thread(target=self._supervise, name='binance-stream-supervisor', daemon=True)
+        self._dispatcher = threading.Thread(target=self._dispatch, name='binance-stream-dispatcher', daemon=True)
+        self._supervisor.start()
+        self._dispatcher.start()
+
+    def stop(self, timeout=5):
+        """Close the connection and stop both threads"""
+        self._stopping.set()
+        self._has_streams.set()
+        ws = self.ws
+        if ws is not None:
+            ws.keep_running = False
+            raw_socket = ws.sock.sock if ws.sock is not None else None
+            if raw_socket is not None:
+                # Wake the reader, which otherwise sits in select until the ping timeout
+                try:
+                    raw_socket.shutdown(socket.SHUT_RDWR)
+                except OSError:
+                    pass
+            ws.close()
+        for thread in (self._supervisor, self._dispatcher):
+            if thread is not None:
+                thread.join(timeout)
+        self._supervisor = self._dispatcher = None
+
+    def subscribe(self, symbol, interval="1m", callback=None):
+        """
+        Subscribe a callback to a symbol's kline stream.
+
+        :param symbol: Trading pair symbol
+        :param interval: Kline interval
+        :param callback: Callable receiving Kline records
+        :return: Stream name
+        """
+        stream = kline_stream_name(symbol, interval)
+        with self._lock:
+            callbacks = self._callbacks.setdefault(stream, [])
+            if callback is not None:
+                callbacks.append(callback)
+            needs_subscribe = stream not in self._active_streams and self._is_connected()
+            if needs_subscribe:
+                self._active_streams.add(stream)
+        if needs_subscribe:
+            self._send('SUBSCRIBE', [stream])
+        self._has_streams.set()
+        return stream
+
+    def unsubscribe(self, symbol, interval="1m", callback=None):
+        """
+        Remove a callback, or every callback when none is given. The stream
+        itself is unsubscribed once no callbacks remain.
+        """
+        stream = kline_stream_name(symbol, interval)
+        with self._lock:
+            callbacks = self._callbacks.get(stream, [])
+            if callback is not None and callback in callbacks:
+                callbacks.remove(callback)
+            if callback is None or not callbacks:
+                self._callbacks.pop(stream, None)
+            needs_unsubscribe = stream not in self._callbacks and stream in self._active_streams
+            if needs_unsubscribe:
+                self._active_streams.discard(stream)
+            if not self._callbacks:
+                self._has_streams.clear()
+        if needs_unsubscribe and self._is_connected():
+            self._send('UNSUBSCRIBE', [stream])
+
+    def streams(self):
+        """Names of the currently subscribed streams"""
+        with self._lock:
+            return sorted(self._callbacks)
+
+    def _is_connected(self):
+        return self.ws is not None and self.ws.sock is not None and self.ws.sock.connected
+
+    def _send(self, method, streams):
+        try:
+            self.ws.send(json.dumps({'method': method, 'params': streams, 'id': next(self._request_ids)}))
+        except Exception as e:
+            # The supervisor resubscribes everything on the next connection
+            self.logger.warning("Could not %s %s: %s", method.lower(), streams, e)
+
+    def _supervise(self):
+        attempt = 0
+        while not self._stopping.is_set():
+            self._has_streams.wait()
+            if self._stopping.is_set():
+                break
+            with self._lock:
+                streams = sorted(self._callbacks)
+                self._active_streams = set(streams)
+            if not streams:
+                continue
+
+            opened = threading.Event()
+            self.ws = websocket.WebSocketApp(
+                f"{self.endpoint}?streams={'/'.join(streams)}",
+                on_open=lambda ws: self._on_open(ws, opened),
+                on_message=self._on_message,
+                on_error=self._on_error,
+                on_close=self._on_close
+            )
+            self.ws.run_forever(ping_interval=180, ping_timeout=10)
+            if self._stopping.is_set():
+                break
+
+            attempt = 0 if opened.is_set() else attempt + 1
+            delay = min(self.max_delay, self.base_delay * 2 ** attempt) * random.uniform(0.5, 1.0)
+            self.logger.warning("Stream connection lost, reconnecting in %.1fs", delay)
+            self._stopping.wait(delay)
+
+    def _on_open(self, ws, opened):
+        opened.set()
+        self.logger.info("Combined stream connection established")
+        # Pick up streams subscribed while the connection was being set up
+        with self._lock:
+            missing = sorted(set(self._callbacks) - self._active_streams)
+            self._active_streams.update(missing)
+        if missing:
+            self._send('SUBSCRIBE', missing)
+
+    def _on_message(self, ws, message):
+        frame = json_loads(message)
+        payload = frame.get('data')
+        if payload is None or payload.get('e') != 'kline':
+            return
+        stream = frame['stream']
+        metrics.increment('stream_messages_total', stream=stream)
+        with self._frames_ready:
+            live_slot = self._live_frames.get(stream)
+            if payload['k']['x']:
+                if live_slot is not None:
+                    # The closed kline supersedes the in-progress frame still queued
+                    live_slot[0] = None
+                    del self._live_frames[stream]
+                self.frames.append([frame])
+            elif live_slot is not None:
+                live_slot[0] = frame
+                self.coalesced_frames += 1
+                metrics.increment('stream_frames_coalesced_total')
+                return
+            else:
+                live_slot = self._live_frames[stream] = [frame]
+                self.frames.append(live_slot)
+            self._frames_ready.notify()
+
+    def _on_error(self, ws, error):
+        """Handle errors"""
+        self.logger.error("WebSocket error: %s", error)
+
+    def _on_close(self, ws, close_status_code, close_msg):
+        """Handle connection close"""
+        self.logger.warning("WebSocket connection closed: %s", close_msg)
+
+    def _next_frame(self, timeout=0.5):
+        """Pop the next frame to dispatch, or None after timeout"""
+        with self._frames_ready:
+            while True:
+                if not self.frames:
+                    if not self._frames_ready.wait(timeout):
+                        return None
+                    continue
+                slot = self.frames.popleft()
+                frame = slot[0]
+                if frame is None:
+                    # A closed kline superseded it
+                    continue
+                if self._live_frames.get(frame['stream']) is slot:
+                    del self._live_frames[frame['stream']]
+                return frame
+
+    def _dispatch(self):
+        while not self._stopping.is_set():
+            frame = self._next_frame()
+            if frame is None:
+                continue
+            try:
+                self._handle_frame(frame)
+            except Exception as e:
+                self.logger.error("Error handling stream frame: %s", e)
+
+    def _handle_frame(self, frame):
+        payload = frame['data']
+        if metrics.enabled:
+            # Event time is Binance's clock, so skew can make the lag negative
+            metrics.observe('stream_message_lag_seconds', max(0.0, time.time() - payload['E'] / 1000))
+        with self._lock:
+            callbacks = list(self._callbacks.get(frame['stream'], ()))
+        if callbacks:
+            kline = decode_kline_event(payload)
+            self.logger.debug_every(frame['stream'], 10.0, "%s frame: close %s, closed %s",
+                                    frame['stream'], kline.close, kline.is_closed)
+            for callback in callbacks:
+                callback(kline)
@@ -0,0 +1,140 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+from .kline_decoder import decode_kline_columns
+
+# Column name -> dtype; times are epoch milliseconds
+CANDLE_FRAME_COLUMNS = {
+    'open_time': np.int64,
+    'open': np.float64,
+    'high': np.float64,
+    'low': np.float64,
+    'close': np.float64,
+    'volume': np.float64,
+    'close_time': np.int64,
+}
+
+
+class CandleFrame:
+    """
+    Columnar candles: one contiguous NumPy array per field.
+
+    Built straight from raw Binance kline arrays or CandleStore columns and
+    handed to pandas, indicators and storage without copying. Per-candle
+    dicts are only produced by the to_*dicts views at the API boundary.
+    """
+
+    __slots__ = tuple(CANDLE_FRAME_COLUMNS)
+
+    def __init__(self, open_time, open, high, low, close, volume, close_time=None):
+        """
+        :param open_time: Candle open times in epoch milliseconds
+        :param open: Open prices
+        :param high: High prices
+        :param low: Low prices
+        :param close: Close prices
+        :param volume: Base asset volumes
+        :param close_time: Candle close times in epoch milliseconds (optional)
+        """
+        self.open_time = np.asarray(open_time, dtype=np.int64)
+        self.open = np.asarray(open, dtype=np.float64)
+        self.high = np.asarray(high, dtype=np.float64)
+        self.low = np.asarray(low, dtype=np.float64)
+        self.close = np.asarray(close, dtype=np.float64)
+        self.volume = np.asarray(volume, dtype=np.float64)
+        self.close_time = None if close_time is None else np.asarray(close_time, dtype=np.int64)
+
+        lengths = {len(column) for column in self.columns().values()}
+        if len(lengths) > 1:
+            raise ValueError(f"CandleFrame columns differ in length: {sorted(lengths)}")
+
+    @classmethod
+    def from_raw(cls, raw_klines):
+        """Build a frame from a REST klines body or the decoded list of kline arrays"""
+        return cls(**decode_kline_columns(raw_klines))
+
+    @classmethod
+    def from_columns(cls, columns):
+        """Wrap a dict of column arrays, such as CandleStore.read output, without copying"""
+        return cls(**{name: columns[name] for name in CANDLE_FRAME_COLUMNS if name in columns})
+
+    @classmethod
+    def from_dataframe(cls, df):
+        """Wrap the OHLCV columns of a DataFrame; open_time falls back to the index"""
+        open_time = df['open_time'] if 'open_time' in df else df.index
+        return cls(
+            np.asarray(open_time), df['open'].to_numpy(), df['high'].to_numpy(), df['low'].to_numpy(),
+            df['close'].to_numpy(), df['volume'].to_numpy(),
+            df['close_time'].to_numpy() if 'close_time' in df else None
+        )
+
+    @classmethod
+    def empty(cls):
+        """A frame without candles"""
+        return cls(**{name: np.empty(0, dtype=dtype) for name, dtype in CANDLE_FRAME_COLUMNS.items()})
+
+    @classmethod
+    def concat(cls, frames):
+        """Join frames end to end (copies, since the result must be contiguous)"""
+        frames = list(frames)
+        if not frames:
+            return cls.empty()
+        columns = {name: np.concatenate([frame[name] for frame in frames])
+                   for name in CANDLE_FRAME_COLUMNS if all(frame[name] is not None for frame in frames)}
+        return cls(**columns)
+
+    def __len__(self):
+        return len(self.open_time)
+
+    def __getitem__(self, key):
+        """Column by name, or a frame of row views for a slice"""
+        if isinstance(key, str):
+            if key not in CANDLE_FRAME_COLUMNS:
+                raise KeyError(key)
+            return getattr(self, key)
+        if isinstance(key, slice):
+            return CandleFrame(**{name: column[key] for name, column in self.columns().items()})
+        raise TypeError(f"CandleFrame indices must be column names or slices, not {type(key).__name__}")
+
+    def columns(self):
+        """Dict of the column arrays present in this frame"""
+        return {name: getattr(self, name) for name in CANDLE_FRAME_COLUMNS if getattr(self, name) is not None}
+
+    def between(self, start_time=None, end_time=None):
+        """Rows opening in [start_time, end_time) as views"""
+        first = int(np.searchsorted(self.open_time, start_time, side='left')) if start_time is not None else 0
+        last = int(np.searchsorted(self.open_time, end_time, side='left')) if end_time is not None else len(self)
+        return self[first:last]
+
+    def to_dataframe(self):
+        """DataFrame sharing this frame's arrays"""
+        return pd.DataFrame(self.columns(), copy=False)
+
+    def to_dicts(self):
+        """Chart-friendly candle dicts with the time in seconds"""
+        times = (self.open_time / 1000).tolist()
+        return [
+            {'time': time, 'open': open_, 'high': high, 'low': low, 'close': close, 'volume': volume}
+            for time, open_, high, low, close, volume in zip(
+                times, self.open.tolist(), self.high.tolist(), self.low.tolist(),
+                self.close.tolist(), self.volume.tolist()
+            )
+        ]
+
+    def to_historical_dicts(self):
+        """Candle dicts with local 'YYYY-MM-DD HH:MM:SS' open and close times"""
+        def timestamps(times):
+            return [datetime.datetime.fromtimestamp(time / 1000).strftime('%Y-%m-%d %H:%M:%S')
+                    for time in times.tolist()]
+
+        close_times = timestamps(self.close_time) if self.close_time is not None else [None] * len(self)
+        return [
+            {'open_time': open_time, 'open': open_, 'high': high, 'low': low, 'close': close,
+             'volume': volume, 'close_time': close_time}
+            for open_time, open_, high, low, close, volume, close_time in zip(
+                timestamps(self.open_time), self.open.tolist(), self.high.tolist(), self.low.tolist(),
+                self.close.tolist(), self.volume.tolist(), close_times
+            )
+        ]
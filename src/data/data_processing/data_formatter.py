@@ -1,4 +1,4 @@
-import datetime
+from .candle_frame import CandleFrame
 
 class DataFormatter:
     @staticmethod
@@ -6,18 +6,7 @@ class DataFormatter:
         """
         Format raw klines data for charting library
         """
-        formatted_klines = []
-        for kline in klines_data:
-            formatted_kline = {
-                'time': kline[0] / 1000,  # Convert milliseconds to seconds
-                'open': float(kline[1]),
-                'high': float(kline[2]),
-                'low': float(kline[3]),
-                'close': float(kline[4]),
-                'volume': float(kline[5])
-            }
-            formatted_klines.append(formatted_kline)
-        return formatted_klines
+        return CandleFrame.from_raw(klines_data).to_dicts()
 
     @staticmethod
     def format_historical_candles(raw_candles):
@@ -27,15 +16,14 @@ class DataFormatter:
         :param raw_candles: List of raw candlestick data from Binance API.
         :return: List of formatted candlestick data.
         """
-        formatted_data = []
-        for candle in raw_candles:
-            formatted_data.append({
-                "open_time": datetime.datetime.fromtimestamp(candle[0] / 1000).strftime('%Y-%m-%d %H:%M:%S'),
-                "open": float(candle[1]),
-                "high": float(candle[2]),
-                "low": float(candle[3]),
-                "close": float(candle[4]),
-                "volume": float(candle[5]),
-                "close_time": datetime.datetime.fromtimestamp(candle[6] / 1000).strftime('%Y-%m-%d %H:%M:%S'),
-            })
-        return formatted_data
\ No newline at end of file
+        return CandleFrame.from_raw(raw_candles).to_historical_dicts()
+
+    @staticmethod
+    def format_candle_columns(columns):
+        """
+        Format column arrays read from the CandleStore for charting library
+
+        :param columns: Dict of open_time and OHLCV arrays
+        :return: List of formatted kline data
+        """
+        return CandleFrame.from_columns(columns).to_dicts()
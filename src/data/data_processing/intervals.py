@@ -0,0 +1,38 @@
+import numpy as np
+
+from src.data.data_fetch.binance_data_fetch.kline_downloader import INTERVAL_MILLISECONDS
+
+# Binance weeks open on Monday 00:00 UTC; the epoch fell on a Thursday
+WEEK_OFFSET_MS = 4 * 86_400_000
+
+
+def interval_period_ids(open_times, interval):
+    """
+    Number the Binance candle of ``interval`` that each open time falls in.
+
+    Fixed intervals are aligned to the epoch like Binance klines, weeks to
+    Monday and months to the calendar month, all in UTC. Consecutive equal
+    ids belong to the same higher-timeframe candle.
+
+    :param open_times: Open times in epoch milliseconds
+    :param interval: Target interval, e.g. '1h', '1w' or '1M'
+    :return: int64 array of period ids
+    """
+    open_times = np.asarray(open_times, dtype=np.int64)
+    if interval == '1M':
+        return open_times.astype('datetime64[ms]').astype('datetime64[M]').astype(np.int64)
+    if interval not in INTERVAL_MILLISECONDS:
+        raise ValueError(f"Unsupported interval '{interval}'")
+    if interval == '1w':
+        return (open_times - WEEK_OFFSET_MS) // INTERVAL_MILLISECONDS['1w']
+    return open_times // INTERVAL_MILLISECONDS[interval]
+
+
+def period_open_times(period_ids, interval):
+    """Open time in epoch milliseconds of each period id from interval_period_ids"""
+    period_ids = np.asarray(period_ids, dtype=np.int64)
+    if interval == '1M':
+        return period_ids.astype('datetime64[M]').astype('datetime64[ms]').astype(np.int64)
+    if interval == '1w':
+        return period_ids * INTERVAL_MILLISECONDS['1w'] + WEEK_OFFSET_MS
+    return period_ids * INTERVAL_MILLISECONDS[interval]
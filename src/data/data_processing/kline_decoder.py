@@ -0,0 +1,107 @@
+import json
+from typing import NamedTuple
+
+import numpy as np
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgspec
+except ImportError:
+    msgspec = None
+
+# Fastest available JSON parser; every backend accepts str and bytes
+if orjson is not None:
+    JSON_BACKEND = 'orjson'
+    json_loads = orjson.loads
+elif msgspec is not None:
+    JSON_BACKEND = 'msgspec'
+    json_loads = msgspec.json.decode
+else:
+    JSON_BACKEND = 'json'
+    json_loads = json.loads
+
+# Structured record for REST klines; field -> position in a raw Binance kline array
+KLINE_FIELDS = (
+    ('open_time', '<i8', 0),
+    ('open', '<f8', 1),
+    ('high', '<f8', 2),
+    ('low', '<f8', 3),
+    ('close', '<f8', 4),
+    ('volume', '<f8', 5),
+    ('close_time', '<i8', 6),
+)
+KLINE_DTYPE = np.dtype([(name, dtype) for name, dtype, _ in KLINE_FIELDS])
+
+
+class Kline(NamedTuple):
+    """A single kline update from a Binance kline stream"""
+    symbol: str
+    interval: str
+    open_time: int
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    is_closed: bool
+
+    def to_dict(self):
+        """Chart-friendly dict with the time in seconds"""
+        return {
+            'symbol': self.symbol,
+            'interval': self.interval,
+            'time': self.open_time / 1000,
+            'open': self.open,
+            'high': self.high,
+            'low': self.low,
+            'close': self.close,
+            'volume': self.volume,
+            'isClosed': self.is_closed
+        }
+
+
+def decode_kline_event(payload):
+    """
+    Convert a decoded 'kline' stream event into a Kline record.
+
+    :param payload: Decoded event with the kline under 'k'
+    :return: Kline
+    """
+    kline = payload['k']
+    return Kline(payload['s'], kline['i'], kline['t'], float(kline['o']), float(kline['h']),
+                 float(kline['l']), float(kline['c']), float(kline['v']), kline['x'])
+
+
+def decode_kline_columns(raw_klines):
+    """
+    Decode a REST klines response into one contiguous array per field.
+
+    :param raw_klines: Raw response body (str/bytes) or the already decoded list of kline arrays
+    :return: Dict mapping KLINE_FIELDS names to arrays
+    """
+    if isinstance(raw_klines, (str, bytes, bytearray, memoryview)):
+        raw_klines = json_loads(raw_klines)
+    if len(raw_klines) == 0:
+        return {name: np.empty(0, dtype=dtype) for name, dtype, _ in KLINE_FIELDS}
+    # Transposing in C and letting NumPy parse the price strings avoids a
+    # Python-level float() call per value
+    columns = list(zip(*raw_klines))
+    return {name: np.array(columns[position], dtype=dtype) for name, dtype, position in KLINE_FIELDS}
+
+
+def decode_klines(raw_klines):
+    """
+    Decode a REST klines response into a structured NumPy array.
+
+    :param raw_klines: Raw response body (str/bytes) or the already decoded list of kline arrays
+    :return: Array of KLINE_DTYPE records ordered as given
+    """
+    columns = decode_kline_columns(raw_klines)
+    records = np.empty(len(columns['open_time']), dtype=KLINE_DTYPE)
+    for name, column in columns.items():
+        records[name] = column
+    return records
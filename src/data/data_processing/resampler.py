@@ -0,0 +1,194 @@
+import threading
+
+import numpy as np
+
+from src.data.data_fetch.binance_data_fetch.kline_downloader import INTERVAL_MILLISECONDS
+from .candle_frame import CandleFrame
+from .intervals import interval_period_ids, period_open_times
+from .kline_decoder import Kline
+
+# Positions in an incremental bar list
+PERIOD_OPEN, PERIOD_END, OPEN, HIGH, LOW, CLOSE, VOLUME, LAST_BASE_OPEN = range(8)
+
+
+def check_resampleable(base_interval, interval):
+    """
+    Raise ValueError unless ``interval`` candles can be built from whole
+    ``base_interval`` candles.
+
+    Fixed intervals must be multiples of the base; weeks and months need a
+    base that divides a day, since they do not start on multiples of 3d.
+    """
+    for name in (base_interval, interval):
+        if name not in INTERVAL_MILLISECONDS:
+            raise ValueError(f"Unsupported interval '{name}'")
+    base = INTERVAL_MILLISECONDS[base_interval]
+    if interval in ('1w', '1M'):
+        divides = INTERVAL_MILLISECONDS['1d'] % base == 0
+    else:
+        divides = INTERVAL_MILLISECONDS[interval] % base == 0
+    if not divides or base > INTERVAL_MILLISECONDS[interval]:
+        raise ValueError(f"Cannot build {interval} candles from {base_interval} candles")
+
+
+def resample_candles(candles, interval, base_interval='1m', complete_only=False):
+    """
+    Aggregate candles into a higher timeframe aligned like Binance klines.
+
+    Periods come from interval_period_ids, so 1w opens on Monday and 1M on
+    the first of the month (UTC). Each output candle takes the first open,
+    highest high, lowest low, last close and summed volume of its base
+    candles, and the nominal Binance close time (next open - 1ms).
+
+    :param candles: CandleFrame of base candles ordered by open time
+    :param interval: Target interval, e.g. '4h', '1w' or '1M'
+    :param base_interval: Interval of the input candles
+    :param complete_only: Drop the last candle when the base candles do not reach its end
+    :return: CandleFrame
+    """
+    check_resampleable(base_interval, interval)
+    if len(candles) == 0:
+        return CandleFrame.empty()
+
+    periods = interval_period_ids(candles.open_time, interval)
+    starts = np.concatenate(([0], np.flatnonzero(periods[1:] != periods[:-1]) + 1))
+    ends = np.append(starts[1:], len(candles)) - 1
+    period_ids = periods[starts]
+    next_open_time = period_open_times(period_ids + 1, interval)
+
+    resampled = CandleFrame(
+        period_open_times(period_ids, interval),
+        candles.open[starts],
+        np.maximum.reduceat(candles.high, starts),
+        np.minimum.reduceat(candles.low, starts),
+        candles.close[ends],
+        np.add.reduceat(candles.volume, starts),
+        next_open_time - 1,
+    )
+    if complete_only and candles.open_time[-1] + INTERVAL_MILLISECONDS[base_interval] < next_open_time[-1]:
+        return resampled[:-1]
+    return resampled
+
+
+class CandleResampler:
+    """
+    Incremental counterpart of resample_candles for live klines.
+
+    Every base kline, closed or not, is folded into the partial bar of each
+    target interval and reported as a Kline of that interval. Only closed
+    base klines are kept in the partial bar; an in-progress one just shows
+    on top of it, so revisions of the same minute are never double-counted.
+    A target Kline is closed once the base kline ending its period closes,
+    or when a later base kline shows that the period is over.
+    """
+
+    def __init__(self, intervals, base_interval='1m'):
+        """
+        :param intervals: Target intervals to maintain, e.g. ['5m', '1h', '1w']
+        :param base_interval: Interval of the klines fed to on_kline
+        """
+        for interval in intervals:
+            check_resampleable(base_interval, interval)
+        self.intervals = list(intervals)
+        self.base_interval = base_interval
+        self.base_milliseconds = INTERVAL_MILLISECONDS[base_interval]
+        self._bars = {}
+        self._lock = threading.Lock()
+
+    def seed(self, symbol, candles):
+        """
+        Start the partial bars from history, e.g. the stored 1m candles of the
+        current day, so the first live updates carry the full period so far.
+
+        :param symbol: Trading pair symbol
+        :param candles: CandleFrame of closed base candles ordered by open time
+        """
+        if len(candles) == 0:
+            return
+        bars = {}
+        for interval in self.intervals:
+            last = resample_candles(candles[-self._seed_length(candles, interval):], interval, self.base_interval)
+            period_end = int(last.close_time[-1]) + 1
+            if int(candles.open_time[-1]) + self.base_milliseconds < period_end:
+                bars[interval] = [int(last.open_time[-1]), period_end, float(last.open[-1]), float(last.high[-1]),
+                                  float(last.low[-1]), float(last.close[-1]), float(last.volume[-1]),
+                                  int(candles.open_time[-1])]
+        with self._lock:
+            self._bars[symbol.upper()] = bars
+
+    def _seed_length(self, candles, interval):
+        """Number of trailing base candles that can belong to the newest period"""
+        span = 31 * INTERVAL_MILLISECONDS['1d'] if interval == '1M' else INTERVAL_MILLISECONDS[interval]
+        return min(len(candles), span // self.base_milliseconds)
+
+    def on_kline(self, kline):
+        """
+        Fold a base kline into every target interval.
+
+        :param kline: Kline of base_interval
+        :return: List of Kline, one per target interval (empty for stale klines), preceded
+                 by the closed previous bar when the kline skips past its end
+        """
+        updates = []
+        with self._lock:
+            bars = self._bars.setdefault(kline.symbol.upper(), {})
+            for interval in self.intervals:
+                bar = bars.get(interval)
+                if bar is not None and (kline.open_time < bar[PERIOD_OPEN] or (
+                        bar[LAST_BASE_OPEN] is not None and kline.open_time <= bar[LAST_BASE_OPEN])):
+                    # Already folded in, or older than the bar being built
+                    continue
+                if bar is None or kline.open_time >= bar[PERIOD_END]:
+                    if bar is not None and bar[LAST_BASE_OPEN] is not None:
+                        # The klines ending the period never came, e.g. across a reconnect
+                        updates.append(self._to_kline(kline.symbol, interval, bar, True))
+                    bar = self._new_bar(kline.open_time, interval)
+                    bars[interval] = bar
+
+                if bar[LAST_BASE_OPEN] is None:
+                    open_, high, low, volume = kline.open, kline.high, kline.low, kline.volume
+                else:
+                    open_ = bar[OPEN]
+                    high = max(bar[HIGH], kline.high)
+                    low = min(bar[LOW], kline.low)
+                    volume = bar[VOLUME] + kline.volume
+
+                closed = kline.is_closed and kline.open_time + self.base_milliseconds >= bar[PERIOD_END]
+                if closed:
+                    del bars[interval]
+                elif kline.is_closed:
+                    bar[OPEN:] = [open_, high, low, kline.close, volume, kline.open_time]
+                updates.append(Kline(kline.symbol, interval, bar[PERIOD_OPEN], open_, high, low,
+                                     kline.close, volume, closed))
+        return updates
+
+    def partial_bars(self, symbol):
+        """
+        The bars being built for a symbol from closed base klines.
+
+        :param symbol: Trading pair symbol
+        :return: List of in-progress Kline, one per target interval that has a partial bar
+        """
+        with self._lock:
+            bars = self._bars.get(symbol.upper(), {})
+            return [self._to_kline(symbol.upper(), interval, bar, False)
+                    for interval, bar in bars.items() if bar[LAST_BASE_OPEN] is not None]
+
+    @staticmethod
+    def _to_kline(symbol, interval, bar, is_closed):
+        return Kline(symbol, interval, bar[PERIOD_OPEN], bar[OPEN], bar[HIGH], bar[LOW], bar[CLOSE], bar[VOLUME],
+                     is_closed)
+
+    @staticmethod
+    def _new_bar(open_time, interval):
+        period = interval_period_ids([open_time], interval)[0]
+        period_open, period_end = period_open_times([period, period + 1], interval).tolist()
+        return [period_open, period_end, None, None, None, None, None, None]
+
+    def reset(self, symbol=None):
+        """Drop the partial bars of one symbol, or of all symbols"""
+        with self._lock:
+            if symbol is None:
+                self._bars.clear()
+            else:
+                self._bars.pop(symbol.upper(), None)
@@ -0,0 +1,27 @@
+import numpy as np
+
+from src.data.data_fetch.binance_data_fetch.kline_downloader import INTERVAL_MILLISECONDS
+
+from .candle_frame import CandleFrame
+
+MINUTE_MS = INTERVAL_MILLISECONDS['1m']
+
+
+def make_minute_candles(count, seed=3, start_time=1_600_000_000_000):
+    """
+    Random-walk 1m candles with intrabar highs and lows, for benchmarks and tests.
+
+    :param count: Number of candles
+    :param seed: Seed of the random walk, so runs are reproducible
+    :param start_time: Open time of the first candle in epoch milliseconds
+    :return: CandleFrame with unit volume
+    """
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.0008, count)))
+    open_ = np.empty(count)
+    open_[0] = close[0]
+    open_[1:] = close[:-1]
+    wick = np.abs(rng.normal(0, 0.0005, count)) * close
+    open_time = start_time + np.arange(count, dtype=np.int64) * MINUTE_MS
+    return CandleFrame(open_time, open_, np.maximum(open_, close) + wick, np.minimum(open_, close) - wick,
+                       close, np.ones(count), open_time + MINUTE_MS - 1)
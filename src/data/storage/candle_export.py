@@ -0,0 +1,243 @@
+import bz2
+import gzip
+import io
+import itertools
+import json
+import lzma
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from src.data.data_fetch.binance_data_fetch.kline_downloader import KlineDownloader
+from src.data.data_processing.candle_frame import CandleFrame
+from src.utils.logging_service import LoggingService
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Format -> file extension; compressed CSV is written as one compressed member per chunk
+EXPORT_FORMATS = {
+    'csv': '.csv',
+    'csv.gz': '.csv.gz',
+    'csv.bz2': '.csv.bz2',
+    'csv.xz': '.csv.xz',
+    'parquet': '.parquet',
+}
+
+_COMPRESSORS = {
+    'csv': lambda data: data,
+    'csv.gz': lambda data: gzip.compress(data, compresslevel=6, mtime=0),
+    'csv.bz2': bz2.compress,
+    'csv.xz': lzma.compress,
+}
+
+
+def decode_pages(pages):
+    """Raw kline pages -> CandleFrames"""
+    for page in pages:
+        if page:
+            yield CandleFrame.from_raw(page)
+
+
+def closed_only(frames, now=None):
+    """Stop at the first candle that has not closed yet"""
+    now = now if now is not None else int(time.time() * 1000)
+    for frame in frames:
+        closed = int(np.searchsorted(frame.close_time, now, side='left'))
+        if closed:
+            yield frame[:closed]
+        if closed < len(frame):
+            return
+
+
+def rebatch(frames, chunk_rows):
+    """Regroup frames into chunks of chunk_rows candles (the last may be shorter)"""
+    pending = []
+    pending_rows = 0
+    for frame in frames:
+        while len(frame):
+            take = min(len(frame), chunk_rows - pending_rows)
+            pending.append(frame[:take])
+            pending_rows += take
+            frame = frame[take:]
+            if pending_rows == chunk_rows:
+                yield CandleFrame.concat(pending)
+                pending, pending_rows = [], 0
+    if pending:
+        yield CandleFrame.concat(pending)
+
+
+def chunk_table(frame, iso_times=False):
+    """
+    Columns of a chunk as written to the export.
+
+    :param frame: CandleFrame
+    :param iso_times: Replace the millisecond open/close times with UTC ISO-8601 strings
+    :return: Dict of column name -> array
+    """
+    columns = frame.columns()
+    if iso_times:
+        for name in ('open_time', 'close_time'):
+            if name in columns:
+                times = columns[name].astype('datetime64[ms]')
+                columns[name] = np.datetime_as_string(times, unit='ms', timezone='UTC')
+    return columns
+
+
+def encode_csv(columns, header):
+    """CSV bytes of a chunk's columns"""
+    buffer = io.StringIO()
+    pd.DataFrame(columns, copy=False).to_csv(buffer, index=False, header=header)
+    return buffer.getvalue().encode('utf-8')
+
+
+class ExportJob:
+    """
+    One (symbol, interval, range) export with a checkpoint file next to its output.
+
+    Chunks are appended to the output and the checkpoint is replaced
+    atomically after each one, recording the output size, row count and the
+    open time to resume from. A rerun truncates anything written after the
+    last checkpoint and carries on from there; a finished job is skipped.
+    Parquet output is a directory of part files, one per chunk. Open-ended
+    ranges are keyed by their start only, so every run extends the same file.
+    """
+
+    def __init__(self, directory, symbol, interval, start_time, end_time, export_format='csv.gz'):
+        """
+        :param directory: Root output directory
+        :param symbol: Trading pair symbol
+        :param interval: Candlestick interval
+        :param start_time: Unix timestamp in milliseconds (inclusive)
+        :param end_time: Unix timestamp in milliseconds (exclusive), or None for an open range
+                         that runs up to the time of each run
+        :param export_format: One of EXPORT_FORMATS
+        """
+        if export_format not in EXPORT_FORMATS:
+            raise ValueError(f"Unsupported export format '{export_format}'")
+        if export_format == 'parquet' and pyarrow is None:
+            raise ValueError("Parquet export needs pyarrow installed")
+        self.symbol = symbol.upper()
+        self.interval = interval
+        self.start_time = start_time
+        self.end_time = end_time
+        self.export_format = export_format
+        interval_name = '1mo' if interval == '1M' else interval
+        range_name = f"{start_time}_{'open' if end_time is None else end_time}"
+        self.path = os.path.join(directory, self.symbol, interval_name, range_name + EXPORT_FORMATS[export_format])
+        self.checkpoint_path = self.path + '.checkpoint.json'
+
+    def load_checkpoint(self):
+        """The saved progress, or a fresh one starting at start_time"""
+        if os.path.exists(self.checkpoint_path):
+            with open(self.checkpoint_path, encoding='utf-8') as checkpoint_file:
+                return json.load(checkpoint_file)
+        return {'next_start': self.start_time, 'bytes': 0, 'parts': 0, 'rows': 0, 'complete': False}
+
+    def save_checkpoint(self, checkpoint):
+        temporary_path = self.checkpoint_path + '.tmp'
+        with open(temporary_path, 'w', encoding='utf-8') as checkpoint_file:
+            json.dump(checkpoint, checkpoint_file)
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+        os.replace(temporary_path, self.checkpoint_path)
+
+    def _restore(self, checkpoint):
+        """Drop output written after the checkpoint by an interrupted run"""
+        if self.export_format == 'parquet':
+            os.makedirs(self.path, exist_ok=True)
+            for name in os.listdir(self.path):
+                if name.startswith('part-') and int(name[5:10]) >= checkpoint['parts']:
+                    os.remove(os.path.join(self.path, name))
+            return
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        with open(self.path, 'ab') as output:
+            output.truncate(checkpoint['bytes'])
+
+    def _write_chunk(self, columns, checkpoint):
+        if self.export_format == 'parquet':
+            part_path = os.path.join(self.path, f"part-{checkpoint['parts']:05d}.parquet")
+            pyarrow.parquet.write_table(pyarrow.table(columns), part_path, compression='zstd')
+            checkpoint['parts'] += 1
+            return
+        data = _COMPRESSORS[self.export_format](encode_csv(columns, header=checkpoint['bytes'] == 0))
+        with open(self.path, 'ab') as output:
+            output.write(data)
+            output.flush()
+            os.fsync(output.fileno())
+        checkpoint['bytes'] += len(data)
+
+    def run(self, downloader, chunk_rows=100_000, iso_times=False):
+        """
+        Stream the range into the output: pages -> decode -> closed candles -> chunks -> write.
+
+        :param downloader: KlineDownloader providing iter_pages
+        :param chunk_rows: Candles per written chunk, which bounds memory use
+        :param iso_times: Write UTC ISO-8601 times instead of epoch milliseconds
+        :return: The final checkpoint
+        """
+        checkpoint = self.load_checkpoint()
+        if checkpoint['complete']:
+            return checkpoint
+        self._restore(checkpoint)
+
+        now = int(time.time() * 1000)
+        end_time = now if self.end_time is None else min(self.end_time, now)
+        if checkpoint['next_start'] < end_time:
+            pages = downloader.iter_pages(self.symbol, self.interval, checkpoint['next_start'], end_time)
+            for chunk in rebatch(closed_only(decode_pages(pages)), chunk_rows):
+                self._write_chunk(chunk_table(chunk, iso_times), checkpoint)
+                checkpoint['rows'] += len(chunk)
+                checkpoint['next_start'] = int(chunk.open_time[-1]) + 1
+                self.save_checkpoint(checkpoint)
+
+        # Open ranges and ranges reaching into the future stay open so a later run appends the newer candles
+        checkpoint['complete'] = self.end_time is not None and self.end_time <= int(time.time() * 1000)
+        self.save_checkpoint(checkpoint)
+        return checkpoint
+
+
+class CandleExporter:
+    """Exports every combination of symbols, intervals and ranges one job at a time."""
+
+    def __init__(self, directory, export_format='csv.gz', chunk_rows=100_000, iso_times=False, downloader=None):
+        """
+        :param directory: Root output directory
+        :param export_format: One of EXPORT_FORMATS
+        :param chunk_rows: Candles per written chunk
+        :param iso_times: Write UTC ISO-8601 times instead of epoch milliseconds
+        :param downloader: KlineDownloader shared by all jobs (one is created when omitted)
+        """
+        self.directory = directory
+        self.export_format = export_format
+        self.chunk_rows = chunk_rows
+        self.iso_times = iso_times
+        self.downloader = downloader or KlineDownloader()
+        self.logger = LoggingService()
+
+    def jobs(self, symbols, intervals, ranges):
+        """ExportJobs for the product of symbols, intervals and (start_time, end_time or None) ranges"""
+        return [ExportJob(self.directory, symbol, interval, start_time, end_time, self.export_format)
+                for symbol, interval, (start_time, end_time) in itertools.product(symbols, intervals, ranges)]
+
+    def export(self, symbols, intervals, ranges):
+        """
+        Run every job, resuming interrupted ones.
+
+        :return: Dict mapping output paths to their final checkpoints
+        """
+        results = {}
+        jobs = self.jobs(symbols, intervals, ranges)
+        for number, job in enumerate(jobs, 1):
+            started = time.perf_counter()
+            checkpoint = job.run(self.downloader, self.chunk_rows, self.iso_times)
+            self.logger.info("[%d/%d] %s %s: %d rows in %s (%.1fs)", number, len(jobs), job.symbol, job.interval,
+                             checkpoint['rows'], job.path, time.perf_counter() - started)
+            results[job.path] = checkpoint
+        return results
+
@@ -0,0 +1,243 @@
+import os
+import shutil
+import threading
+import time
+
+import numpy as np
+
+from src.data.data_fetch.binance_data_fetch.kline_downloader import KlineDownloader
+from src.data.data_processing.candle_frame import CandleFrame
+from src.utils.logging_service import LoggingService
+
+DEFAULT_ROOT = os.path.join('data', 'candles')
+
+# Column name -> dtype and position in a raw Binance kline array
+CANDLE_COLUMNS = {
+    'open_time': (np.int64, 0),
+    'open': (np.float64, 1),
+    'high': (np.float64, 2),
+    'low': (np.float64, 3),
+    'close': (np.float64, 4),
+    'volume': (np.float64, 5),
+    'close_time': (np.int64, 6),
+}
+
+
+class CandleStore:
+    """
+    On-disk candle store keyed by (symbol, interval).
+
+    Each column lives in its own little-endian binary file that is appended to
+    on sync and memory-mapped on read, so range reads only touch the pages
+    they need instead of loading the whole history. Backfilling older
+    candles rewrites the columns into a new directory swapped in by rename.
+    """
+
+    def __init__(self, root=DEFAULT_ROOT, downloader=None):
+        """
+        :param root: Directory holding the column files
+        :param downloader: KlineDownloader used by sync (created when omitted)
+        """
+        self.root = root
+        self.downloader = downloader or KlineDownloader()
+        self.logger = LoggingService()
+        self._locks = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, symbol, interval):
+        with self._locks_guard:
+            return self._locks.setdefault((symbol.upper(), interval), threading.Lock())
+
+    def _directory(self, symbol, interval):
+        # '1M' and '1m' would collide on case-insensitive file systems
+        interval_name = '1mo' if interval == '1M' else interval
+        return os.path.join(self.root, symbol.upper(), interval_name)
+
+    def _column_path(self, symbol, interval, column):
+        return os.path.join(self._directory(symbol, interval), f'{column}.bin')
+
+    def length(self, symbol, interval):
+        """Number of complete candles stored for (symbol, interval)"""
+        lengths = []
+        for column, (dtype, _) in CANDLE_COLUMNS.items():
+            path = self._column_path(symbol, interval, column)
+            size = os.path.getsize(path) if os.path.exists(path) else 0
+            lengths.append(size // np.dtype(dtype).itemsize)
+        return min(lengths)
+
+    def last_close_time(self, symbol, interval):
+        """Close time of the newest stored candle, or None when empty"""
+        length = self.length(symbol, interval)
+        if length == 0:
+            return None
+        return int(self._map(symbol, interval, 'close_time', length)[-1])
+
+    def append(self, symbol, interval, candles):
+        """
+        Append candles newer than the last stored candle.
+
+        :param symbol: Trading pair symbol
+        :param interval: Candlestick interval
+        :param candles: CandleFrame, or list of raw kline arrays, ordered by open time
+        :return: Number of candles appended
+        """
+        with self._lock(symbol, interval):
+            return self._append(symbol, interval, candles)
+
+    def _append(self, symbol, interval, candles):
+        frame = candles if isinstance(candles, CandleFrame) else CandleFrame.from_raw(candles)
+        if frame.close_time is None:
+            raise ValueError("Candles need close times to be stored")
+        length = self._repair(symbol, interval)
+        if length:
+            frame = frame.between(start_time=int(self._map(symbol, interval, 'open_time', length)[-1]) + 1)
+        if len(frame) == 0:
+            return 0
+
+        os.makedirs(self._directory(symbol, interval), exist_ok=True)
+        for column, (dtype, _) in CANDLE_COLUMNS.items():
+            with open(self._column_path(symbol, interval, column), 'ab') as column_file:
+                column_file.write(frame[column].astype(np.dtype(dtype).newbyteorder('<'), copy=False).tobytes())
+        return len(frame)
+
+    def _repair(self, symbol, interval):
+        """Truncate columns left longer than the others by an interrupted append"""
+        length = self.length(symbol, interval)
+        for column, (dtype, _) in CANDLE_COLUMNS.items():
+            path = self._column_path(symbol, interval, column)
+            expected = length * np.dtype(dtype).itemsize
+            if os.path.exists(path) and os.path.getsize(path) != expected:
+                with open(path, 'r+b') as column_file:
+                    column_file.truncate(expected)
+        return length
+
+    def sync(self, symbol, interval, start_time=None, end_time=None):
+        """
+        Fetch closed candles so the store covers [start_time, end_time) without gaps.
+
+        New candles are always appended from the last stored close time, so a
+        start_time past the stored tail never leaves a hole. A start_time before
+        the first stored candle backfills the missing prefix.
+
+        :param symbol: Trading pair symbol
+        :param interval: Candlestick interval
+        :param start_time: Unix timestamp in milliseconds the store must reach back
+                           to (required when the store is empty)
+        :param end_time: Unix timestamp in milliseconds to sync up to (defaults to now)
+        :return: Number of candles added
+        """
+        with self._lock(symbol, interval):
+            self._recover(symbol, interval)
+            last_close_time = self.last_close_time(symbol, interval)
+            if last_close_time is None and start_time is None:
+                raise ValueError(f"No candles stored for {symbol} {interval}, a start_time is required")
+
+            now = int(time.time() * 1000)
+            sync_to = min(end_time or now, now)
+            added = 0
+            if last_close_time is None:
+                added += self._append(symbol, interval, self._download_closed(symbol, interval, start_time, sync_to, now))
+            else:
+                first_open_time = int(self._map(symbol, interval, 'open_time', 1)[0])
+                if start_time is not None and start_time < first_open_time:
+                    added += self._prepend(symbol, interval,
+                                           self._download_closed(symbol, interval, start_time, first_open_time, now))
+                if last_close_time + 1 < sync_to:
+                    added += self._append(symbol, interval,
+                                          self._download_closed(symbol, interval, last_close_time + 1, sync_to, now))
+            self.logger.debug("Synced %d %s %s candles", added, symbol, interval)
+            return added
+
+    def _download_closed(self, symbol, interval, start_time, end_time, now):
+        if start_time >= end_time:
+            return CandleFrame.empty()
+        frame = CandleFrame.from_raw(self.downloader.download(symbol, interval, start_time, end_time))
+        # Only candles that have closed are final
+        return frame[:int(np.searchsorted(frame.close_time, now, side='left'))]
+
+    def _prepend(self, symbol, interval, frame):
+        """
+        Put older candles in front of the stored ones.
+
+        Columns are rewritten into a sibling directory that replaces the old
+        one by rename, so readers of the old memory maps are unaffected and an
+        interrupted backfill is recovered by _recover.
+        """
+        length = self.length(symbol, interval)
+        if length:
+            frame = frame.between(end_time=int(self._map(symbol, interval, 'open_time', length)[0]))
+        if len(frame) == 0:
+            return 0
+
+        directory = self._directory(symbol, interval)
+        staging, retired = directory + '.backfill', directory + '.old'
+        shutil.rmtree(staging, ignore_errors=True)
+        os.makedirs(staging)
+        for column, (dtype, _) in CANDLE_COLUMNS.items():
+            little_endian = np.dtype(dtype).newbyteorder('<')
+            with open(os.path.join(staging, f'{column}.bin'), 'wb') as column_file:
+                column_file.write(frame[column].astype(little_endian, copy=False).tobytes())
+                column_file.write(self._map(symbol, interval, column, length).tobytes())
+        os.replace(directory, retired)
+        os.replace(staging, directory)
+        shutil.rmtree(retired, ignore_errors=True)
+        return len(frame)
+
+    def _recover(self, symbol, interval):
+        """Finish or discard a backfill interrupted between its renames"""
+        directory = self._directory(symbol, interval)
+        staging, retired = directory + '.backfill', directory + '.old'
+        if os.path.exists(directory):
+            shutil.rmtree(staging, ignore_errors=True)
+        elif os.path.exists(staging):
+            os.replace(staging, directory)
+        shutil.rmtree(retired, ignore_errors=True)
+
+    def _map(self, symbol, interval, column, length):
+        dtype = np.dtype(CANDLE_COLUMNS[column][0]).newbyteorder('<')
+        return np.memmap(self._column_path(symbol, interval, column), dtype=dtype, mode='r', shape=(length,))
+
+    def read(self, symbol, interval, start_time=None, end_time=None):
+        """
+        Read candles opening in [start_time, end_time) as read-only column arrays.
+
+        :param symbol: Trading pair symbol
+        :param interval: Candlestick interval
+        :param start_time: Unix timestamp in milliseconds (inclusive, optional)
+        :param end_time: Unix timestamp in milliseconds (exclusive, optional)
+        :return: Dict mapping column names to memory-mapped arrays
+        """
+        length = self.length(symbol, interval)
+        if length == 0:
+            return {column: np.empty(0, dtype=dtype) for column, (dtype, _) in CANDLE_COLUMNS.items()}
+
+        open_time = self._map(symbol, interval, 'open_time', length)
+        first = int(np.searchsorted(open_time, start_time, side='left')) if start_time is not None else 0
+        last = int(np.searchsorted(open_time, end_time, side='left')) if end_time is not None else length
+        return {column: self._map(symbol, interval, column, length)[first:last] for column in CANDLE_COLUMNS}
+
+    def read_last(self, symbol, interval, limit):
+        """Read the newest `limit` stored candles as column arrays"""
+        length = self.length(symbol, interval)
+        first = max(0, length - limit)
+        if length == 0:
+            return self.read(symbol, interval)
+        return {column: self._map(symbol, interval, column, length)[first:] for column in CANDLE_COLUMNS}
+
+    def read_candles(self, symbol, interval, start_time=None, end_time=None):
+        """Read candles opening in [start_time, end_time) as a memory-mapped CandleFrame"""
+        return CandleFrame.from_columns(self.read(symbol, interval, start_time, end_time))
+
+    def iter_candles(self, symbol, interval, start_time=None, end_time=None, chunk_size=100_000):
+        """
+        Yield candles opening in [start_time, end_time) as memory-mapped
+        CandleFrame chunks, so long histories stream without being loaded at once
+        """
+        candles = self.read_candles(symbol, interval, start_time, end_time)
+        for first in range(0, len(candles), chunk_size):
+            yield candles[first:first + chunk_size]
+
+    def read_frame(self, symbol, interval, start_time=None, end_time=None):
+        """Read candles opening in [start_time, end_time) as a DataFrame"""
+        return self.read_candles(symbol, interval, start_time, end_time).to_dataframe()
+
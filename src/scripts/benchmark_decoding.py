@@ -0,0 +1,76 @@
+import json
+import random
+import time
+
+from src.data.data_processing.kline_decoder import JSON_BACKEND, decode_kline_event, decode_klines, json_loads
+
+ROUNDS = 200
+MESSAGES = 20000
+
+
+def make_raw_klines(count):
+    """Build a REST klines response body with `count` candles"""
+    open_time = 1_700_000_000_000
+    klines = []
+    for index in range(count):
+        prices = [f"{random.uniform(20000, 40000):.8f}" for _ in range(4)]
+        klines.append([open_time + index * 60_000, *prices, f"{random.uniform(0, 100):.8f}",
+                       open_time + index * 60_000 + 59_999, "0", 10, "0", "0", "0"])
+    return json.dumps(klines).encode()
+
+
+def make_stream_message():
+    """Build one combined-stream kline frame"""
+    return json.dumps({
+        'stream': 'btcusdt@kline_1m',
+        'data': {
+            'e': 'kline', 'E': 1_700_000_000_123, 's': 'BTCUSDT',
+            'k': {'t': 1_700_000_000_000, 'T': 1_700_000_059_999, 's': 'BTCUSDT', 'i': '1m',
+                  'o': '37000.01000000', 'c': '37010.55000000', 'h': '37020.00000000',
+                  'l': '36990.12000000', 'v': '12.34560000', 'n': 100, 'x': False}
+        }
+    })
+
+
+def legacy_decode_message(message):
+    """The previous per-frame path: json.loads and a fresh dict"""
+    data = json.loads(message)['data']
+    return {
+        'time': data['k']['t'] / 1000,
+        'open': float(data['k']['o']),
+        'high': float(data['k']['h']),
+        'low': float(data['k']['l']),
+        'close': float(data['k']['c']),
+        'volume': float(data['k']['v']),
+        'isClosed': data['k']['x']
+    }
+
+
+def legacy_decode_klines(body):
+    """The previous bulk path: json.loads and a dict per candle"""
+    return [
+        {'time': kline[0] / 1000, 'open': float(kline[1]), 'high': float(kline[2]),
+         'low': float(kline[3]), 'close': float(kline[4]), 'volume': float(kline[5])}
+        for kline in json.loads(body)
+    ]
+
+
+def timed(function, argument, rounds):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        function(argument)
+    return (time.perf_counter() - start) / rounds
+
+
+if __name__ == "__main__":
+    print(f"JSON backend: {JSON_BACKEND}")
+
+    message = make_stream_message()
+    legacy = timed(legacy_decode_message, message, MESSAGES)
+    fast = timed(lambda frame: decode_kline_event(json_loads(frame)['data']), message, MESSAGES)
+    print(f"Per message:      legacy {legacy * 1e6:7.2f} us   new {fast * 1e6:7.2f} us   ({legacy / fast:.1f}x)")
+
+    body = make_raw_klines(1000)
+    legacy = timed(legacy_decode_klines, body, ROUNDS)
+    fast = timed(decode_klines, body, ROUNDS)
+    print(f"Per 1000 candles: legacy {legacy * 1e3:7.3f} ms   new {fast * 1e3:7.3f} ms   ({legacy / fast:.1f}x)")
@@ -0,0 +1,110 @@
+import argparse
+import random
+import time
+
+from src.trading.execution.simulated_exchange import SimulatedExchange
+from src.trading.execution.trade_executor import TradeExecutor
+
+SYMBOLS = ['BTCUSDT', 'ETHUSDT', 'SOLUSDT', 'BNBUSDT', 'XRPUSDT', 'ADAUSDT', 'DOGEUSDT', 'AVAXUSDT']
+TARGET_ORDERS_PER_SECOND = 100_000
+
+
+def make_order_flow(count, seed=7):
+    """
+    Random order flow: 60% limit orders within 0.5% of the mid, 30% market
+    orders, 10% cancels of earlier limit orders, and a price tick every 100 orders.
+    """
+    rng = random.Random(seed)
+    flow = []
+    for index in range(count):
+        symbol = SYMBOLS[index % len(SYMBOLS)]
+        roll = rng.random()
+        if index % 100 == 0:
+            flow.append(('tick', symbol, None, None, 100.0 * (1 + rng.uniform(-0.005, 0.005))))
+        elif roll < 0.6:
+            side = 'BUY' if rng.random() < 0.5 else 'SELL'
+            flow.append(('LIMIT', symbol, side, rng.uniform(0.01, 2.0), 100.0 * (1 + rng.uniform(-0.005, 0.005))))
+        elif roll < 0.9:
+            flow.append(('MARKET', symbol, 'BUY' if rng.random() < 0.5 else 'SELL', rng.uniform(0.01, 2.0), None))
+        else:
+            flow.append(('cancel', symbol, None, None, None))
+    return flow
+
+
+def run_engine(flow, create_orders=False):
+    """Push the flow straight into the engine; returns (orders, seconds, exchange)"""
+    exchange = SimulatedExchange()
+    for symbol in SYMBOLS:
+        exchange.update_price(symbol, 100.0)
+    submit = exchange.create_order if create_orders else exchange.submit
+    open_ids = {symbol: [] for symbol in SYMBOLS}
+    orders = 0
+
+    start = time.perf_counter()
+    for kind, symbol, side, quantity, price in flow:
+        if kind == 'tick':
+            exchange.update_price(symbol, price)
+        elif kind == 'cancel':
+            ids = open_ids[symbol]
+            if ids:
+                exchange.cancel(symbol, ids.pop())
+        else:
+            if create_orders:
+                submit(symbol=symbol, side=side, type=kind, quantity=quantity, price=price)
+            else:
+                order = submit(symbol, side, kind, quantity, price)
+                if kind == 'LIMIT':
+                    open_ids[symbol].append(order[0])
+            orders += 1
+    return orders, time.perf_counter() - start, exchange
+
+
+def run_executor(flow):
+    """Push the market and limit orders through TradeExecutor's queued submission"""
+    exchange = SimulatedExchange()
+    for symbol in SYMBOLS:
+        exchange.update_price(symbol, 100.0)
+    executor = TradeExecutor(exchange)
+    futures = []
+
+    start = time.perf_counter()
+    for kind, symbol, side, quantity, price in flow:
+        if kind == 'MARKET':
+            futures.append(executor.submit_market_order(symbol, side, quantity))
+        elif kind == 'LIMIT':
+            futures.append(executor.submit_limit_order(symbol, side, quantity, price))
+    for future in futures:
+        future.result()
+    elapsed = time.perf_counter() - start
+    latency = executor.submit_to_ack.snapshot()
+    executor.shutdown()
+    return len(futures), elapsed, latency
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Throughput of the simulated exchange and order path")
+    parser.add_argument('--orders', type=int, default=500_000)
+    parser.add_argument('--executor-orders', type=int, default=50_000)
+    args = parser.parse_args()
+
+    flow = make_order_flow(args.orders)
+    orders, elapsed, exchange = run_engine(flow)
+    rate = orders / elapsed
+    print(f"engine submit:        {orders} orders in {elapsed:.2f}s -> {rate:,.0f} orders/s")
+    stats = exchange.stats()
+    print(f"  fills {stats['fills']}, fees {stats['fees']:.2f}, "
+          f"resting {sum(stats['resting_orders'].values())}")
+
+    orders, elapsed, _ = run_engine(flow, create_orders=True)
+    print(f"engine create_order:  {orders} orders in {elapsed:.2f}s -> {orders / elapsed:,.0f} orders/s")
+
+    orders, elapsed, latency = run_executor(make_order_flow(args.executor_orders))
+    print(f"TradeExecutor queued: {orders} orders in {elapsed:.2f}s -> {orders / elapsed:,.0f} orders/s, "
+          f"submit-to-ack p50 {latency['p50_ms']:.3f} ms, p99 {latency['p99_ms']:.3f} ms")
+
+    if rate < TARGET_ORDERS_PER_SECOND:
+        print(f"WARNING: engine below the {TARGET_ORDERS_PER_SECOND:,} orders/s target")
+
+
+if __name__ == "__main__":
+    main()
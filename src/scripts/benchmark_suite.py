@@ -0,0 +1,312 @@
+"""
+Benchmark suite for indicators, backtests, formatting, CSV export and
+stream decoding.
+
+Every case runs at each requested size on synthetic OHLCV data (or a
+fixture CSV tiled up to the size). Time is the best of ``--repeat`` runs;
+peak memory is measured in a separate run under tracemalloc, which sees
+NumPy and pandas buffers too.
+
+    python -m src.scripts.benchmark_suite --sizes 10k,100k,1M --save benchmarks/baseline.json
+    python -m src.scripts.benchmark_suite --compare benchmarks/baseline.json --threshold 0.25
+
+With --compare the exit status is 1 when any case is slower or uses more
+memory than its baseline by more than the threshold. It is 1 as well when a
+case misses its SPEEDUP_TARGETS ratio over its reference case, e.g.
+compute_indicators against separate indicator calls at 1M bars.
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from src.data.data_processing.candle_frame import CandleFrame
+from src.data.data_processing.data_formatter import DataFormatter
+from src.data.data_processing.kline_decoder import JSON_BACKEND, decode_kline_event, json_loads
+from src.data.storage.save_to_csv import save_to_csv
+from src.trading.backtesting.backtest_engine import BacktestEngine
+from src.trading.technical_analysis.indicators import DEFAULT_INDICATOR_SPEC, TechnicalIndicators
+from src.utils import jit
+
+DEFAULT_SIZES = '10k,100k,1M'
+DEFAULT_THRESHOLD = 0.25
+# Regressions smaller than this are timer noise whatever the ratio
+MIN_TIME_DELTA_SECONDS = 0.005
+MIN_MEMORY_DELTA_BYTES = 1 << 20
+MINUTE_MS = 60_000
+STRATEGY_PARAMS = {'sma': True, 'sma_period': 20, 'rsi': True, 'rsi_period': 14, 'macd': True}
+
+
+def parse_size(text):
+    """'10k' -> 10000, '1M' -> 1000000"""
+    text = text.strip()
+    multiplier = {'k': 1_000, 'K': 1_000, 'm': 1_000_000, 'M': 1_000_000}.get(text[-1])
+    return int(float(text[:-1]) * multiplier) if multiplier else int(text)
+
+
+def synthetic_candles(size, seed=42):
+    """Random-walk 1m OHLCV candles"""
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.001, size)))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    wick = np.abs(rng.normal(0, 0.0005, size)) * close
+    open_time = 1_600_000_000_000 + np.arange(size, dtype=np.int64) * MINUTE_MS
+    return CandleFrame(open_time, open_, np.maximum(open_, close) + wick, np.minimum(open_, close) - wick,
+                       close, rng.uniform(0, 100, size), open_time + MINUTE_MS - 1)
+
+
+def fixture_candles(path, size):
+    """
+    Candles from a CSV with open/high/low/close/volume columns (e.g. the
+    output of fetch_historical.py), tiled to ``size`` rows on a 1m grid
+    """
+    df = pd.read_csv(path)
+    repeats = -(-size // len(df))
+    columns = {name: np.tile(df[name].to_numpy(dtype=np.float64), repeats)[:size]
+               for name in ('open', 'high', 'low', 'close', 'volume')}
+    open_time = 1_600_000_000_000 + np.arange(size, dtype=np.int64) * MINUTE_MS
+    return CandleFrame(open_time, close_time=open_time + MINUTE_MS - 1, **columns)
+
+
+def raw_klines(candles):
+    """The candles as a decoded REST klines response: lists with string prices"""
+    return [
+        [open_time, f"{open_:.8f}", f"{high:.8f}", f"{low:.8f}", f"{close:.8f}", f"{volume:.8f}",
+         close_time, "0", 10, "0", "0", "0"]
+        for open_time, open_, high, low, close, volume, close_time in zip(
+            candles.open_time.tolist(), candles.open.tolist(), candles.high.tolist(), candles.low.tolist(),
+            candles.close.tolist(), candles.volume.tolist(), candles.close_time.tolist()
+        )
+    ]
+
+
+def stream_messages(candles, count=1000):
+    """Combined-stream kline frames, as received by the stream manager"""
+    return [
+        json.dumps({'stream': 'btcusdt@kline_1m', 'data': {
+            'e': 'kline', 'E': open_time + 1, 's': 'BTCUSDT',
+            'k': {'t': open_time, 'T': open_time + MINUTE_MS - 1, 's': 'BTCUSDT', 'i': '1m', 'o': f"{open_:.8f}",
+                  'c': f"{close:.8f}", 'h': f"{high:.8f}", 'l': f"{low:.8f}", 'v': f"{volume:.8f}",
+                  'n': 100, 'x': False}
+        }}).encode()
+        for open_time, open_, high, low, close, volume in zip(
+            candles.open_time[:count].tolist(), candles.open[:count].tolist(), candles.high[:count].tolist(),
+            candles.low[:count].tolist(), candles.close[:count].tolist(), candles.volume[:count].tolist()
+        )
+    ]
+
+
+def decode_messages(messages, size):
+    """Decode ``size`` frames, cycling through the prepared messages"""
+    count = len(messages)
+    for index in range(size):
+        decode_kline_event(json_loads(messages[index % count])['data'])
+
+
+def separate_indicator_calls(df):
+    """The default indicator set the way it was computed before compute_indicators, one call per indicator"""
+    df = df.copy()
+    close = df['close']
+    df['SMA'] = TechnicalIndicators.calculate_simple_moving_average(close, 20)
+    df['EMA'] = TechnicalIndicators.calculate_exponential_moving_average(close, 20)
+    df['RSI'] = TechnicalIndicators.calculate_relative_strength_index(close, 14)
+    df['MACD'], df['MACD_signal'], df['MACD_histogram'] = \
+        TechnicalIndicators.calculate_moving_average_convergence_divergence(close, 12, 26, 9)
+    df['BB_upper'], df['BB_middle'], df['BB_lower'] = TechnicalIndicators.calculate_bollinger_bands(close, 20, 2)
+    return df
+
+
+def _csv_path():
+    handle, path = tempfile.mkstemp(suffix='.csv', prefix='benchmark-')
+    os.close(handle)
+    return path
+
+
+# name -> (largest size it runs at, prepare(candles) -> argument, run(argument))
+CASES = {
+    'indicators.sma': (None, lambda c: c.close,
+                       lambda close: TechnicalIndicators.calculate_simple_moving_average(close)),
+    'indicators.ema': (None, lambda c: c.close,
+                       lambda close: TechnicalIndicators.calculate_exponential_moving_average(close)),
+    'indicators.rsi': (None, lambda c: c.close,
+                       lambda close: TechnicalIndicators.calculate_relative_strength_index(close)),
+    'indicators.rsi_wilder': (None, lambda c: c.close,
+                              lambda close: TechnicalIndicators.calculate_wilder_relative_strength_index(close)),
+    'indicators.macd': (None, lambda c: c.close,
+                        lambda close: TechnicalIndicators.calculate_moving_average_convergence_divergence(close)),
+    'indicators.bollinger_bands': (None, lambda c: c.close,
+                                   lambda close: TechnicalIndicators.calculate_bollinger_bands(close)),
+    'indicators.compute_indicators': (None, lambda c: c.to_dataframe(),
+                                      lambda df: TechnicalIndicators.compute_indicators(df, DEFAULT_INDICATOR_SPEC)),
+    'indicators.separate_calls': (None, lambda c: c.to_dataframe(), separate_indicator_calls),
+    'backtest.run_backtest': (None, lambda c: c,
+                              lambda candles: BacktestEngine().run_backtest(candles, STRATEGY_PARAMS)),
+    'backtest.run_backtest_loop': (100_000, lambda c: c, lambda candles: BacktestEngine(vectorized=False)
+                                   .run_backtest(candles, STRATEGY_PARAMS)),
+    'formatter.format_klines': (1_000_000, raw_klines, DataFormatter.format_klines),
+    'formatter.format_historical_candles': (1_000_000, raw_klines, DataFormatter.format_historical_candles),
+    'formatter.format_candle_columns': (None, lambda c: c.columns(), DataFormatter.format_candle_columns),
+    'storage.save_to_csv': (1_000_000, lambda c: (c.to_dicts(), _csv_path()),
+                            lambda argument: save_to_csv(*argument)),
+    'stream.decode_messages': (None, lambda c: (stream_messages(c), len(c)),
+                               lambda argument: decode_messages(*argument)),
+}
+
+# case -> (reference case, minimum speedup over it, smallest size checked, backend)
+SPEEDUP_TARGETS = {
+    'indicators.compute_indicators': ('indicators.separate_calls', 3.0, 1_000_000, 'numba'),
+}
+
+
+def measure(run, argument, repeat):
+    """Best wall time over ``repeat`` runs, then peak traced memory of one more run"""
+    best = float('inf')
+    for _ in range(repeat):
+        gc.collect()
+        start = time.perf_counter()
+        run(argument)
+        best = min(best, time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        run(argument)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best, peak
+
+
+def run_suite(sizes, cases, repeat, fixture=None):
+    """
+    Run the selected cases at every size.
+
+    :return: Dict mapping 'case@size' to {'case', 'size', 'seconds', 'peak_bytes'}
+    """
+    results = {}
+    for size in sizes:
+        candles = fixture_candles(fixture, size) if fixture else synthetic_candles(size)
+        for name in cases:
+            max_size, prepare, run = CASES[name]
+            if max_size is not None and size > max_size:
+                print(f"{name:40s} {size:>10,} skipped (limit {max_size:,})")
+                continue
+            argument = prepare(candles)
+            try:
+                seconds, peak = measure(run, argument, repeat)
+            finally:
+                if name == 'storage.save_to_csv':
+                    os.remove(argument[1])
+            del argument
+            results[f"{name}@{size}"] = {'case': name, 'size': size, 'seconds': seconds, 'peak_bytes': peak}
+            print(f"{name:40s} {size:>10,} {seconds * 1e3:12.2f} ms {peak / 2 ** 20:10.1f} MiB")
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    List the cases slower or heavier than the baseline by more than the threshold.
+
+    :return: List of human-readable regression descriptions
+    """
+    regressions = []
+    for key, current in results.items():
+        previous = baseline.get(key)
+        if previous is None:
+            continue
+        for metric, floor, unit, scale in (('seconds', MIN_TIME_DELTA_SECONDS, 'ms', 1e3),
+                                           ('peak_bytes', MIN_MEMORY_DELTA_BYTES, 'MiB', 2 ** -20)):
+            before, after = previous[metric], current[metric]
+            if after > before * (1 + threshold) and after - before > floor:
+                regressions.append(f"{key} {metric}: {before * scale:.2f} -> {after * scale:.2f} {unit} "
+                                   f"(+{(after / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def check_speedups(results, backend):
+    """
+    Compare cases with a speedup target against their reference case.
+
+    :return: Tuple of (report lines, human-readable descriptions of missed targets)
+    """
+    report, missed = [], []
+    for name, (reference, target, min_size, target_backend) in SPEEDUP_TARGETS.items():
+        for key, current in results.items():
+            baseline = results.get(f"{reference}@{current['size']}")
+            if current['case'] != name or baseline is None:
+                continue
+            speedup = baseline['seconds'] / current['seconds']
+            report.append(f"{key}: {speedup:.2f}x faster than {reference}")
+            if backend == target_backend and current['size'] >= min_size and speedup < target:
+                missed.append(f"{key}: {speedup:.2f}x faster than {reference}, target {target:.1f}x")
+    return report, missed
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark suite with baseline regression checks")
+    parser.add_argument('--sizes', default=DEFAULT_SIZES, help="Comma-separated bar counts, e.g. 10k,100k,1M,10M")
+    parser.add_argument('--cases', default=None, help="Comma-separated case name prefixes (default: all)")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per case; the best is kept")
+    parser.add_argument('--fixture', default=None, help="OHLCV CSV tiled to each size instead of synthetic data")
+    parser.add_argument('--save', default=None, help="Write the results as a JSON baseline")
+    parser.add_argument('--compare', default=None, help="Baseline JSON to check the results against")
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed relative slowdown or memory growth")
+    args = parser.parse_args()
+
+    sizes = [parse_size(size) for size in args.sizes.split(',')]
+    prefixes = args.cases.split(',') if args.cases else None
+    cases = [name for name in CASES if prefixes is None or any(name.startswith(prefix) for prefix in prefixes)]
+
+    print(f"Python {platform.python_version()}, NumPy {np.__version__}, pandas {pd.__version__}, "
+          f"JSON backend {JSON_BACKEND}, compute backend {jit.backend()}")
+    # Compile the kernels (or load them from Numba's cache) so no case is timed with it
+    print(f"Kernel warm-up {jit.warm_up():.2f}s")
+    results = run_suite(sizes, cases, args.repeat, args.fixture)
+    speedups, missed_targets = check_speedups(results, jit.backend())
+    for line in speedups:
+        print(line)
+
+    if args.save:
+        directory = os.path.dirname(args.save)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(args.save, 'w') as baseline_file:
+            json.dump({
+                'machine': {'python': platform.python_version(), 'numpy': np.__version__, 'pandas': pd.__version__,
+                            'platform': platform.platform(), 'processor': platform.processor()},
+                'results': results,
+            }, baseline_file, indent=2)
+        print(f"Saved baseline to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as baseline_file:
+            baseline = json.load(baseline_file)['results']
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+        else:
+            print(f"No regressions beyond {args.threshold:.0%}")
+    else:
+        regressions = []
+
+    if missed_targets:
+        print(f"{len(missed_targets)} speedup target(s) missed:")
+        for missed in missed_targets:
+            print(f"  {missed}")
+    if regressions or missed_targets:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,50 @@
-from src.data.data_fetch.binance_data_fetch.data_fetcher import DataFetcher
-from src.data.storage import save_to_csv
+import argparse
+
+from src.data.data_fetch.binance_data_fetch.async_data_fetcher import date_to_milliseconds
+from src.data.data_fetch.binance_data_fetch.kline_downloader import KlineDownloader
+from src.data.storage.candle_export import EXPORT_FORMATS, CandleExporter
+
+
+def parse_range(text):
+    """
+    'YYYY-MM-DD[:YYYY-MM-DD]' -> (start_time, end_time). Without an end the
+    range is open (end_time None) and each run exports up to that run's now.
+    """
+    start_date, _, end_date = text.partition(':')
+    return date_to_milliseconds(start_date), date_to_milliseconds(end_date)
+
+
+def read_symbols(args):
+    symbols = list(args.symbols or [])
+    if args.symbols_file:
+        with open(args.symbols_file, encoding='utf-8') as symbols_file:
+            symbols.extend(line.strip() for line in symbols_file if line.strip() and not line.startswith('#'))
+    return symbols
+
 
 if __name__ == "__main__":
-    # Initialize fetcher
-    fetcher = DataFetcher()
-
-    # Customize parameters
-    SYMBOL = "BTCUSDT"
-    INTERVAL = "1d"
-    LIMIT = 10
-    START_DATE = "2023-01-01"  # Optional
-    END_DATE = "2023-01-10"  # Optional
-
-    # Fetch historical data
-    print(f"Fetching historical data for {SYMBOL}...")
-    historical_data = fetcher.fetch_historical_data(SYMBOL, INTERVAL, LIMIT, START_DATE, END_DATE)
-
-    # Print data
-    for row in historical_data:
-        print(row)
-
-    # Save to CSV
-    save_to_csv.save_to_csv(historical_data, f"{SYMBOL}_historical_data.csv")
\ No newline at end of file
+    parser = argparse.ArgumentParser(
+        description="Stream historical klines for many symbols into chunked, resumable CSV or Parquet files"
+    )
+    parser.add_argument('--symbols', nargs='+', help="Trading pairs, e.g. BTCUSDT ETHUSDT")
+    parser.add_argument('--symbols-file', help="File with one trading pair per line")
+    parser.add_argument('--intervals', nargs='+', default=['1d'])
+    parser.add_argument('--range', dest='ranges', action='append', type=parse_range,
+                        help="START[:END] in YYYY-MM-DD, repeatable (without END, reruns append newer candles)")
+    parser.add_argument('--format', dest='export_format', choices=sorted(EXPORT_FORMATS), default='csv.gz')
+    parser.add_argument('--output', default='exports', help="Root directory of the exported files")
+    parser.add_argument('--chunk-rows', type=int, default=100_000, help="Candles held in memory per written chunk")
+    parser.add_argument('--max-workers', type=int, default=4, help="Pages downloaded concurrently")
+    parser.add_argument('--iso-times', action='store_true', help="Write UTC ISO-8601 times instead of epoch ms")
+    args = parser.parse_args()
+
+    symbols = read_symbols(args)
+    if not symbols:
+        parser.error("give --symbols or --symbols-file")
+    ranges = args.ranges or [parse_range("2023-01-01:2023-01-10")]
+
+    exporter = CandleExporter(args.output, args.export_format, args.chunk_rows, args.iso_times,
+                              KlineDownloader(max_workers=args.max_workers))
+    results = exporter.export(symbols, args.intervals, ranges)
+    total_rows = sum(checkpoint['rows'] for checkpoint in results.values())
+    print(f"Exported {total_rows:,} candles into {len(results)} files under {args.output}")
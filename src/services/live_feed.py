@@ -0,0 +1,234 @@
+import json
+import queue
+import threading
+import time
+from collections import deque
+
+from src.data.data_fetch.binance_data_fetch.stream_manager import BinanceStreamManager
+from src.data.data_processing.intervals import interval_period_ids, period_open_times
+from src.data.data_processing.resampler import CandleResampler
+from src.utils.logging_service import LoggingService
+
+HEARTBEAT_SECONDS = 15
+
+
+class FeedSubscription:
+    """One client's view of a channel: the snapshot at connect time plus queued deltas"""
+
+    def __init__(self, channel, snapshot, queue_size):
+        self.channel = channel
+        self.snapshot = snapshot
+        self.updates = queue.Queue(maxsize=queue_size)
+        self.dropped = 0
+
+    def push(self, candle):
+        # A client that falls behind loses its oldest updates, never the newest
+        try:
+            self.updates.put_nowait(candle)
+        except queue.Full:
+            try:
+                self.updates.get_nowait()
+            except queue.Empty:
+                pass
+            self.dropped += 1
+            self.updates.put_nowait(candle)
+
+
+class _Channel:
+    """Ring buffer and subscribers of one (symbol, interval) upstream stream"""
+
+    def __init__(self, symbol, interval, buffer_size, resampler=None):
+        self.symbol = symbol
+        self.interval = interval
+        # Resampled channels listen to the base interval stream and build their bars
+        self.resampler = resampler
+        self.upstream_interval = interval if resampler is None else resampler.base_interval
+        self.candles = deque(maxlen=buffer_size)
+        self.subscriptions = set()
+        self.lock = threading.Lock()
+        self.seeded = False
+        self.callback = None
+
+    def merge(self, candle):
+        """Add a candle, replacing the in-progress bar it revises; returns False for stale bars"""
+        if self.candles and self.candles[-1]['time'] == candle['time']:
+            self.candles[-1] = candle
+        elif not self.candles or self.candles[-1]['time'] < candle['time']:
+            self.candles.append(candle)
+        else:
+            return False
+        return True
+
+
+class LiveFeedHub:
+    """
+    Fans live candles out to any number of browser clients.
+
+    Each (symbol, interval) has one upstream subscription on the shared
+    BinanceStreamManager and one ring buffer of recent candles, seeded once
+    from history. Intervals that can be built from the base interval do not
+    get a stream of their own: they listen to the symbol's base stream and a
+    CandleResampler turns every base kline into an update of the partial
+    higher-timeframe bar. New clients receive the buffer as a snapshot and
+    then every update, so upstream sockets and REST calls do not grow with
+    the number of open dashboards or intervals.
+    """
+
+    def __init__(self, history=None, manager=None, buffer_size=500, client_queue_size=1000,
+                 base_interval='1m', base_history=None):
+        """
+        :param history: Callable (symbol, interval, limit) -> list of closed candle dicts used to seed a channel
+        :param manager: BinanceStreamManager (defaults to the shared one)
+        :param buffer_size: Candles kept per channel and sent as the snapshot
+        :param client_queue_size: Updates buffered per client before old ones are dropped
+        :param base_interval: Stream interval that higher timeframes are resampled from, None to
+                              subscribe every interval natively
+        :param base_history: Callable (symbol, start_time) -> CandleFrame of the closed base candles
+                             since start_time, used to seed the partial bar of a resampled channel
+        """
+        self.history = history
+        self.manager = manager
+        self.buffer_size = buffer_size
+        self.client_queue_size = client_queue_size
+        self.base_interval = base_interval
+        self.base_history = base_history
+        self.logger = LoggingService()
+        self._channels = {}
+        self._lock = threading.Lock()
+
+    def _get_manager(self):
+        if self.manager is None:
+            self.manager = BinanceStreamManager.shared()
+        return self.manager
+
+    def subscribe(self, symbol, interval="1m"):
+        """
+        Register a client on a channel, starting the upstream stream if needed.
+
+        :param symbol: Trading pair symbol
+        :param interval: Kline interval
+        :return: FeedSubscription holding the snapshot and the update queue
+        """
+        key = (symbol.upper(), interval)
+        with self._lock:
+            channel = self._channels.get(key)
+            if channel is None:
+                channel = self._channels[key] = _Channel(key[0], interval, self.buffer_size,
+                                                         self._make_resampler(interval))
+
+        with channel.lock:
+            if not channel.seeded:
+                self._seed(channel)
+                self._get_manager().subscribe(channel.symbol, channel.upstream_interval,
+                                              self._make_callback(channel))
+                channel.seeded = True
+            subscription = FeedSubscription(channel, list(channel.candles), self.client_queue_size)
+            channel.subscriptions.add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Remove a client; the upstream stream stops with the channel's last client"""
+        channel = subscription.channel
+        with channel.lock:
+            channel.subscriptions.discard(subscription)
+            if channel.subscriptions or not channel.seeded:
+                return
+            # The buffer goes stale without a stream; the next client reseeds it
+            channel.seeded = False
+            channel.candles.clear()
+            if channel.resampler is not None:
+                channel.resampler.reset()
+            callback = channel.callback
+        self._get_manager().unsubscribe(channel.symbol, channel.upstream_interval, callback)
+
+    def _make_resampler(self, interval):
+        """CandleResampler building interval from the base stream, None when it has to be streamed natively"""
+        if self.base_interval is None or interval == self.base_interval:
+            return None
+        try:
+            return CandleResampler([interval], self.base_interval)
+        except ValueError:
+            return None
+
+    def _seed(self, channel):
+        if self.history is not None:
+            try:
+                for candle in self.history(channel.symbol, channel.interval, self.buffer_size):
+                    channel.merge(candle)
+            except Exception as e:
+                self.logger.error("Could not load history for %s %s: %s", channel.symbol, channel.interval, e)
+        if channel.resampler is not None and self.base_history is not None:
+            self._seed_partial_bar(channel)
+
+    def _seed_partial_bar(self, channel):
+        """Start the resampler from the base candles of the current period, so the bar is complete"""
+        now = int(time.time() * 1000)
+        period_open = int(period_open_times(interval_period_ids([now], channel.interval), channel.interval)[0])
+        try:
+            channel.resampler.seed(channel.symbol, self.base_history(channel.symbol, period_open))
+        except Exception as e:
+            self.logger.error("Could not load %s candles for %s %s: %s", self.base_interval, channel.symbol,
+                              channel.interval, e)
+            return
+        for kline in channel.resampler.partial_bars(channel.symbol):
+            channel.merge(kline.to_dict())
+
+    def _make_callback(self, channel):
+        def on_kline(kline):
+            with channel.lock:
+                # Ignore updates still in flight from a stream that was stopped
+                if channel.callback is not on_kline:
+                    return
+                updates = [kline] if channel.resampler is None else channel.resampler.on_kline(kline)
+                candles = []
+                for update in updates:
+                    candle = update.to_dict()
+                    if channel.merge(candle):
+                        candles.append(candle)
+                subscriptions = list(channel.subscriptions)
+            for candle in candles:
+                for subscription in subscriptions:
+                    subscription.push(candle)
+
+        channel.callback = on_kline
+        return on_kline
+
+    def listen(self, symbol, interval="1m", heartbeat=HEARTBEAT_SECONDS):
+        """
+        Generate Server-Sent Events for a channel until the client goes away.
+
+        The client is subscribed when the generator starts rather than when it
+        is created, so a response that is never iterated leaves no subscription.
+
+        :param symbol: Trading pair symbol
+        :param interval: Kline interval
+        :param heartbeat: Seconds of silence before a keep-alive comment is sent
+        :return: Generator of SSE-formatted strings
+        """
+        subscription = self.subscribe(symbol, interval)
+        try:
+            yield f"event: snapshot\ndata: {json.dumps(subscription.snapshot)}\n\n"
+            while True:
+                try:
+                    candle = subscription.updates.get(timeout=heartbeat)
+                except queue.Empty:
+                    yield ": keep-alive\n\n"
+                    continue
+                yield f"event: candle\ndata: {json.dumps(candle)}\n\n"
+        finally:
+            self.unsubscribe(subscription)
+
+    def stats(self):
+        """Channels with their client counts and buffered candles"""
+        with self._lock:
+            channels = list(self._channels.values())
+        return [
+            {
+                'symbol': channel.symbol,
+                'interval': channel.interval,
+                'clients': len(channel.subscriptions),
+                'buffered': len(channel.candles),
+                'dropped': sum(subscription.dropped for subscription in list(channel.subscriptions)),
+            }
+            for channel in channels
+        ]
@@ -0,0 +1,176 @@
+import hashlib
+import json
+import threading
+import time
+
+from src.data.data_fetch.binance_data_fetch.binance_client import BinanceClient
+from src.utils.logging_service import LoggingService
+
+# ticker/24hr for all symbols costs 80 request weight, so it is polled once a minute
+DEFAULT_REFRESH_SECONDS = 60
+# The refresher stops after this long without requests and restarts on the next one
+DEFAULT_IDLE_SECONDS = 300
+MAX_PAGE_SIZE = 200
+
+
+def project_pair(pair, quote='USDT'):
+    """Keep only the ticker fields the UI shows, as numbers"""
+    symbol = pair['symbol']
+    return {
+        'symbol': symbol,
+        'base': symbol[:-len(quote)] if symbol.endswith(quote) else symbol,
+        'price': float(pair['lastPrice']),
+        'change24h': float(pair['priceChangePercent']),
+        'volume': float(pair['volume']),
+        'quoteVolume': float(pair['quoteVolume']),
+    }
+
+
+class _Snapshot:
+    """
+    Immutable pair list with a substring index, swapped in whole on refresh.
+
+    The version hashes the prices and volumes too, so it (and every ETag
+    built from it) lasts one refresh interval.
+    """
+
+    def __init__(self, pairs):
+        # Most traded pairs first, which is also the order of search results
+        self.pairs = sorted(pairs, key=lambda pair: pair['quoteVolume'], reverse=True)
+        self.version = hashlib.sha1(json.dumps(self.pairs, sort_keys=True).encode()).hexdigest()[:16]
+        self.updated_at = time.time()
+
+        # Every substring of every symbol maps to the matching positions, with
+        # prefix matches (on the base or full symbol) ahead of infix matches
+        index = {}
+        for position, pair in enumerate(self.pairs):
+            symbol = pair['symbol']
+            for start in range(len(symbol)):
+                for end in range(start + 1, len(symbol) + 1):
+                    index.setdefault(symbol[start:end], set()).add(position)
+        self.index = {
+            term: tuple(sorted(positions, key=lambda position: (
+                not self.pairs[position]['symbol'].startswith(term), position)))
+            for term, positions in index.items()
+        }
+
+    def search(self, query):
+        if not query:
+            return range(len(self.pairs))
+        return self.index.get(query, ())
+
+
+class TradingPairsSnapshot:
+    """
+    In-memory USDT universe kept fresh by a background thread.
+
+    Requests are answered from the latest snapshot, so search latency never
+    includes a Binance round trip; a failed refresh keeps serving the previous one.
+    The refresher stops once no request has come in for ``idle_timeout``
+    seconds; the next request then reloads a stale snapshot synchronously.
+    """
+
+    def __init__(self, refresh_interval=DEFAULT_REFRESH_SECONDS, fetch_pairs=None, quote='USDT',
+                 idle_timeout=DEFAULT_IDLE_SECONDS):
+        """
+        :param refresh_interval: Seconds between ticker/24hr refreshes
+        :param fetch_pairs: Callable returning raw 24hr tickers (defaults to BinanceClient.get_trading_pairs)
+        :param quote: Quote asset stripped from symbols to get the base asset
+        :param idle_timeout: Seconds without requests after which the refresher stops
+        """
+        self.refresh_interval = refresh_interval
+        self.idle_timeout = idle_timeout
+        self.fetch_pairs = fetch_pairs or BinanceClient.get_trading_pairs
+        self.quote = quote
+        self.logger = LoggingService()
+        self._snapshot = None
+        self._last_access = time.monotonic()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._stopping = threading.Event()
+
+    def start(self):
+        """Start the background refresher (idempotent)"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name='trading-pairs-refresher', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the background refresher"""
+        self._stopping.set()
+
+    def _run(self):
+        while not self._stopping.wait(self.refresh_interval):
+            with self._lock:
+                if time.monotonic() - self._last_access > self.idle_timeout:
+                    self._thread = None
+                    return
+            self.refresh()
+
+    def refresh(self):
+        """
+        Fetch tickers and swap in a new snapshot.
+
+        :return: True if the snapshot was replaced
+        """
+        try:
+            pairs = [project_pair(pair, self.quote) for pair in self.fetch_pairs()
+                     if pair['symbol'].endswith(self.quote)]
+        except Exception as e:
+            self.logger.error("Error refreshing trading pairs: %s", e)
+            return False
+        if not pairs:
+            # get_trading_pairs reports failures as an empty list
+            return False
+        self._snapshot = _Snapshot(pairs)
+        return True
+
+    def snapshot(self):
+        """
+        Latest snapshot, (re)starting the refresher. The first snapshot, or a
+        stale one left by an idle refresher, is loaded synchronously.
+        """
+        self._last_access = time.monotonic()
+        snapshot = self._snapshot
+        if snapshot is None or (self._thread is None and
+                                time.time() - snapshot.updated_at >= self.refresh_interval):
+            with self._lock:
+                if self._snapshot is snapshot:
+                    self.refresh()
+        self.start()
+        return self._snapshot
+
+    def search(self, query='', page=1, page_size=50, snapshot=None):
+        """
+        Page through pairs whose symbol contains query, prefix matches first.
+
+        :param query: Case-insensitive symbol fragment, e.g. 'eth'
+        :param page: 1-based page number
+        :param page_size: Pairs per page (capped at MAX_PAGE_SIZE)
+        :param snapshot: Snapshot to search (defaults to the latest), e.g. the one an ETag was built from
+        :return: Dict with the page items, total matches and the snapshot version
+        """
+        snapshot = snapshot or self.snapshot()
+        page = max(1, int(page))
+        page_size = min(max(1, int(page_size)), MAX_PAGE_SIZE)
+        if snapshot is None:
+            return {'items': [], 'total': 0, 'page': page, 'page_size': page_size, 'version': None}
+
+        positions = snapshot.search(query.strip().upper())
+        start = (page - 1) * page_size
+        return {
+            'items': [snapshot.pairs[position] for position in positions[start:start + page_size]],
+            'total': len(positions),
+            'page': page,
+            'page_size': page_size,
+            'version': snapshot.version,
+        }
+
+    def etag(self, query='', page=1, page_size=50, snapshot=None):
+        """ETag of a search response; it changes only when the snapshot does"""
+        snapshot = snapshot or self.snapshot()
+        version = snapshot.version if snapshot is not None else 'empty'
+        key = f"{version}:{query.strip().upper()}:{page}:{page_size}"
+        return hashlib.sha1(key.encode()).hexdigest()[:20]
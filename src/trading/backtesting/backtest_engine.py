@@ -1,50 +1,132 @@
+import time
+
 import pandas as pandas
 import numpy as numpy
+from src.analysis.strategies.strategy import generate_signals as generate_strategy_signals
+from src.data.data_processing.candle_frame import CandleFrame
+from src.utils import jit
+from src.utils.metrics import record_backtest
 from ..technical_analysis.indicators import TechnicalIndicators
 
 class BacktestEngine:
-    def __init__(self, initial_capital=10000.0):
+    def __init__(self, initial_capital=10000.0, vectorized=True):
+        """
+        :param initial_capital: Starting capital for the backtest
+        :param vectorized: Use the NumPy execution path instead of the per-bar loop
+        """
         self.initial_capital = initial_capital
+        self.vectorized = vectorized
         self.capital = initial_capital
         self.positions = {}
         self.trades = []
         self.indicators = TechnicalIndicators()
         
+    def reset(self):
+        """Clear capital, positions and trades left over from a previous run"""
+        self.capital = self.initial_capital
+        self.positions = {}
+        self.trades = []
+
     def run_backtest(self, historical_data, strategy_params):
         """
         Run backtest with given historical data and strategy parameters
         
-        :param historical_data: DataFrame with OHLCV data
+        :param historical_data: CandleFrame or DataFrame with OHLCV data
         :param strategy_params: Dict containing strategy parameters
         :return: Dict containing backtest results
         """
-        df = pandas.DataFrame(historical_data)
-        
-        # Calculate indicators based on strategy parameters
+        if isinstance(historical_data, CandleFrame):
+            df = historical_data.to_dataframe()
+        else:
+            df = pandas.DataFrame(historical_data)
+        df = self._calculate_indicators(df, strategy_params)
+        return self.run_prepared_backtest(df, strategy_params)
+
+    def run_strategy_backtest(self, historical_data, strategies):
+        """
+        Run backtest by feeding each bar to Strategy objects, exactly as the
+        live StrategyRuntime does, so simulated and live signals match.
+        Execution is long-only like the runtime: BUY opens a position and
+        SELL closes it. max_open_positions does not apply to one symbol.
+
+        :param historical_data: CandleFrame or DataFrame with OHLCV data
+        :param strategies: Fresh Strategy instances (see build_strategies)
+        :return: Dict containing backtest results
+        """
+        if isinstance(historical_data, CandleFrame):
+            df = historical_data.to_dataframe()
+        else:
+            df = pandas.DataFrame(historical_data)
+        started = time.perf_counter()
+        self.reset()
+        signals = generate_strategy_signals(strategies, df['close'].to_numpy())
+        results = self._execute_long_only(df, signals)
+        record_backtest('strategy', len(df), time.perf_counter() - started)
+        return self._calculate_metrics(results)
+
+    def run_stored_backtest(self, candle_store, symbol, interval, strategy_params, start_time=None, end_time=None):
+        """
+        Run backtest on candles read from a CandleStore
+
+        :param candle_store: CandleStore holding the history
+        :param symbol: Trading pair symbol
+        :param interval: Candlestick interval
+        :param strategy_params: Dict containing strategy parameters
+        :param start_time: Unix timestamp in milliseconds (inclusive, optional)
+        :param end_time: Unix timestamp in milliseconds (exclusive, optional)
+        :return: Dict containing backtest results
+        """
+        return self.run_backtest(candle_store.read_candles(symbol, interval, start_time, end_time), strategy_params)
+
+    def run_prepared_backtest(self, df, strategy_params):
+        """
+        Run backtest on a DataFrame that already holds the indicator columns
+        required by strategy_params (SMA, RSI, MACD/Signal/Histogram).
+
+        :param df: DataFrame with a close column and indicator columns
+        :param strategy_params: Dict containing strategy parameters
+        :return: Dict containing backtest results
+        """
+        started = time.perf_counter()
+        self.reset()
+        signals = self.generate_signals(df, strategy_params)
+        results = self._execute_signals(df, signals)
+        record_backtest('vectorized' if self.vectorized else 'loop', len(df), time.perf_counter() - started)
+
+        return self._calculate_metrics(results)
+
+    @staticmethod
+    def indicator_spec(strategy_params):
+        """Build the compute_indicators spec for the columns a strategy needs"""
+        spec = {}
         if strategy_params.get('sma'):
-            df['SMA'] = self.indicators.calculate_simple_moving_average(df['close'], 
-                                                                      strategy_params['sma_period'])
+            spec['SMA'] = {'indicator': 'sma', 'period': strategy_params['sma_period']}
         
         if strategy_params.get('rsi'):
-            df['RSI'] = self.indicators.calculate_relative_strength_index(df['close'], 
-                                                                        strategy_params['rsi_period'])
+            spec['RSI'] = {'indicator': 'rsi', 'period': strategy_params['rsi_period']}
         
         if strategy_params.get('macd'):
-            macd_line, signal_line, histogram = self.indicators.calculate_moving_average_convergence_divergence(
-                df['close']
-            )
-            df['MACD'] = macd_line
-            df['Signal'] = signal_line
-            df['Histogram'] = histogram
-        
-        # Run strategy
-        signals = self._generate_signals(df, strategy_params)
-        results = self._execute_signals(df, signals)
-        
-        return self._calculate_metrics(results)
+            spec['MACD'] = {
+                'indicator': 'macd',
+                'fast_period': strategy_params.get('macd_fast_period', 12),
+                'slow_period': strategy_params.get('macd_slow_period', 26),
+                'signal_period': strategy_params.get('macd_signal_period', 9),
+                'columns': ['MACD', 'Signal', 'Histogram']
+            }
+        return spec
+
+    def _calculate_indicators(self, df, strategy_params):
+        """Calculate indicators based on strategy parameters"""
+        return self.indicators.compute_indicators(df, self.indicator_spec(strategy_params))
     
-    def _generate_signals(self, df, strategy_params):
-        """Generate trading signals based on indicators"""
+    def generate_signals(self, df, strategy_params):
+        """
+        Generate trading signals based on indicators
+
+        :param df: DataFrame with a close column and the indicator columns of strategy_params
+        :param strategy_params: Dict containing strategy parameters
+        :return: Series of 1 (buy), -1 (sell) or 0 (no signal) per bar
+        """
         signals = pandas.Series(index=df.index, data=0)
         
         if strategy_params.get('sma'):
@@ -65,7 +147,13 @@ class BacktestEngine:
         return signals
     
     def _execute_signals(self, df, signals):
-        """Execute trading signals and track performance"""
+        """Execute trading signals with the engine selected by ``self.vectorized``"""
+        if self.vectorized:
+            return self._execute_signals_vectorized(df, signals)
+        return self._execute_signals_loop(df, signals)
+
+    def _execute_signals_loop(self, df, signals):
+        """Execute trading signals bar by bar and track performance"""
         position = 0
         equity = []
         returns = []
@@ -94,6 +182,89 @@ class BacktestEngine:
             'returns': returns
         }, index=df.index)
     
+    def _execute_signals_vectorized(self, df, signals):
+        """
+        Execute trading signals with array operations.
+
+        Produces the same trades, equity and returns as the per-bar loop:
+        the position is the last non-zero signal, a trade happens whenever
+        the position changes, and equity is marked against the latest entry price.
+        """
+        close = df['close'].to_numpy(dtype=numpy.float64)
+        raw_signals = numpy.asarray(signals, dtype=numpy.int64)
+        if jit.active():
+            position, equity, trade_index = _signal_positions(raw_signals, close, float(self.capital))
+            return self._signal_results(df, close, position, equity, trade_index)
+
+        # Position is the most recent non-zero signal (0 before the first one)
+        position, trade_index, entry_price = self._signal_trades(raw_signals, close, lambda signal: signal)
+
+        with numpy.errstate(invalid='ignore', divide='ignore'):
+            marked_equity = self.capital * (1 + position * (close - entry_price) / entry_price)
+        equity = numpy.where(position != 0, marked_equity, self.capital)
+        return self._signal_results(df, close, position, equity, trade_index)
+
+    def _execute_long_only(self, df, signals):
+        """
+        Execute signals without shorting: BUY goes long, SELL goes flat, and
+        equity is marked against the entry price while long.
+        """
+        close = df['close'].to_numpy(dtype=numpy.float64)
+        raw_signals = numpy.asarray(signals, dtype=numpy.int64)
+
+        # Position is 1 after the most recent BUY until a SELL (0 before the first signal)
+        position, trade_index, entry_price = self._signal_trades(raw_signals, close, lambda signal: signal == 1)
+
+        with numpy.errstate(invalid='ignore', divide='ignore'):
+            marked_equity = self.capital * close / entry_price
+        equity = numpy.where(position != 0, marked_equity, self.capital)
+        return self._signal_results(df, close, position, equity, trade_index)
+
+    @staticmethod
+    def _signal_trades(raw_signals, close, position_of_signal):
+        """
+        Positions, trades and entry prices of a signal series, shared by the vectorized executions.
+
+        :param raw_signals: int64 array of 1, -1 or 0 per bar
+        :param close: Close prices
+        :param position_of_signal: Maps an array of the latest non-zero signal per bar to positions
+        :return: (position per bar, indices of the trade bars, entry price per bar, NaN before the first trade)
+        """
+        last_signal_index = numpy.where(raw_signals != 0, numpy.arange(len(raw_signals)), -1)
+        last_signal_index = numpy.maximum.accumulate(last_signal_index)
+        position = numpy.where(last_signal_index >= 0, position_of_signal(raw_signals[last_signal_index]), 0)
+        position = position.astype(numpy.int64, copy=False)
+
+        previous_position = numpy.empty_like(position)
+        previous_position[:1] = 0
+        previous_position[1:] = position[:-1]
+        trade_index = numpy.flatnonzero(position != previous_position)
+
+        # Entry price is the close of the most recent trade
+        last_trade_index = numpy.full(len(close), -1, dtype=numpy.int64)
+        last_trade_index[trade_index] = trade_index
+        last_trade_index = numpy.maximum.accumulate(last_trade_index)
+        entry_price = numpy.where(last_trade_index >= 0, close[last_trade_index], numpy.nan)
+        return position, trade_index, entry_price
+
+    def _signal_results(self, df, close, position, equity, trade_index):
+        """Record the trades and build the equity/returns frame of an executed signal series"""
+        returns = numpy.zeros(len(equity))
+        returns[1:] = (equity[1:] - equity[:-1]) / equity[:-1]
+
+        for i in trade_index:
+            self.trades.append({
+                'timestamp': df.index[i],
+                'price': close[i],
+                'type': 'buy' if position[i] == 1 else 'sell',
+                'size': self.capital / close[i]
+            })
+
+        return pandas.DataFrame({
+            'equity': equity,
+            'returns': returns
+        }, index=df.index)
+
     def _calculate_metrics(self, results):
         """Calculate performance metrics"""
         total_return = (results['equity'].iloc[-1] - self.initial_capital) / self.initial_capital
@@ -109,3 +280,38 @@ class BacktestEngine:
             'trades': self.trades,
             'equity_curve': results['equity'].tolist()
         }
+
+
+def _signal_warm_up_arguments():
+    signals = numpy.array([0, 1, 0, -1], dtype=numpy.int64)
+    close = numpy.ones(4)
+    return [(signals, close, 10000.0), (signals, jit.read_only(close), 10000.0)]
+
+
+@jit.kernel(warm_up=_signal_warm_up_arguments, error_model='numpy')
+def _signal_positions(signals, close, capital):
+    """
+    Single-pass version of _execute_signals_vectorized's array steps.
+
+    :return: (position per bar, equity per bar, indices of the trade bars)
+    """
+    length = len(close)
+    position = numpy.zeros(length, dtype=numpy.int64)
+    equity = numpy.empty(length)
+    trade_index = numpy.empty(length, dtype=numpy.int64)
+    trades = 0
+    current = 0
+    entry_price = numpy.nan
+    for index in range(length):
+        signal = signals[index]
+        if signal != 0 and signal != current:
+            current = signal
+            entry_price = close[index]
+            trade_index[trades] = index
+            trades += 1
+        position[index] = current
+        if current != 0:
+            equity[index] = capital * (1 + current * (close[index] - entry_price) / entry_price)
+        else:
+            equity[index] = capital
+    return position, equity, trade_index[:trades]
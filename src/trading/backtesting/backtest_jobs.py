@@ -0,0 +1,304 @@
+import hashlib
+import json
+import math
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from src.data.storage.candle_store import CandleStore
+from src.utils import jit
+from src.utils.logging_service import LoggingService
+from .backtest_engine import BacktestEngine
+
+# Engine parameters for the strategies offered by the Tradelab panel
+STRATEGY_PRESETS = {
+    'ma_cross': {'sma': True, 'sma_period': 20},
+    'rsi': {'rsi': True, 'rsi_period': 14},
+    'macd': {'macd': True, 'macd_fast_period': 12, 'macd_slow_period': 26, 'macd_signal_period': 9},
+}
+
+PENDING = 'pending'
+RUNNING = 'running'
+COMPLETED = 'completed'
+FAILED = 'failed'
+CANCELLED = 'cancelled'
+FINISHED_STATES = (COMPLETED, FAILED, CANCELLED)
+
+
+def resolve_strategy_params(strategy, parameters=None):
+    """
+    Merge user parameters over a strategy preset.
+
+    :param strategy: Key of STRATEGY_PRESETS, or None to use parameters as-is
+    :param parameters: Dict of engine parameters overriding the preset
+    :return: Dict of engine strategy parameters
+    """
+    if strategy is not None and strategy not in STRATEGY_PRESETS:
+        raise ValueError(f"Unknown strategy '{strategy}'")
+    params = dict(STRATEGY_PRESETS.get(strategy, {}))
+    params.update(parameters or {})
+    return params
+
+
+def result_key(symbol, interval, first_open_time, last_open_time, candle_count, strategy_params):
+    """Hash identifying a backtest of one symbol over an exact stored data range"""
+    payload = json.dumps([symbol.upper(), interval, first_open_time, last_open_time, candle_count,
+                          strategy_params], sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode()).hexdigest()
+
+
+def _trade_outcomes(trades):
+    """Count winning and losing positions, each closed by the following trade"""
+    winning = losing = 0
+    for entry, exit_ in zip(trades, trades[1:]):
+        direction = 1 if entry['type'] == 'buy' else -1
+        pnl = direction * (exit_['price'] - entry['price'])
+        if pnl > 0:
+            winning += 1
+        elif pnl < 0:
+            losing += 1
+    return winning, losing
+
+
+def _finite(value):
+    value = float(value)
+    return value if math.isfinite(value) else None
+
+
+def _run_symbol_backtest(store_root, symbol, interval, start_time, end_time, strategy_params, initial_capital):
+    """Process pool task: backtest one symbol straight from the memory-mapped store"""
+    engine = BacktestEngine(initial_capital)
+    store = CandleStore(store_root)
+    results = engine.run_stored_backtest(store, symbol, interval, strategy_params, start_time, end_time)
+    winning, losing = _trade_outcomes(results['trades'])
+    return {
+        'symbol': symbol,
+        'total_return': _finite(results['total_return']),
+        'sharpe_ratio': _finite(results['sharpe_ratio']),
+        'max_drawdown': _finite(results['max_drawdown']),
+        'win_rate': _finite(results['win_rate']),
+        'total_trades': len(results['trades']),
+        'winning_trades': winning,
+        'losing_trades': losing,
+        'final_equity': _finite(results['equity_curve'][-1]),
+    }
+
+
+class BacktestJobService:
+    """
+    Runs backtest jobs in the background so web requests never block on them.
+
+    A job covers several symbols; each symbol is one task on a process pool
+    that reads its candles from the CandleStore. Finished per-symbol results
+    are cached by a hash of (symbol, interval, stored data range, strategy
+    parameters), so resubmitting an unchanged backtest completes immediately.
+    """
+
+    def __init__(self, candle_store=None, max_workers=None, initial_capital=10000.0,
+                 cache_size=256, max_jobs=1000):
+        """
+        :param candle_store: CandleStore to sync and read candles from
+        :param max_workers: Backtest processes (defaults to the CPU count)
+        :param initial_capital: Starting capital of every backtest
+        :param cache_size: Number of per-symbol results kept in the result cache
+        :param max_jobs: Number of jobs remembered for polling
+        """
+        self.candle_store = candle_store or CandleStore()
+        self.max_workers = max_workers
+        self.initial_capital = initial_capital
+        self.cache_size = cache_size
+        self.max_jobs = max_jobs
+        self.logger = LoggingService()
+        self._jobs = OrderedDict()
+        self._results = OrderedDict()
+        self._lock = threading.Lock()
+        self._pool = None
+        # Syncing candles is network-bound, so it runs on threads ahead of the pool
+        self._coordinator = ThreadPoolExecutor(max_workers=4, thread_name_prefix='backtest-job')
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers, initializer=jit.warm_up)
+            return self._pool
+
+    def shutdown(self):
+        """Stop the coordinator threads and the process pool"""
+        self._coordinator.shutdown(wait=False, cancel_futures=True)
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+
+    def submit(self, symbols, interval, strategy_params, start_time=None, end_time=None):
+        """
+        Queue a backtest of strategy_params over each symbol.
+
+        :param symbols: Trading pair symbols
+        :param interval: Candlestick interval
+        :param strategy_params: Engine strategy parameters
+        :param start_time: Unix timestamp in milliseconds (inclusive)
+        :param end_time: Unix timestamp in milliseconds (exclusive, defaults to now)
+        :return: Job id
+        """
+        symbols = [symbol.upper() for symbol in symbols]
+        if not symbols:
+            raise ValueError("At least one symbol is required")
+        job_id = uuid.uuid4().hex
+        job = {
+            'id': job_id,
+            'status': PENDING,
+            'symbols': symbols,
+            'interval': interval,
+            'strategy_params': strategy_params,
+            'results': {},
+            'errors': {},
+            'cached': 0,
+            'created_at': time.time(),
+            'finished_at': None,
+            'futures': {},
+        }
+        with self._lock:
+            self._jobs[job_id] = job
+            while len(self._jobs) > self.max_jobs:
+                self._jobs.popitem(last=False)
+        for symbol in symbols:
+            job['futures'][symbol] = self._coordinator.submit(
+                self._prepare_symbol, job, symbol, start_time, end_time)
+        return job_id
+
+    def _prepare_symbol(self, job, symbol, start_time, end_time):
+        """Sync candles, then answer from the cache or dispatch to the pool"""
+        if job['status'] == CANCELLED:
+            return
+        self._set_running(job)
+        interval = job['interval']
+        try:
+            self.candle_store.sync(symbol, interval, start_time=start_time, end_time=end_time)
+            open_times = self.candle_store.read(symbol, interval, start_time, end_time)['open_time']
+            if len(open_times) == 0:
+                raise ValueError(f"No candles available for {symbol} {interval}")
+            first_open_time, last_open_time = int(open_times[0]), int(open_times[-1])
+            key = result_key(symbol, interval, first_open_time, last_open_time, len(open_times),
+                             job['strategy_params'])
+        except Exception as e:
+            self._finish_symbol(job, symbol, error=e)
+            return
+
+        with self._lock:
+            cached = self._results.get(key)
+            if cached is not None:
+                self._results.move_to_end(key)
+                job['cached'] += 1
+        if cached is not None:
+            self._finish_symbol(job, symbol, result=cached)
+            return
+
+        if job['status'] == CANCELLED:
+            return
+        future = self._get_pool().submit(
+            _run_symbol_backtest, self.candle_store.root, symbol, interval, first_open_time,
+            last_open_time + 1, job['strategy_params'], self.initial_capital)
+        job['futures'][symbol] = future
+        future.add_done_callback(lambda done: self._collect(job, symbol, key, done))
+
+    def _collect(self, job, symbol, key, future):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            self._finish_symbol(job, symbol, error=error)
+            return
+        result = future.result()
+        with self._lock:
+            self._results[key] = result
+            while len(self._results) > self.cache_size:
+                self._results.popitem(last=False)
+        self._finish_symbol(job, symbol, result=result)
+
+    def _set_running(self, job):
+        with self._lock:
+            if job['status'] == PENDING:
+                job['status'] = RUNNING
+
+    def _finish_symbol(self, job, symbol, result=None, error=None):
+        with self._lock:
+            if job['status'] == CANCELLED:
+                return
+            if error is not None:
+                self.logger.error("Backtest of %s failed: %s", symbol, error)
+                job['errors'][symbol] = str(error)
+            else:
+                job['results'][symbol] = result
+            if len(job['results']) + len(job['errors']) == len(job['symbols']):
+                job['status'] = COMPLETED if job['results'] else FAILED
+                job['finished_at'] = time.time()
+
+    def cancel(self, job_id):
+        """
+        Cancel a job. Queued symbols are dropped; symbols already running
+        finish in the background and only populate the result cache.
+
+        :return: True if the job was still active
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job['status'] in FINISHED_STATES:
+                return False
+            job['status'] = CANCELLED
+            job['finished_at'] = time.time()
+            futures = list(job['futures'].values())
+        for future in futures:
+            future.cancel()
+        return True
+
+    def status(self, job_id):
+        """
+        Progress and results of a job, or None for an unknown id.
+
+        :return: Dict with status, progress counts, per-symbol results and a summary
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None:
+                return None
+            results = dict(job['results'])
+            errors = dict(job['errors'])
+            status = {
+                'id': job['id'],
+                'status': job['status'],
+                'symbols': job['symbols'],
+                'interval': job['interval'],
+                'completed': len(results) + len(errors),
+                'total': len(job['symbols']),
+                'cached': job['cached'],
+                'results': results,
+                'errors': errors,
+            }
+        if status['status'] == COMPLETED:
+            status['summary'] = self.summarize(results.values())
+        return status
+
+    @staticmethod
+    def summarize(results):
+        """Aggregate per-symbol results into the figures shown by the Tradelab panel"""
+        results = list(results)
+        if not results:
+            return None
+
+        def mean(name):
+            values = [result[name] for result in results if result[name] is not None]
+            return sum(values) / len(values) if values else None
+
+        def rounded(value, scale=1):
+            return None if value is None else round(value * scale, 2)
+
+        return {
+            'totalReturn': rounded(mean('total_return'), 100),
+            'winRate': rounded(mean('win_rate'), 100),
+            'sharpeRatio': rounded(mean('sharpe_ratio')),
+            'maxDrawdown': rounded(mean('max_drawdown'), 100),
+            'totalTrades': sum(result['total_trades'] for result in results),
+            'winningTrades': sum(result['winning_trades'] for result in results),
+            'losingTrades': sum(result['losing_trades'] for result in results),
+        }
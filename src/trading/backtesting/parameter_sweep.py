@@ -0,0 +1,208 @@
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as numpy
+import pandas as pandas
+
+from src.data.data_processing.candle_frame import CandleFrame
+from src.utils import jit
+from .backtest_engine import BacktestEngine
+from ..technical_analysis.indicators import TechnicalIndicators
+
+OHLCV_COLUMNS = ['open', 'high', 'low', 'close', 'volume']
+METRIC_COLUMNS = ['total_return', 'sharpe_ratio', 'max_drawdown', 'win_rate', 'total_trades']
+
+# Per-process state set up by _initialize_worker
+_worker_memory = None
+_worker_matrix = None
+_worker_engine = None
+
+
+def expand_parameter_grid(param_grid):
+    """
+    Expand a parameter grid into the list of strategy parameter combinations.
+
+    :param param_grid: Dict mapping parameter names to a list of candidate values
+    :return: List of strategy_params dicts, one per combination
+    """
+    names = list(param_grid)
+    values = [value if isinstance(value, (list, tuple)) else [value] for value in param_grid.values()]
+    return [dict(zip(names, combination)) for combination in itertools.product(*values)]
+
+
+def indicator_keys(strategy_params):
+    """Map the indicator columns a strategy needs to a hashable indicator key"""
+    keys = {}
+    if strategy_params.get('sma'):
+        keys['SMA'] = ('SMA', strategy_params['sma_period'])
+    if strategy_params.get('rsi'):
+        keys['RSI'] = ('RSI', strategy_params['rsi_period'])
+    if strategy_params.get('macd'):
+        periods = (
+            strategy_params.get('macd_fast_period', 12),
+            strategy_params.get('macd_slow_period', 26),
+            strategy_params.get('macd_signal_period', 9),
+        )
+        keys['MACD'] = ('MACD',) + periods
+        keys['Signal'] = ('Signal',) + periods
+        keys['Histogram'] = ('Histogram',) + periods
+    return keys
+
+
+def _column_name(key):
+    return '_'.join(str(part) for part in key)
+
+
+def compute_indicator_columns(close, combinations):
+    """Compute every distinct indicator column needed by the combinations exactly once"""
+    spec = {}
+    keys = {}
+    for strategy_params in combinations:
+        strategy_keys = indicator_keys(strategy_params)
+        for name, definition in BacktestEngine.indicator_spec(strategy_params).items():
+            key = strategy_keys[name]
+            if _column_name(key) in keys:
+                continue
+            definition = dict(definition)
+            if definition['indicator'] == 'macd':
+                outputs = [key, ('Signal',) + key[1:], ('Histogram',) + key[1:]]
+                definition['columns'] = [_column_name(output) for output in outputs]
+            else:
+                outputs = [key]
+            keys.update((_column_name(output), output) for output in outputs)
+            spec[_column_name(key)] = definition
+
+    # compute_indicators shares rolling windows and EMAs across the whole grid
+    frame = TechnicalIndicators.compute_indicators(pandas.DataFrame({'close': close}), spec)
+    return {key: frame[name].to_numpy() for name, key in keys.items()}
+
+
+def _initialize_worker(memory_name, shape, initial_capital, vectorized):
+    """Attach a worker process to the shared OHLCV/indicator matrix"""
+    global _worker_memory, _worker_matrix, _worker_engine
+    _worker_memory = shared_memory.SharedMemory(name=memory_name)
+    _worker_matrix = numpy.ndarray(shape, dtype=numpy.float64, buffer=_worker_memory.buf)
+    _worker_engine = BacktestEngine(initial_capital, vectorized=vectorized)
+    jit.warm_up()
+
+
+def _release_worker():
+    """Detach the in-process worker from shared memory"""
+    global _worker_memory, _worker_matrix, _worker_engine
+    _worker_matrix = None
+    _worker_engine = None
+    if _worker_memory is not None:
+        _worker_memory.close()
+        _worker_memory = None
+
+
+def _run_combination(task):
+    """Run one parameter combination against the shared matrix"""
+    strategy_params, column_rows = task
+    df = pandas.DataFrame(
+        {name: _worker_matrix[row] for name, row in column_rows.items()},
+        copy=False
+    )
+    results = _worker_engine.run_prepared_backtest(df, strategy_params)
+    return {
+        'total_return': results['total_return'],
+        'sharpe_ratio': results['sharpe_ratio'],
+        'max_drawdown': results['max_drawdown'],
+        'win_rate': results['win_rate'],
+        'total_trades': len(results['trades']),
+    }
+
+
+class ParameterSweep:
+    """Grid-search runner that spreads BacktestEngine runs across a process pool."""
+
+    def __init__(self, initial_capital=10000.0, max_workers=None, vectorized=True, chunksize=None):
+        """
+        :param initial_capital: Starting capital for every backtest
+        :param max_workers: Number of worker processes (defaults to the CPU count)
+        :param vectorized: Use the vectorized execution path of BacktestEngine
+        :param chunksize: Combinations sent to a worker per task (computed when omitted)
+        """
+        self.initial_capital = initial_capital
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.vectorized = vectorized
+        self.chunksize = chunksize
+
+    def run(self, historical_data, param_grid, rank_by='sharpe_ratio', ascending=False):
+        """
+        Run a backtest for every combination in the parameter grid.
+
+        :param historical_data: CandleFrame, DataFrame (or records) with OHLCV data
+        :param param_grid: Dict mapping strategy parameter names to candidate values,
+                           e.g. {'sma': [True], 'sma_period': [10, 20, 50]}
+        :param rank_by: Metric column used to rank the results
+        :param ascending: Sort order of the ranking metric
+        :return: DataFrame with one row per combination, best first
+        """
+        combinations = expand_parameter_grid(param_grid)
+        if not combinations:
+            return pandas.DataFrame(columns=['rank'] + METRIC_COLUMNS)
+
+        if isinstance(historical_data, CandleFrame):
+            df = historical_data.to_dataframe()
+        else:
+            df = pandas.DataFrame(historical_data)
+        ohlcv = [column for column in OHLCV_COLUMNS if column in df.columns]
+        close = df['close'].astype(numpy.float64)
+        indicator_columns = compute_indicator_columns(close, combinations)
+
+        # One row per series: OHLCV first, then each distinct indicator column
+        row_of = {column: row for row, column in enumerate(ohlcv)}
+        for key in indicator_columns:
+            row_of[key] = len(row_of)
+        shape = (len(row_of), len(df))
+
+        memory = shared_memory.SharedMemory(create=True, size=max(1, int(numpy.prod(shape)) * 8))
+        matrix = None
+        try:
+            matrix = numpy.ndarray(shape, dtype=numpy.float64, buffer=memory.buf)
+            for column in ohlcv:
+                matrix[row_of[column]] = df[column].to_numpy(dtype=numpy.float64)
+            for key, values in indicator_columns.items():
+                matrix[row_of[key]] = values
+
+            tasks = []
+            for strategy_params in combinations:
+                column_rows = {'close': row_of['close']}
+                for name, key in indicator_keys(strategy_params).items():
+                    column_rows[name] = row_of[key]
+                tasks.append((strategy_params, column_rows))
+
+            metrics = self._dispatch(memory.name, shape, tasks)
+        finally:
+            # Drop the view before closing, numpy holds an export of the buffer
+            matrix = None
+            memory.close()
+            memory.unlink()
+
+        results = pandas.concat(
+            [pandas.DataFrame(combinations), pandas.DataFrame(metrics, columns=METRIC_COLUMNS)],
+            axis=1
+        )
+        results = results.sort_values(rank_by, ascending=ascending, na_position='last', kind='stable')
+        results = results.reset_index(drop=True)
+        results.insert(0, 'rank', numpy.arange(1, len(results) + 1))
+        return results
+
+    def _dispatch(self, memory_name, shape, tasks):
+        """Run tasks in-process for a single worker, otherwise across the pool"""
+        initargs = (memory_name, shape, self.initial_capital, self.vectorized)
+        if self.max_workers == 1:
+            _initialize_worker(*initargs)
+            try:
+                return [_run_combination(task) for task in tasks]
+            finally:
+                _release_worker()
+
+        chunksize = self.chunksize or max(1, len(tasks) // (self.max_workers * 4))
+        with ProcessPoolExecutor(max_workers=self.max_workers, initializer=_initialize_worker,
+                                 initargs=initargs) as executor:
+            return list(executor.map(_run_combination, tasks, chunksize=chunksize))
+
@@ -0,0 +1,407 @@
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as numpy
+import pandas as pandas
+
+from .backtest_engine import BacktestEngine
+from .parameter_sweep import compute_indicator_columns, expand_parameter_grid, indicator_keys
+
+# Per-process state set up by _initialize_worker
+_worker_memory = None
+_worker_closes = None
+
+RANKABLE_METRICS = ('sharpe_ratio', 'total_return')
+
+
+def align_closes(candles):
+    """
+    Put every symbol's closes on one time index.
+
+    The index is the union of all open times. Gaps inside a symbol's history
+    carry the previous close forward; bars before its first candle stay NaN.
+
+    :param candles: Dict mapping symbol to CandleFrame
+    :return: (open_times, symbols, closes) with closes shaped (symbols, bars)
+    """
+    symbols = list(candles)
+    frames = [candles[symbol] for symbol in symbols]
+    if not frames:
+        return numpy.empty(0, dtype=numpy.int64), symbols, numpy.empty((0, 0))
+    open_times = numpy.unique(numpy.concatenate([frame.open_time for frame in frames]))
+    closes = numpy.full((len(symbols), len(open_times)), numpy.nan)
+    for row, frame in enumerate(frames):
+        if not len(frame):
+            continue
+        closes[row, numpy.searchsorted(open_times, frame.open_time)] = frame.close
+        # Forward-fill gaps after the first candle
+        valid = numpy.where(numpy.isfinite(closes[row]), numpy.arange(len(open_times)), -1)
+        valid = numpy.maximum.accumulate(valid)
+        closes[row] = numpy.where(valid >= 0, closes[row, numpy.maximum(valid, 0)], numpy.nan)
+    return open_times, symbols, closes
+
+
+def combination_targets(close, combinations):
+    """
+    Long/flat targets for several parameter combinations on one close series.
+
+    Indicator columns are computed once for the whole set (see
+    ParameterSweep) and the signals follow BacktestEngine: the position is
+    the last non-zero signal. Portfolio mode is long-only, like the live
+    StrategyRuntime, so a SELL signal means flat.
+
+    :param close: Close prices without NaNs
+    :param combinations: List of strategy_params dicts
+    :return: int8 array shaped (combinations, bars) of 1 (long) or 0 (flat)
+    """
+    indicator_columns = compute_indicator_columns(close, combinations)
+    engine = BacktestEngine()
+    targets = numpy.zeros((len(combinations), len(close)), dtype=numpy.int8)
+    positions = numpy.arange(len(close))
+    for index, strategy_params in enumerate(combinations):
+        columns = {'close': close}
+        for name, key in indicator_keys(strategy_params).items():
+            columns[name] = indicator_columns[key]
+        signals = engine.generate_signals(pandas.DataFrame(columns, copy=False), strategy_params).to_numpy()
+        last_signal_index = numpy.maximum.accumulate(numpy.where(signals != 0, positions, -1))
+        targets[index] = (last_signal_index >= 0) & (signals[numpy.maximum(last_signal_index, 0)] == 1)
+    return targets
+
+
+def window_scores(close, targets, windows, rank_by='sharpe_ratio'):
+    """
+    Score every combination on every window from prefix sums of its returns.
+
+    :param close: Close prices
+    :param targets: Output of combination_targets
+    :param windows: List of (start, end) bar ranges
+    :param rank_by: 'sharpe_ratio' or 'total_return'
+    :return: Array shaped (windows, combinations); NaN where undefined
+    """
+    bar_returns = numpy.zeros(len(close))
+    bar_returns[1:] = close[1:] / close[:-1] - 1
+    # Held from the close of the previous bar, as in BacktestEngine
+    strategy_returns = numpy.zeros(targets.shape, dtype=numpy.float64)
+    strategy_returns[:, 1:] = targets[:, :-1] * bar_returns[1:]
+
+    zero = numpy.zeros((len(targets), 1))
+    if rank_by == 'total_return':
+        prefix = numpy.hstack([zero, numpy.cumsum(numpy.log1p(strategy_returns), axis=1)])
+    else:
+        prefix = numpy.hstack([zero, numpy.cumsum(strategy_returns, axis=1)])
+        prefix_squares = numpy.hstack([zero, numpy.cumsum(strategy_returns ** 2, axis=1)])
+
+    scores = numpy.full((len(windows), len(targets)), numpy.nan)
+    for row, (start, end) in enumerate(windows):
+        count = end - start
+        if count < 2:
+            continue
+        if rank_by == 'total_return':
+            scores[row] = numpy.expm1(prefix[:, end] - prefix[:, start])
+            continue
+        mean = (prefix[:, end] - prefix[:, start]) / count
+        variance = ((prefix_squares[:, end] - prefix_squares[:, start]) / count - mean ** 2) * count / (count - 1)
+        with numpy.errstate(invalid='ignore', divide='ignore'):
+            scores[row] = numpy.sqrt(252) * mean / numpy.sqrt(numpy.maximum(variance, 0))
+    scores[~numpy.isfinite(scores)] = numpy.nan
+    return scores
+
+
+def _initialize_worker(memory_name, shape):
+    """Attach a worker process to the shared close matrix"""
+    global _worker_memory, _worker_closes
+    _worker_memory = shared_memory.SharedMemory(name=memory_name)
+    _worker_closes = numpy.ndarray(shape, dtype=numpy.float64, buffer=_worker_memory.buf)
+
+
+def _release_worker():
+    """Detach the in-process worker from shared memory"""
+    global _worker_memory, _worker_closes
+    _worker_closes = None
+    if _worker_memory is not None:
+        _worker_memory.close()
+        _worker_memory = None
+
+
+def _symbol_targets(task):
+    """
+    Target positions of one symbol over the aligned index.
+
+    Without windows the first combination is used throughout. With
+    walk-forward windows the best in-sample combination of each window
+    sets the targets of its out-of-sample span.
+
+    :return: (int8 targets, chosen combination index per window)
+    """
+    row, combinations, windows, rank_by = task
+    closes = _worker_closes[row]
+    result = numpy.zeros(len(closes), dtype=numpy.int8)
+    finite = numpy.flatnonzero(numpy.isfinite(closes))
+    if not len(finite):
+        return result, [-1] * len(windows or ())
+    first = finite[0]
+    close = numpy.ascontiguousarray(closes[first:])
+    targets = combination_targets(close, combinations)
+
+    if windows is None:
+        result[first:] = targets[0]
+        return result, []
+
+    # Shift windows into this symbol's listed range
+    in_sample = [(max(start - first, 0), max(end - first, 0)) for (start, end), _ in windows]
+    scores = window_scores(close, targets, in_sample, rank_by)
+    chosen = []
+    for (_, (start, end)), window_score in zip(windows, scores):
+        if numpy.isnan(window_score).all():
+            chosen.append(-1)
+            continue
+        best = int(numpy.nanargmax(window_score))
+        chosen.append(best)
+        local_start, local_end = max(start - first, 0), max(end - first, 0)
+        result[first + local_start:first + local_end] = targets[best, local_start:local_end]
+    return result, chosen
+
+
+def simulate_portfolio(closes, targets, initial_capital=10000.0, max_open_positions=3,
+                       position_size=None, fee_rate=0.0):
+    """
+    Trade target positions of many symbols against one cash balance.
+
+    Only bars where some target flips are visited. Exits are processed
+    before entries; an entry is skipped when ``max_open_positions`` are
+    already open or no cash is left, and, as in the live runtime, it is not
+    retried until the symbol's next BUY signal.
+
+    :param closes: Close prices shaped (symbols, bars), NaN before a symbol lists
+    :param targets: 1 (long) or 0 (flat) shaped like closes
+    :param initial_capital: Starting cash
+    :param max_open_positions: Positions allowed open at once
+    :param position_size: Fraction of current equity per entry (equity / max_open_positions if None)
+    :param fee_rate: Fee charged on the notional of every fill
+    :return: Dict with equity, holdings-based metrics inputs, trades and skipped entries
+    """
+    symbol_count, bar_count = closes.shape
+    changes = numpy.diff(targets.astype(numpy.int8), axis=1, prepend=0)
+    event_bars = numpy.flatnonzero(changes.any(axis=0))
+
+    quantities = numpy.zeros(symbol_count)
+    entry_prices = numpy.zeros(symbol_count)
+    cash = float(initial_capital)
+    quantity_snapshots = numpy.zeros((len(event_bars) + 1, symbol_count))
+    cash_snapshots = numpy.empty(len(event_bars) + 1)
+    cash_snapshots[0] = cash
+    trades = []
+    skipped_entries = 0
+
+    for event, bar in enumerate(event_bars):
+        column = changes[:, bar]
+        prices = closes[:, bar]
+        for symbol in numpy.flatnonzero(column < 0):
+            if quantities[symbol] > 0:
+                proceeds = quantities[symbol] * prices[symbol]
+                cash += proceeds * (1 - fee_rate)
+                trades.append((int(bar), int(symbol), 'sell', float(prices[symbol]), float(quantities[symbol]),
+                               float(prices[symbol] / entry_prices[symbol] - 1)))
+                quantities[symbol] = 0.0
+
+        entries = numpy.flatnonzero(column > 0)
+        if len(entries):
+            held = quantities > 0
+            equity = cash + float(numpy.dot(quantities[held], prices[held]))
+            notional = equity * position_size if position_size else equity / max_open_positions
+            open_positions = int(held.sum())
+            for symbol in entries:
+                spend = min(notional, cash)
+                if open_positions >= max_open_positions or spend <= 0 or not numpy.isfinite(prices[symbol]):
+                    skipped_entries += 1
+                    continue
+                quantities[symbol] = spend * (1 - fee_rate) / prices[symbol]
+                entry_prices[symbol] = prices[symbol]
+                cash -= spend
+                open_positions += 1
+                trades.append((int(bar), int(symbol), 'buy', float(prices[symbol]), float(quantities[symbol]), None))
+
+        quantity_snapshots[event + 1] = quantities
+        cash_snapshots[event + 1] = cash
+
+    # Holdings only change at event bars: index every bar to its latest snapshot
+    snapshot_index = numpy.zeros(bar_count, dtype=numpy.int64)
+    snapshot_index[event_bars] = numpy.arange(1, len(event_bars) + 1)
+    snapshot_index = numpy.maximum.accumulate(snapshot_index)
+    holdings_value = numpy.einsum('ij,ji->i', quantity_snapshots[snapshot_index], numpy.nan_to_num(closes))
+    equity = cash_snapshots[snapshot_index] + holdings_value
+    open_counts = (quantity_snapshots > 0).sum(axis=1)[snapshot_index]
+
+    return {
+        'equity': equity,
+        'open_positions': open_counts,
+        'trades': trades,
+        'skipped_entries': skipped_entries,
+    }
+
+
+def portfolio_metrics(equity, trades, initial_capital):
+    """Return, Sharpe, drawdown and round-trip win rate of a portfolio run"""
+    equity = pandas.Series(equity)
+    returns = equity.pct_change().fillna(0)
+    exits = [trade for trade in trades if trade[2] == 'sell']
+    return {
+        'total_return': (equity.iloc[-1] - initial_capital) / initial_capital if len(equity) else 0.0,
+        'sharpe_ratio': numpy.sqrt(252) * returns.mean() / returns.std(),
+        'max_drawdown': (equity / equity.cummax() - 1).min() if len(equity) else 0.0,
+        'win_rate': sum(1 for trade in exits if trade[5] > 0) / len(exits) if exits else 0,
+        'total_trades': len(trades),
+    }
+
+
+class PortfolioBacktest:
+    """
+    Multi-symbol backtests with shared capital and a cap on open positions.
+
+    Per-symbol signal work runs across a process pool reading the aligned
+    close matrix from shared memory. Indicator columns are computed once
+    per symbol for every parameter combination and reused by every
+    walk-forward window.
+    """
+
+    def __init__(self, initial_capital=10000.0, max_open_positions=3, position_size=None,
+                 fee_rate=0.0, max_workers=None):
+        """
+        :param initial_capital: Starting capital shared by all symbols
+        :param max_open_positions: Positions allowed open at once
+        :param position_size: Fraction of equity per position (equity / max_open_positions if None)
+        :param fee_rate: Fee charged on the notional of every fill
+        :param max_workers: Number of worker processes (defaults to the CPU count)
+        """
+        self.initial_capital = initial_capital
+        self.max_open_positions = max_open_positions
+        self.position_size = position_size
+        self.fee_rate = fee_rate
+        self.max_workers = max_workers or os.cpu_count() or 1
+
+    @classmethod
+    def from_config(cls, config, **kwargs):
+        """Take max_open_positions and risk.position_size from a loaded config.yaml"""
+        return cls(
+            max_open_positions=config.get('max_open_positions', 3),
+            position_size=config.get('risk', {}).get('position_size'),
+            **kwargs
+        )
+
+    def run(self, candles, strategy_params):
+        """
+        Backtest one strategy across many symbols.
+
+        :param candles: Dict mapping symbol to CandleFrame
+        :param strategy_params: Dict containing strategy parameters
+        :return: Dict containing portfolio results
+        """
+        open_times, symbols, closes = align_closes(candles)
+        tasks = [(row, [strategy_params], None, None) for row in range(len(symbols))]
+        targets = self._targets(closes, tasks)[0]
+        return self._simulate(open_times, symbols, closes, targets, 0)
+
+    def run_stored(self, candle_store, symbols, interval, strategy_params, start_time=None, end_time=None):
+        """Portfolio backtest on candles read from a CandleStore"""
+        candles = {symbol: candle_store.read_candles(symbol, interval, start_time, end_time) for symbol in symbols}
+        return self.run(candles, strategy_params)
+
+    def walk_forward(self, candles, param_grid, in_sample_bars, out_of_sample_bars, rank_by='sharpe_ratio'):
+        """
+        Re-optimize on rolling in-sample windows and trade the winners out of sample.
+
+        Each symbol picks its best combination on bars [start, start + in_sample_bars)
+        and trades it on the following out_of_sample_bars; the window then
+        rolls forward by out_of_sample_bars. The portfolio is simulated over
+        the stitched out-of-sample targets only.
+
+        :param candles: Dict mapping symbol to CandleFrame
+        :param param_grid: Dict mapping strategy parameter names to candidate values
+        :param in_sample_bars: Length of each optimization window
+        :param out_of_sample_bars: Length of each evaluation window and the roll step
+        :param rank_by: 'sharpe_ratio' or 'total_return'
+        :return: Dict containing out-of-sample results and the chosen parameters per window
+        """
+        if rank_by not in RANKABLE_METRICS:
+            raise ValueError(f"rank_by must be one of {RANKABLE_METRICS}")
+        combinations = expand_parameter_grid(param_grid)
+        if not combinations:
+            raise ValueError("param_grid has no combinations")
+        open_times, symbols, closes = align_closes(candles)
+
+        windows = []
+        start = 0
+        while start + in_sample_bars < len(open_times):
+            end = start + in_sample_bars
+            windows.append(((start, end), (end, min(end + out_of_sample_bars, len(open_times)))))
+            start += out_of_sample_bars
+        if not windows:
+            raise ValueError("Not enough bars for one in-sample window")
+
+        tasks = [(row, combinations, windows, rank_by) for row in range(len(symbols))]
+        targets, chosen = self._targets(closes, tasks)
+        first_bar = windows[0][1][0]
+        results = self._simulate(open_times, symbols, closes, targets, first_bar)
+        results['windows'] = [
+            {
+                'in_sample': [int(open_times[in_start]), int(open_times[in_end - 1])],
+                'out_of_sample': [int(open_times[out_start]), int(open_times[out_end - 1])],
+                'parameters': {symbol: (combinations[choices[index]] if choices[index] >= 0 else None)
+                               for symbol, choices in zip(symbols, chosen)},
+            }
+            for index, ((in_start, in_end), (out_start, out_end)) in enumerate(windows)
+        ]
+        return results
+
+    def _targets(self, closes, tasks):
+        """Compute per-symbol targets in the pool; returns (targets, chosen per symbol)"""
+        if not tasks:
+            return numpy.zeros(closes.shape, dtype=numpy.int8), []
+        memory = shared_memory.SharedMemory(create=True, size=max(1, closes.size * 8))
+        matrix = None
+        try:
+            matrix = numpy.ndarray(closes.shape, dtype=numpy.float64, buffer=memory.buf)
+            matrix[:] = closes
+            outputs = self._dispatch(memory.name, closes.shape, tasks)
+        finally:
+            # Drop the view before closing, numpy holds an export of the buffer
+            matrix = None
+            memory.close()
+            memory.unlink()
+        return numpy.vstack([targets for targets, _ in outputs]), [chosen for _, chosen in outputs]
+
+    def _dispatch(self, memory_name, shape, tasks):
+        """Run tasks in-process for a single worker, otherwise across the pool"""
+        if self.max_workers == 1:
+            _initialize_worker(memory_name, shape)
+            try:
+                return [_symbol_targets(task) for task in tasks]
+            finally:
+                _release_worker()
+
+        with ProcessPoolExecutor(max_workers=min(self.max_workers, len(tasks)), initializer=_initialize_worker,
+                                 initargs=(memory_name, shape)) as executor:
+            return list(executor.map(_symbol_targets, tasks))
+
+    def _simulate(self, open_times, symbols, closes, targets, first_bar):
+        """Simulate from first_bar on and package the results"""
+        simulation = simulate_portfolio(
+            closes[:, first_bar:], targets[:, first_bar:], self.initial_capital,
+            self.max_open_positions, self.position_size, self.fee_rate
+        )
+        times = open_times[first_bar:]
+        results = portfolio_metrics(simulation['equity'], simulation['trades'], self.initial_capital)
+        results.update({
+            'symbols': symbols,
+            'skipped_entries': simulation['skipped_entries'],
+            'max_concurrent_positions': int(simulation['open_positions'].max()) if len(times) else 0,
+            'trades': [
+                {'timestamp': int(times[bar]), 'symbol': symbols[symbol], 'type': side, 'price': price,
+                 'size': size, 'return': trade_return}
+                for bar, symbol, side, price, size, trade_return in simulation['trades']
+            ],
+            'timestamps': times.tolist(),
+            'equity_curve': simulation['equity'].tolist(),
+        })
+        return results
@@ -0,0 +1,279 @@
+import time
+
+import numpy as numpy
+import pandas as pandas
+
+from src.analysis.strategies.strategy import BUY, HOLD, SELL, build_strategies, evaluate_bar
+from src.data.data_processing.candle_frame import CandleFrame
+from src.data.data_processing.intervals import interval_period_ids
+from src.utils import jit
+from src.utils.metrics import record_backtest
+
+STOP_LOSS = 'stop_loss'
+TAKE_PROFIT = 'take_profit'
+SIGNAL = 'signal'
+EXIT_REASONS = (SIGNAL, STOP_LOSS, TAKE_PROFIT)
+
+# Positions in the replay state carried between chunks
+CASH, QUANTITY, ENTRY_PRICE, STOP_PRICE, TARGET_PRICE, LAST_CLOSE = range(6)
+
+
+class ReplayEngine:
+    """
+    Event-driven replay of fine candles with intrabar stop-loss and take-profit.
+
+    Strategies are evaluated on the closes of ``signal_interval`` candles
+    built from the replayed bars. A signal is filled at the open of the next
+    replayed bar, and open positions are checked against every bar's
+    high/low: a stop or target inside the bar fills at its price, a gap
+    through it fills at the open. When a bar touches both, the stop is
+    assumed to have been hit first.
+
+    Input is any iterable of CandleFrame chunks, e.g.
+    CandleStore.iter_candles, so only one chunk is materialized at a time.
+    Long-only, like the live StrategyRuntime. Strategies run per signal
+    period in Python; fills and exits run per bar in _replay_bars, compiled
+    with Numba when the numba backend is selected.
+    """
+
+    def __init__(self, strategy_definitions, signal_interval='1h', initial_capital=10000.0, position_size=1.0,
+                 stop_loss=None, take_profit=None, fee_rate=0.0, slippage_bps=0.0):
+        """
+        :param strategy_definitions: Strategy entries as in config.yaml
+        :param signal_interval: Interval whose closes drive the strategies
+        :param initial_capital: Starting capital
+        :param position_size: Fraction of equity per position
+        :param stop_loss: Stop distance below the entry as a fraction (e.g. 0.02), or None
+        :param take_profit: Target distance above the entry as a fraction (e.g. 0.04), or None
+        :param fee_rate: Fee charged on the notional of every fill
+        :param slippage_bps: Adverse slippage on market fills (signals and stops) in basis points
+        """
+        self.strategy_definitions = strategy_definitions
+        self.signal_interval = signal_interval
+        self.initial_capital = initial_capital
+        self.position_size = position_size
+        self.stop_loss = stop_loss
+        self.take_profit = take_profit
+        self.fee_rate = fee_rate
+        self.slippage = slippage_bps / 1e4
+
+    @classmethod
+    def from_config(cls, config, **kwargs):
+        """Take the strategies, timeframe and risk settings from a loaded config.yaml"""
+        risk = config.get('risk', {})
+        return cls(
+            config.get('strategies', []),
+            signal_interval=config.get('timeframe', '1h'),
+            stop_loss=risk.get('stop_loss'),
+            take_profit=risk.get('take_profit'),
+            **kwargs
+        )
+
+    def replay_stored(self, candle_store, symbol, interval='1m', start_time=None, end_time=None, chunk_size=100_000):
+        """Replay candles streamed from a CandleStore in memory-mapped chunks"""
+        return self.replay(candle_store.iter_candles(symbol, interval, start_time, end_time, chunk_size))
+
+    def replay(self, chunks):
+        """
+        Run the replay.
+
+        :param chunks: CandleFrame, or an iterable of CandleFrame chunks in time order
+        :return: Dict containing backtest results and replay throughput
+        """
+        if isinstance(chunks, CandleFrame):
+            chunks = (chunks,)
+        strategies = build_strategies(self.strategy_definitions)
+        state = numpy.array([float(self.initial_capital), 0.0, 0.0, 0.0, 0.0, numpy.nan])
+        parameters = (self.fee_rate, self.slippage, float(self.position_size),
+                      float(self.stop_loss or 0.0), float(self.take_profit or 0.0))
+        use_jit = jit.active()
+        replay_bars = _replay_bars if use_jit else jit.python_function(_replay_bars)
+        signal_state = HOLD
+        current_period = None
+        last_open_time = None
+        trades = []
+        equity_times = []
+        equity_curve = []
+        bars = 0
+
+        started = time.perf_counter()
+        for chunk in chunks:
+            if not len(chunk):
+                continue
+            periods = interval_period_ids(chunk.open_time, self.signal_interval)
+            # Bars opening a new signal period; the candle before each one just closed
+            boundaries = numpy.flatnonzero(periods[1:] != periods[:-1]) + 1
+            if current_period is not None and periods[0] != current_period:
+                boundaries = numpy.concatenate(([0], boundaries))
+            current_period = int(periods[-1])
+
+            # Strategies only see signal-period closes, so their orders are known before the bar loop
+            orders = numpy.zeros(len(chunk), dtype=numpy.int64)
+            previous_close = numpy.where(boundaries > 0, chunk.close[boundaries - 1], state[LAST_CLOSE])
+            for boundary, last_close in zip(boundaries.tolist(), previous_close.tolist()):
+                signal = evaluate_bar(strategies, last_close)
+                if signal != HOLD and signal != signal_state:
+                    signal_state = orders[boundary] = signal
+            samples = numpy.zeros(len(chunk), dtype=numpy.bool_)
+            samples[boundaries] = True
+
+            columns = (chunk.open, chunk.high, chunk.low, chunk.close, orders, samples)
+            if not use_jit:
+                # Plain Python indexes lists much faster than arrays
+                columns = tuple(column.tolist() for column in columns)
+            equity, trade_bars, trade_sides, trade_prices, trade_sizes, trade_reasons, trade_returns = \
+                replay_bars(*columns, state, *parameters)
+
+            equity_times.extend(chunk.open_time[boundaries].tolist())
+            equity_curve.extend(equity[boundaries].tolist())
+            for bar, side, price, size, reason, trade_return in zip(
+                    chunk.open_time[trade_bars].tolist(), trade_sides.tolist(), trade_prices.tolist(),
+                    trade_sizes.tolist(), trade_reasons.tolist(), trade_returns.tolist()):
+                trades.append({'timestamp': bar, 'type': 'buy' if side == BUY else 'sell', 'price': price,
+                               'size': size, 'reason': EXIT_REASONS[reason],
+                               'return': None if side == BUY else trade_return})
+            last_open_time = int(chunk.open_time[-1])
+            bars += len(chunk)
+
+        elapsed = time.perf_counter() - started
+        record_backtest('replay', bars, elapsed)
+        cash, quantity, entry_price, _, _, last_close = state.tolist()
+        if last_open_time is not None:
+            equity_curve.append(cash + quantity * last_close)
+            equity_times.append(last_open_time)
+        results = self._calculate_metrics(equity_curve, trades)
+        results.update({
+            'bars': bars,
+            'signal_bars': len(equity_curve),
+            'elapsed_seconds': elapsed,
+            'bars_per_second': bars / elapsed if elapsed > 0 else float('inf'),
+            'open_position': {'entry_price': entry_price, 'size': quantity} if quantity > 0.0 else None,
+            'equity_times': equity_times,
+        })
+        return results
+
+    def _calculate_metrics(self, equity_curve, trades):
+        """Performance metrics on the signal-interval equity curve"""
+        equity = pandas.Series(equity_curve, dtype=numpy.float64)
+        returns = equity.pct_change().fillna(0)
+        exits = [trade for trade in trades if trade['type'] == 'sell']
+        return {
+            'total_return': (equity.iloc[-1] - self.initial_capital) / self.initial_capital if len(equity) else 0.0,
+            'sharpe_ratio': numpy.sqrt(252) * returns.mean() / returns.std() if len(equity) > 1 else numpy.nan,
+            'max_drawdown': (equity / equity.cummax() - 1).min() if len(equity) else 0.0,
+            'win_rate': sum(1 for trade in exits if trade['return'] > 0) / len(exits) if exits else 0,
+            'exits': {reason: sum(1 for trade in exits if trade['reason'] == reason)
+                      for reason in (SIGNAL, STOP_LOSS, TAKE_PROFIT)},
+            'trades': trades,
+            'equity_curve': equity.tolist(),
+        }
+
+
+def _replay_warm_up_arguments():
+    price = numpy.array([100.0, 101.0, 97.0, 104.0])
+    orders = numpy.array([1, 0, 0, 0], dtype=numpy.int64)
+    samples = numpy.array([True, False, True, False])
+    parameters = (0.001, 0.0001, 1.0, 0.02, 0.04)
+    # In-memory chunks are writable, CandleStore chunks are read-only memory maps
+    return [
+        (*(prices(column) for column in (price, price + 1, price - 1, price)), orders, samples,
+         numpy.array([10000.0, 0.0, 0.0, 0.0, 0.0, numpy.nan]), *parameters)
+        for prices in (numpy.asarray, jit.read_only)
+    ]
+
+
+@jit.kernel(warm_up=_replay_warm_up_arguments)
+def _replay_bars(open_, high, low, close, orders, samples, state, fee_rate, slippage, position_size,
+                 stop_loss, take_profit):
+    """
+    Fill orders and intrabar stops/targets over one chunk of bars.
+
+    :param orders: BUY/SELL to fill at each bar's open, HOLD otherwise
+    :param samples: Bars whose opening equity is recorded (signal period starts)
+    :param state: CASH ... LAST_CLOSE array carried between chunks, updated in place
+    :return: (equity before each bar's fills, then the trades as parallel arrays:
+             bar index, side, price, size, EXIT_REASONS index, return)
+    """
+    length = len(open_)
+    cash = float(state[0])
+    quantity = float(state[1])
+    entry_price = float(state[2])
+    stop_price = float(state[3])
+    target_price = float(state[4])
+    last_close = float(state[5])
+
+    equity = numpy.empty(length)
+    # At most one entry per bar, so exits never outnumber entries by more than one
+    capacity = 2 * length + 1
+    trade_bars = numpy.empty(capacity, dtype=numpy.int64)
+    trade_sides = numpy.empty(capacity, dtype=numpy.int64)
+    trade_prices = numpy.empty(capacity)
+    trade_sizes = numpy.empty(capacity)
+    trade_reasons = numpy.empty(capacity, dtype=numpy.int64)
+    trade_returns = numpy.empty(capacity)
+    trades = 0
+
+    for index in range(length):
+        bar_open = open_[index]
+        if samples[index]:
+            equity[index] = cash + quantity * last_close
+
+        order = orders[index]
+        if order == BUY and quantity == 0.0:
+            fill = bar_open * (1 + slippage)
+            spend = cash * position_size
+            quantity = spend * (1 - fee_rate) / fill
+            cash -= spend
+            entry_price = fill
+            stop_price = fill * (1 - stop_loss) if stop_loss else 0.0
+            target_price = fill * (1 + take_profit) if take_profit else numpy.inf
+            trade_bars[trades] = index
+            trade_sides[trades] = BUY
+            trade_prices[trades] = fill
+            trade_sizes[trades] = quantity
+            trade_reasons[trades] = 0
+            trade_returns[trades] = numpy.nan
+            trades += 1
+            exit_price = -1.0
+            reason = 0
+        elif order == SELL and quantity > 0.0:
+            exit_price = bar_open * (1 - slippage)
+            reason = 0
+        else:
+            exit_price = -1.0
+            reason = 0
+
+        if exit_price < 0.0 and quantity > 0.0:
+            if bar_open <= stop_price:
+                exit_price = bar_open * (1 - slippage)
+                reason = 1
+            elif bar_open >= target_price:
+                exit_price = bar_open
+                reason = 2
+            elif low[index] <= stop_price:
+                exit_price = stop_price * (1 - slippage)
+                reason = 1
+            elif high[index] >= target_price:
+                exit_price = target_price
+                reason = 2
+
+        if exit_price >= 0.0:
+            cash += quantity * exit_price * (1 - fee_rate)
+            trade_bars[trades] = index
+            trade_sides[trades] = SELL
+            trade_prices[trades] = exit_price
+            trade_sizes[trades] = quantity
+            trade_reasons[trades] = reason
+            trade_returns[trades] = exit_price / entry_price - 1
+            trades += 1
+            quantity = 0.0
+        last_close = close[index]
+
+    state[0] = cash
+    state[1] = quantity
+    state[2] = entry_price
+    state[3] = stop_price
+    state[4] = target_price
+    state[5] = last_close
+    return (equity, trade_bars[:trades], trade_sides[:trades], trade_prices[:trades], trade_sizes[:trades],
+            trade_reasons[:trades], trade_returns[:trades])
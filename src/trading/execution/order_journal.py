@@ -0,0 +1,44 @@
+import json
+import os
+import threading
+
+
+class OrderJournal:
+    """
+    Append-only JSON-lines record of every order the executor acknowledges.
+
+    The executor only keeps a bounded window of recent orders in memory;
+    the journal is the complete history and can be replayed with ``read``.
+    """
+
+    def __init__(self, path):
+        """
+        :param path: File the orders are appended to
+        """
+        self.path = path
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._file = open(path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def append(self, order):
+        """Write one order as a line and flush it to the OS"""
+        line = json.dumps(order, default=str) + '\n'
+        with self._lock:
+            self._file.write(line)
+            self._file.flush()
+
+    def close(self):
+        """Close the journal file"""
+        with self._lock:
+            if not self._file.closed:
+                self._file.close()
+
+    @staticmethod
+    def read(path):
+        """Yield the orders stored in a journal file"""
+        with open(path, encoding='utf-8') as journal:
+            for line in journal:
+                if line.strip():
+                    yield json.loads(line)
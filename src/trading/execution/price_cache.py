@@ -0,0 +1,81 @@
+import threading
+import time
+from typing import Optional
+
+from src.data.data_fetch.binance_data_fetch.stream_manager import BinanceStreamManager
+
+
+class PriceCache:
+    """
+    Last trade price per symbol, fed by the kline stream.
+
+    The close of an in-progress kline is the last traded price, so every
+    kline update refreshes the cache. Symbols the stream has not delivered
+    yet, or whose price is older than ``max_age``, fall back to one REST
+    ticker call whose answer is cached too.
+    """
+
+    def __init__(self, client=None, max_age=30.0):
+        """
+        :param client: BinanceClient used when no fresh streamed price exists
+        :param max_age: Seconds a cached price stays usable
+        """
+        self.client = client
+        self.max_age = max_age
+        self._prices = {}
+        self._lock = threading.Lock()
+        self._tracked = {}
+        self.hits = 0
+        self.misses = 0
+
+    def update(self, symbol: str, price: float, timestamp: Optional[float] = None):
+        """Store a price observed at ``timestamp`` (monotonic seconds, defaults to now)"""
+        with self._lock:
+            self._prices[symbol] = (float(price), time.monotonic() if timestamp is None else timestamp)
+
+    def on_kline(self, kline):
+        """Stream callback: record the kline close as the last trade price"""
+        self.update(kline.symbol, kline.close)
+
+    def track(self, symbol: str, manager=None, interval: str = "1m"):
+        """Keep a symbol's price current from its kline stream"""
+        manager = manager or BinanceStreamManager.shared()
+        with self._lock:
+            if symbol in self._tracked:
+                return
+            self._tracked[symbol] = (manager, interval)
+        manager.subscribe(symbol, interval, self.on_kline)
+
+    def untrack(self, symbol: str):
+        """Stop following a symbol's kline stream"""
+        with self._lock:
+            tracked = self._tracked.pop(symbol, None)
+        if tracked is not None:
+            manager, interval = tracked
+            manager.unsubscribe(symbol, interval, self.on_kline)
+
+    def get(self, symbol: str) -> Optional[float]:
+        """Cached price if it is fresh enough, else None"""
+        with self._lock:
+            entry = self._prices.get(symbol)
+        if entry is None or time.monotonic() - entry[1] > self.max_age:
+            return None
+        return entry[0]
+
+    def price(self, symbol: str) -> float:
+        """
+        Last trade price for a symbol.
+
+        :param symbol: Trading pair symbol
+        :return: Price from the cache, or from the REST ticker on a miss
+        """
+        cached = self.get(symbol)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        if self.client is None:
+            raise LookupError(f"No price available for {symbol}")
+        self.misses += 1
+        price = float(self.client.get_ticker_price(symbol)['price'])
+        self.update(symbol, price)
+        return price
@@ -0,0 +1,338 @@
+import heapq
+import itertools
+import math
+import threading
+
+import numpy as np
+
+# Resting order fields; orders are plain lists so the matching loop stays cheap
+ORDER_ID, SIDE, PRICE, REMAINING, EXECUTED, QUOTE, COMMISSION, STATUS = range(8)
+
+NEW = 'NEW'
+PARTIALLY_FILLED = 'PARTIALLY_FILLED'
+FILLED = 'FILLED'
+CANCELED = 'CANCELED'
+EXPIRED = 'EXPIRED'
+
+
+class _OrderBook:
+    """One symbol's resting orders: a max-heap of bids and a min-heap of asks"""
+
+    __slots__ = ('bids', 'asks', 'orders', 'last_price')
+
+    def __init__(self):
+        # Heap entries are (key, order_id, order); order_id breaks price ties by arrival
+        self.bids = []
+        self.asks = []
+        self.orders = {}
+        self.last_price = None
+
+
+class SimulatedExchange:
+    """
+    In-process matching engine that stands in for BinanceClient.
+
+    Orders match by price-time priority against the symbol's resting book
+    first, then against synthetic depth around the last price: levels of
+    ``level_quantity`` (or ``level_notional`` worth) spaced ``impact_bps``
+    apart, starting half of ``spread_bps`` away from it, so large orders walk
+    the book and pay slippage. Bid levels stop before the price would reach
+    zero; a market order larger than the depth is left partially filled.
+    Non-marketable limit orders rest and fill when replayed klines
+    trade through their price. Takers pay ``taker_fee`` and makers
+    ``maker_fee``, in the quote asset.
+
+    Prices come from ``update_price``, ``on_bar``/``on_kline`` or ``replay``.
+    """
+
+    def __init__(self, maker_fee=0.001, taker_fee=0.001, spread_bps=1.0, impact_bps=0.5,
+                 level_quantity=1.0, level_notional=None, on_fill=None):
+        """
+        :param maker_fee: Fee rate for resting orders
+        :param taker_fee: Fee rate for orders that take liquidity
+        :param spread_bps: Synthetic bid/ask spread in basis points
+        :param impact_bps: Price step between synthetic depth levels in basis points
+        :param level_quantity: Base quantity available at each synthetic level, or a dict of
+                               symbol -> quantity (symbols missing from it get 1.0)
+        :param level_notional: Quote value available at each synthetic level; when set, the base
+                               quantity per level follows the last price and level_quantity is ignored
+        :param on_fill: Optional callable (order_id, symbol, side, price, quantity, commission)
+                        notified when a resting order fills
+        """
+        self.maker_fee = maker_fee
+        self.taker_fee = taker_fee
+        self.half_spread = spread_bps / 2e4
+        self.level_step = impact_bps / 1e4
+        self.level_quantity = level_quantity
+        self.level_notional = level_notional
+        self.on_fill = on_fill
+        self._books = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        self.orders_received = 0
+        self.fills = 0
+        self.traded_quote = 0.0
+        self.fees = 0.0
+
+    def _book(self, symbol):
+        book = self._books.get(symbol)
+        if book is None:
+            book = self._books[symbol] = _OrderBook()
+        return book
+
+    # Market data
+
+    def update_price(self, symbol, price):
+        """Set the last trade price and fill resting orders it crosses"""
+        self.on_bar(symbol, price, price, price)
+
+    def on_bar(self, symbol, high, low, close):
+        """
+        Replay one bar: bids at or above ``low`` and asks at or below
+        ``high`` fill at their limit price, then ``close`` becomes the last price.
+        """
+        with self._lock:
+            book = self._book(symbol)
+            self._fill_resting(symbol, book, book.bids, lambda key: -key >= low)
+            self._fill_resting(symbol, book, book.asks, lambda key: key <= high)
+            book.last_price = float(close)
+
+    def on_kline(self, kline):
+        """Stream callback so the exchange can paper-trade on live klines"""
+        self.on_bar(kline.symbol, kline.high, kline.low, kline.close)
+
+    def replay(self, symbol, candles, callback=None):
+        """
+        Replay a CandleFrame bar by bar.
+
+        :param symbol: Trading pair symbol
+        :param candles: CandleFrame with high, low and close columns
+        :param callback: Optional callable (index, close) run after each bar,
+                         e.g. a strategy submitting orders
+        """
+        highs = np.asarray(candles.high, dtype=np.float64).tolist()
+        lows = np.asarray(candles.low, dtype=np.float64).tolist()
+        closes = np.asarray(candles.close, dtype=np.float64).tolist()
+        for index, (high, low, close) in enumerate(zip(highs, lows, closes)):
+            self.on_bar(symbol, high, low, close)
+            if callback is not None:
+                callback(index, close)
+
+    def _fill_resting(self, symbol, book, heap, crossed):
+        fee = self.maker_fee
+        while heap:
+            key, order_id, order = heap[0]
+            if order[REMAINING] <= 0:
+                heapq.heappop(heap)
+                continue
+            if not crossed(key):
+                break
+            heapq.heappop(heap)
+            price, quantity = order[PRICE], order[REMAINING]
+            commission = price * quantity * fee
+            self._maker_fill(book, order, price, quantity, commission)
+            if self.on_fill is not None:
+                self.on_fill(order_id, symbol, order[SIDE], price, quantity, commission)
+
+    def _maker_fill(self, book, order, price, quantity, commission):
+        order[REMAINING] -= quantity
+        order[EXECUTED] += quantity
+        order[QUOTE] += price * quantity
+        order[COMMISSION] += commission
+        if order[REMAINING] <= 1e-12:
+            order[REMAINING] = 0.0
+            order[STATUS] = FILLED
+            del book.orders[order[ORDER_ID]]
+        else:
+            order[STATUS] = PARTIALLY_FILLED
+        self.fills += 1
+        self.traded_quote += price * quantity
+        self.fees += commission
+
+    # Order entry
+
+    def submit(self, symbol, side, order_type, quantity, price=None):
+        """
+        Match one order.
+
+        :param symbol: Trading pair symbol
+        :param side: 'BUY' or 'SELL'
+        :param order_type: 'MARKET' or 'LIMIT'
+        :param quantity: Base quantity
+        :param price: Limit price (LIMIT only)
+        :return: Order as a list indexed by ORDER_ID, SIDE, PRICE, REMAINING,
+                 EXECUTED, QUOTE, COMMISSION and STATUS
+        """
+        if quantity <= 0:
+            raise ValueError("Order quantity must be positive")
+        is_limit = order_type == 'LIMIT'
+        if is_limit and price is None:
+            raise ValueError("LIMIT orders need a price")
+        buy = side == 'BUY'
+
+        with self._lock:
+            self.orders_received += 1
+            book = self._book(symbol)
+            order = [next(self._ids), side, price, quantity, 0.0, 0.0, 0.0, NEW]
+            self._match_book(symbol, book, order, buy, price if is_limit else None)
+            if order[REMAINING] > 0:
+                self._take_depth(symbol, book, order, buy, price if is_limit else None)
+
+            if order[REMAINING] <= 1e-12:
+                order[REMAINING] = 0.0
+                order[STATUS] = FILLED
+            elif not is_limit:
+                order[STATUS] = EXPIRED if order[EXECUTED] == 0 else PARTIALLY_FILLED
+                order[REMAINING] = 0.0
+            else:
+                if order[EXECUTED] > 0:
+                    order[STATUS] = PARTIALLY_FILLED
+                book.orders[order[ORDER_ID]] = order
+                if buy:
+                    heapq.heappush(book.bids, (-price, order[ORDER_ID], order))
+                else:
+                    heapq.heappush(book.asks, (price, order[ORDER_ID], order))
+            return order
+
+    def _match_book(self, symbol, book, order, buy, limit):
+        """Take liquidity from resting orders on the opposite side"""
+        heap = book.asks if buy else book.bids
+        fee = self.maker_fee
+        taker_fee = self.taker_fee
+        while order[REMAINING] > 0 and heap:
+            key, resting_id, resting = heap[0]
+            if resting[REMAINING] <= 0:
+                heapq.heappop(heap)
+                continue
+            price = resting[PRICE]
+            if limit is not None and (price > limit if buy else price < limit):
+                break
+            quantity = min(order[REMAINING], resting[REMAINING])
+            commission = price * quantity * fee
+            self._maker_fill(book, resting, price, quantity, commission)
+            if resting[REMAINING] <= 0:
+                heapq.heappop(heap)
+            if self.on_fill is not None:
+                self.on_fill(resting_id, symbol, resting[SIDE], price, quantity, commission)
+
+            taker_commission = price * quantity * taker_fee
+            order[REMAINING] -= quantity
+            order[EXECUTED] += quantity
+            order[QUOTE] += price * quantity
+            order[COMMISSION] += taker_commission
+            self.fees += taker_commission
+            book.last_price = price
+
+    def _level_quantity(self, symbol, reference):
+        """Base quantity of one synthetic level"""
+        if self.level_notional is not None:
+            return self.level_notional / reference
+        if isinstance(self.level_quantity, dict):
+            return self.level_quantity.get(symbol, 1.0)
+        return self.level_quantity
+
+    def _take_depth(self, symbol, book, order, buy, limit):
+        """
+        Take liquidity from the synthetic levels around the last price. The
+        levels stand for the rest of the market, so the last price is left as is.
+        """
+        reference = book.last_price
+        if not reference:
+            return
+        sign = 1.0 if buy else -1.0
+        half_spread, step = self.half_spread, self.level_step
+        level_quantity = self._level_quantity(symbol, reference)
+
+        levels = math.inf
+        if not buy:
+            # Bid levels priced above zero
+            if half_spread >= 1.0:
+                return
+            levels = math.ceil((1.0 - half_spread) / step) if step > 0 else math.inf
+        if limit is not None:
+            # Levels whose price is within the limit
+            offset = sign * (limit / reference - 1.0) - half_spread
+            if offset < 0:
+                return
+            levels = min(levels, math.floor(offset / step) + 1 if step > 0 else math.inf)
+        quantity = min(order[REMAINING], levels * level_quantity)
+
+        full_levels = math.floor(quantity / level_quantity)
+        remainder = quantity - full_levels * level_quantity
+        # Sum of the level offsets over the walked quantity, in closed form
+        walked = (level_quantity * (full_levels * half_spread + step * full_levels * (full_levels - 1) / 2)
+                  + remainder * (half_spread + step * full_levels))
+        notional = reference * (quantity + sign * walked)
+        commission = notional * self.taker_fee
+
+        order[REMAINING] -= quantity
+        order[EXECUTED] += quantity
+        order[QUOTE] += notional
+        order[COMMISSION] += commission
+        self.fills += 1
+        self.traded_quote += notional
+        self.fees += commission
+
+    def cancel(self, symbol, order_id):
+        """Cancel a resting order; returns it, or None if it is no longer open"""
+        with self._lock:
+            order = self._book(symbol).orders.pop(order_id, None)
+            if order is None:
+                return None
+            # The heap entry is dropped lazily once it reaches the top
+            order[REMAINING] = 0.0
+            order[STATUS] = CANCELED
+            return order
+
+    # BinanceClient-compatible surface
+
+    def get_ticker_price(self, symbol):
+        """Last price in the shape of the REST ticker response"""
+        price = self._book(symbol).last_price
+        if price is None:
+            raise LookupError(f"No price for {symbol}; replay klines or call update_price first")
+        return {'symbol': symbol, 'price': f"{price:.8f}"}
+
+    def create_order(self, symbol, side, type, quantity, price=None):
+        """Place an order and return a Binance-style order response"""
+        return self._response(symbol, type, self.submit(symbol, side, type, quantity, price))
+
+    def cancel_order(self, symbol, orderId):
+        """Cancel a resting order and return its final state"""
+        order = self.cancel(symbol, orderId)
+        if order is None:
+            raise LookupError(f"Order {orderId} is not open")
+        return self._response(symbol, 'LIMIT', order)
+
+    def get_open_orders(self, symbol):
+        """Resting orders of a symbol"""
+        with self._lock:
+            orders = list(self._book(symbol).orders.values())
+        return [self._response(symbol, 'LIMIT', order) for order in orders]
+
+    @staticmethod
+    def _response(symbol, order_type, order):
+        executed = order[EXECUTED]
+        return {
+            'symbol': symbol,
+            'orderId': order[ORDER_ID],
+            'side': order[SIDE],
+            'type': order_type,
+            'status': order[STATUS],
+            'price': order[PRICE],
+            'executedQty': executed,
+            'cummulativeQuoteQty': order[QUOTE],
+            'avgPrice': order[QUOTE] / executed if executed else 0.0,
+            'commission': order[COMMISSION],
+        }
+
+    def stats(self):
+        """Order, fill, volume and fee counters plus resting order counts"""
+        with self._lock:
+            return {
+                'orders_received': self.orders_received,
+                'fills': self.fills,
+                'traded_quote': self.traded_quote,
+                'fees': self.fees,
+                'resting_orders': {symbol: len(book.orders) for symbol, book in self._books.items()},
+            }
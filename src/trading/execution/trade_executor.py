@@ -1,89 +1,239 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from datetime import datetime
 from typing import Dict, Optional
 
+from src.utils.latency_histogram import LatencyHistogram
+from src.utils.metrics import metrics
+from .order_journal import OrderJournal
+from .price_cache import PriceCache
+
+
 class TradeExecutor:
-    def __init__(self, client):
+    """
+    Order entry with per-symbol ordering and concurrent dispatch across symbols.
+
+    Every order goes into its symbol's lane; a lane is drained by one pool
+    thread at a time, so orders for a symbol execute in submission order
+    while different symbols proceed in parallel. The ``submit_*`` methods
+    return a Future right away; the ``place_*`` methods wait for it.
+    """
+
+    def __init__(self, client, price_cache=None, max_workers=8, history_size=1000, journal_path=None):
+        """
+        :param client: BinanceClient, or a SimulatedExchange that fills orders locally
+        :param price_cache: PriceCache supplying entry prices (REST-backed one by default)
+        :param max_workers: Threads dispatching orders
+        :param history_size: Orders kept in memory by get_order_history
+        :param journal_path: Append-only JSON-lines file recording every order (optional)
+        """
         self.client = client
+        self.prices = price_cache or PriceCache(client)
         self.open_positions = {}
-        self.order_history = []
+        self.order_history = deque(maxlen=history_size)
+        self.journal = OrderJournal(journal_path) if journal_path else None
+        self.submit_to_ack = LatencyHistogram('submit_to_ack')
+        self._history_lock = threading.Lock()
+        self._lanes = {}
+        self._lanes_lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='order-submit')
+
+    def submit_market_order(self, symbol: str, side: str, quantity: float) -> Future:
+        """Queue a market order; the Future resolves to the order response"""
+        return self._enqueue(symbol, self._market_order, symbol, side, quantity)
+
+    def submit_limit_order(self, symbol: str, side: str, quantity: float, price: float) -> Future:
+        """Queue a limit order; the Future resolves to the order response"""
+        return self._enqueue(symbol, self._limit_order, symbol, side, quantity, price)
+
+    def submit_close_position(self, symbol: str) -> Future:
+        """
+        Queue closing a symbol's position. The position is looked up when the
+        order executes, so it sees any BUY queued before it.
+        """
+        return self._enqueue(symbol, self._close_position, symbol)
 
     def place_market_order(self, symbol: str, side: str, quantity: float) -> Dict:
         """
         Place a market order
-        
+
         :param symbol: Trading pair symbol
         :param side: 'BUY' or 'SELL'
         :param quantity: Order quantity
         :return: Order response
         """
-        try:
-            order = {
-                'symbol': symbol,
-                'side': side,
-                'type': 'MARKET',
-                'quantity': quantity,
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            # Here we would normally interact with the exchange application programming interface
-            # For now, we'll just simulate the order
-            if side == 'BUY':
-                self.open_positions[symbol] = {
-                    'quantity': quantity,
-                    'entry_price': float(self.client.get_ticker_price(symbol)['price'])
-                }
-            
-            self.order_history.append(order)
-            return order
-            
-        except Exception as e:
-            return {'error': str(e)}
+        return self.submit_market_order(symbol, side, quantity).result()
 
     def place_limit_order(self, symbol: str, side: str, quantity: float, price: float) -> Dict:
         """
         Place a limit order
-        
+
         :param symbol: Trading pair symbol
         :param side: 'BUY' or 'SELL'
         :param quantity: Order quantity
         :param price: Limit price
         :return: Order response
         """
-        try:
-            order = {
-                'symbol': symbol,
-                'side': side,
-                'type': 'LIMIT',
-                'quantity': quantity,
-                'price': price,
-                'timestamp': datetime.now().isoformat()
-            }
-            
-            self.order_history.append(order)
-            return order
-            
-        except Exception as e:
-            return {'error': str(e)}
+        return self.submit_limit_order(symbol, side, quantity, price).result()
 
     def get_position(self, symbol: str) -> Optional[Dict]:
         """Get current position for a symbol"""
         return self.open_positions.get(symbol)
 
     def get_order_history(self) -> list:
-        """Get order history"""
-        return self.order_history
+        """Get the most recent orders, oldest first"""
+        with self._history_lock:
+            return list(self.order_history)
 
     def close_position(self, symbol: str) -> Dict:
         """
         Close an open position
-        
+
         :param symbol: Trading pair symbol
         :return: Order response
         """
+        return self.submit_close_position(symbol).result()
+
+    def stats(self) -> Dict:
+        """Queue depth, price cache hit counts and submit-to-ack latency"""
+        with self._lanes_lock:
+            queued = sum(len(lane) for lane in self._lanes.values())
+        return {
+            'open_positions': len(self.open_positions),
+            'queued_orders': queued,
+            'price_cache': {'hits': self.prices.hits, 'misses': self.prices.misses},
+            'submit_to_ack': self.submit_to_ack.snapshot(),
+        }
+
+    def shutdown(self, wait=True):
+        """Stop the dispatch threads and close the journal"""
+        self._pool.shutdown(wait=wait)
+        if self.journal is not None:
+            self.journal.close()
+
+    def _enqueue(self, symbol, execute, *args) -> Future:
+        """Append an order to its symbol's lane and start draining the lane if idle"""
+        future = Future()
+        with self._lanes_lock:
+            lane = self._lanes.get(symbol)
+            idle = lane is None
+            if idle:
+                lane = self._lanes[symbol] = deque()
+            lane.append((future, execute, args, time.perf_counter()))
+        if idle:
+            self._pool.submit(self._drain, symbol)
+        return future
+
+    def _drain(self, symbol):
+        """Execute a lane's orders one after another until it is empty"""
+        while True:
+            with self._lanes_lock:
+                lane = self._lanes[symbol]
+                if not lane:
+                    del self._lanes[symbol]
+                    return
+                future, execute, args, submitted = lane.popleft()
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                order = execute(*args)
+            except Exception as e:
+                order = {'error': str(e)}
+            latency = time.perf_counter() - submitted
+            self.submit_to_ack.record(latency)
+            metrics.observe('order_submit_to_ack_seconds', latency)
+            future.set_result(order)
+
+    def _market_order(self, symbol, side, quantity):
+        order = {
+            'symbol': symbol,
+            'side': side,
+            'type': 'MARKET',
+            'quantity': quantity,
+            'timestamp': datetime.now().isoformat()
+        }
+
+        response = self._send(order)
+        if response is not None:
+            if response['executedQty'] <= 0:
+                return {'error': f"{side} {symbol} was not filled ({response['status']})"}
+            self._apply_fill(symbol, side, response['executedQty'], response['avgPrice'])
+        elif side == 'BUY':
+            # Without an order-routing client the fill is simulated at the last price
+            self._apply_fill(symbol, side, quantity, self.prices.price(symbol))
+        else:
+            self._apply_fill(symbol, side, quantity, None)
+
+        self._record(order)
+        return order
+
+    def _limit_order(self, symbol, side, quantity, price):
+        order = {
+            'symbol': symbol,
+            'side': side,
+            'type': 'LIMIT',
+            'quantity': quantity,
+            'price': price,
+            'timestamp': datetime.now().isoformat()
+        }
+
+        response = self._send(order)
+        if response is not None and response['executedQty'] > 0:
+            # The part that crossed the book on entry; a resting remainder is not a position yet
+            self._apply_fill(symbol, side, response['executedQty'], response['avgPrice'])
+        self._record(order)
+        return order
+
+    def _apply_fill(self, symbol, side, quantity, price):
+        """
+        Add a BUY fill to the symbol's position at the volume-weighted entry
+        price, or take a SELL fill off it; the position is removed once nothing is left.
+        """
         position = self.open_positions.get(symbol)
-        if position:
-            order = self.place_market_order(symbol, 'SELL', position['quantity'])
-            if 'error' not in order:
+        if side == 'BUY':
+            if position is None:
+                self.open_positions[symbol] = {'quantity': quantity, 'entry_price': price}
+                return
+            total = position['quantity'] + quantity
+            position['entry_price'] = (position['entry_price'] * position['quantity'] + price * quantity) / total
+            position['quantity'] = total
+        elif position is not None:
+            position['quantity'] -= quantity
+            if position['quantity'] <= 1e-12:
                 del self.open_positions[symbol]
-            return order
+
+    def _send(self, order):
+        """
+        Route an order through the client when it can take orders (e.g.
+        SimulatedExchange) and merge the fill into ``order``.
+
+        :return: The client's order response, or None when the client only serves market data
+        """
+        create_order = getattr(self.client, 'create_order', None)
+        if create_order is None:
+            return None
+        response = create_order(symbol=order['symbol'], side=order['side'], type=order['type'],
+                                quantity=order['quantity'], price=order.get('price'))
+        order.update({
+            'orderId': response['orderId'],
+            'status': response['status'],
+            'executedQty': response['executedQty'],
+            'avgPrice': response['avgPrice'],
+            'commission': response['commission'],
+        })
+        return response
+
+    def _close_position(self, symbol):
+        position = self.open_positions.get(symbol)
+        if position:
+            # The fill is taken off the position, so a partial close leaves the remainder open
+            return self._market_order(symbol, 'SELL', position['quantity'])
         return {'error': 'No position found'}
+
+    def _record(self, order):
+        with self._history_lock:
+            self.order_history.append(order)
+        if self.journal is not None:
+            self.journal.append(order)
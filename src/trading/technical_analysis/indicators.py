@@ -1,5 +1,9 @@
 import numpy as np
 import pandas as pd
+from numpy.lib.stride_tricks import sliding_window_view
+
+from src.utils import jit
+from src.utils.metrics import metrics
 
 class TechnicalIndicators:
     @staticmethod
@@ -23,6 +27,23 @@ class TechnicalIndicators:
         relative_strength_index = 100 - (100 / (1 + relative_strength))
         return relative_strength_index
 
+    @staticmethod
+    def calculate_wilder_relative_strength_index(data, period=14):
+        """Calculate RSI with Wilder's smoothing, seeded with the mean of the first period"""
+        delta = pd.Series(data, dtype=np.float64).diff()
+        relative_strength_index = pd.Series(np.nan, index=delta.index)
+        if len(delta) <= period:
+            return relative_strength_index
+
+        averages = []
+        for moves in (delta.clip(lower=0), -delta.clip(upper=0)):
+            smoothed = moves.iloc[period:].copy()
+            smoothed.iloc[0] = moves.iloc[1:period + 1].mean()
+            averages.append(smoothed.ewm(alpha=1 / period, adjust=False).mean())
+        gain, loss = averages
+        relative_strength_index.iloc[period:] = 100 - (100 / (1 + gain / loss))
+        return relative_strength_index
+
     @staticmethod
     def calculate_moving_average_convergence_divergence(data, fast_period=12, slow_period=26, signal_period=9):
         """Calculate MACD (Moving Average Convergence Divergence)"""
@@ -45,3 +66,389 @@ class TechnicalIndicators:
         lower_band = simple_moving_average - (standard_deviation_value * standard_deviation)
         
         return upper_band, simple_moving_average, lower_band
+
+    @staticmethod
+    @metrics.timed('indicator_compute_duration_seconds')
+    def compute_indicators(df, spec=None, source='close'):
+        """
+        Compute several indicators in one pass, sharing intermediates.
+
+        Every rolling window and EMA needed by the spec is planned up front
+        and computed once, e.g. a 20-period SMA and 20-period Bollinger Bands
+        share the rolling mean, and MACD reuses EMAs requested elsewhere.
+
+        :param df: DataFrame holding the source column
+        :param spec: Dict mapping output column names to indicator definitions,
+                     e.g. {'SMA': {'indicator': 'sma', 'period': 20}}. Multi-output
+                     indicators take an optional 'columns' list, otherwise they
+                     write <name>, <name>_signal, <name>_histogram (MACD) or
+                     <name>_upper, <name>_middle, <name>_lower (Bollinger).
+                     Defaults to DEFAULT_INDICATOR_SPEC.
+        :param source: Column the indicators are computed from
+        :return: New DataFrame with df's columns followed by the indicator columns
+        """
+        spec = DEFAULT_INDICATOR_SPEC if spec is None else spec
+        plan = _IndicatorPlan(np.asarray(df[source], dtype=np.float64))
+        columns = {}
+
+        for name, definition in spec.items():
+            indicator = definition['indicator']
+            if indicator == 'sma':
+                columns[name] = plan.rolling_mean(definition.get('period', 20))
+            elif indicator == 'ema':
+                columns[name] = plan.ema(definition.get('period', 20))
+            elif indicator == 'rsi':
+                columns[name] = plan.relative_strength_index(definition.get('period', 14))
+            elif indicator == 'rsi_wilder':
+                columns[name] = plan.wilder_relative_strength_index(definition.get('period', 14))
+            elif indicator == 'macd':
+                outputs = definition.get('columns') or [name, f'{name}_signal', f'{name}_histogram']
+                lines = plan.macd(definition.get('fast_period', 12),
+                                  definition.get('slow_period', 26),
+                                  definition.get('signal_period', 9))
+                columns.update(zip(outputs, lines))
+            elif indicator == 'bollinger':
+                outputs = definition.get('columns') or [f'{name}_upper', f'{name}_middle', f'{name}_lower']
+                bands = plan.bollinger_bands(definition.get('period', 20),
+                                             definition.get('standard_deviation', 2))
+                columns.update(zip(outputs, bands))
+            else:
+                raise ValueError(f"Unknown indicator '{indicator}' for column '{name}'")
+
+        # Attaching through concat keeps the computed arrays, setting columns one
+        # by one would copy each of them
+        indicator_frame = pd.DataFrame(columns, index=df.index, copy=False)
+        existing = df.drop(columns=[name for name in columns if name in df.columns])
+        return pd.concat([existing, indicator_frame], axis=1)
+
+
+DEFAULT_INDICATOR_SPEC = {
+    'SMA': {'indicator': 'sma', 'period': 20},
+    'EMA': {'indicator': 'ema', 'period': 20},
+    'RSI': {'indicator': 'rsi', 'period': 14},
+    'MACD': {'indicator': 'macd', 'fast_period': 12, 'slow_period': 26, 'signal_period': 9},
+    'BB': {'indicator': 'bollinger', 'period': 20, 'standard_deviation': 2},
+}
+
+# Windows per chunk for the blocked rolling-sum and EMA kernels
+_BLOCK_SIZE = 4096
+
+
+class _IndicatorPlan:
+    """Memoizes the rolling windows and EMAs shared between indicators."""
+
+    def __init__(self, values):
+        self.values = values
+        self.has_nan = bool(np.isnan(values).any())
+        self._cache = {}
+
+    def _memoize(self, key, compute):
+        if key not in self._cache:
+            self._cache[key] = compute()
+        return self._cache[key]
+
+    def rolling_mean(self, period):
+        # pandas' compensated rolling sums keep flat windows exact, so price vs SMA
+        # comparisons match calculate_simple_moving_average bar for bar
+        def compute():
+            if jit.active() and not self.has_nan:
+                return _rolling_mean_kernel(self.values, period)
+            return pd.Series(self.values, copy=False).rolling(window=period).mean().to_numpy()
+        return self._memoize(('mean', period), compute)
+
+    def rolling_variance(self, period):
+        # pandas' rolling variance is kept for its exact handling of flat windows
+        return self._memoize(('variance', period),
+                             lambda: pd.Series(self.values, copy=False).rolling(window=period).var().to_numpy())
+
+    def rolling_std(self, period):
+        return self._memoize(('std', period), lambda: np.sqrt(self.rolling_variance(period)))
+
+    def ema(self, period, values=None, key=None):
+        if values is None:
+            values, key = self.values, ('ema', period)
+        return self._memoize(key, lambda: _ewm_mean(values, period))
+
+    def relative_strength_index(self, period):
+        def compute():
+            if self.has_nan:
+                return TechnicalIndicators.calculate_relative_strength_index(self.values, period).to_numpy()
+            if jit.active():
+                return _relative_strength_index_kernel(self.values, period)
+            # Gains minus losses over a window telescope to the net change, so
+            # RSI = 100 * gains / (gains + losses) = 50 * (1 + net / movement)
+            # needs a single rolling sum of absolute deltas
+            movement = _rolling_mean(self._memoize('movement', self._absolute_deltas), period)
+            net = np.full(len(self.values), np.nan)
+            if len(self.values) >= period:
+                net[period - 1] = self.values[period - 1] - self.values[0]
+                np.subtract(self.values[period:], self.values[:-period], out=net[period:])
+                net[period - 1:] /= period
+            with np.errstate(divide='ignore', invalid='ignore'):
+                return 50 * (1 + net / movement)
+        return self._memoize(('rsi', period), compute)
+
+    def wilder_relative_strength_index(self, period):
+        def compute():
+            if jit.active() and not self.has_nan:
+                return _wilder_rsi_kernel(self.values, period)
+            return TechnicalIndicators.calculate_wilder_relative_strength_index(self.values, period).to_numpy()
+        return self._memoize(('rsi_wilder', period), compute)
+
+    def _absolute_deltas(self):
+        # The first delta counts as zero, as in calculate_relative_strength_index
+        movement = np.zeros_like(self.values)
+        np.subtract(self.values[1:], self.values[:-1], out=movement[1:])
+        return np.abs(movement, out=movement)
+
+    def macd(self, fast_period, slow_period, signal_period):
+        def compute():
+            if jit.active() and not self.has_nan:
+                return _macd_kernel(self.values, 2.0 / (fast_period + 1), 2.0 / (slow_period + 1),
+                                    2.0 / (signal_period + 1))
+            macd_line = self.ema(fast_period) - self.ema(slow_period)
+            signal_line = self.ema(signal_period, macd_line, ('signal', fast_period, slow_period, signal_period))
+            return macd_line, signal_line, macd_line - signal_line
+        return self._memoize(('macd', fast_period, slow_period, signal_period), compute)
+
+    def bollinger_bands(self, period, standard_deviation):
+        simple_moving_average = self.rolling_mean(period)
+        if jit.active() and not self.has_nan:
+            upper_band, lower_band = _bollinger_kernel(simple_moving_average, self.rolling_variance(period),
+                                                       standard_deviation)
+            return upper_band, simple_moving_average, lower_band
+        width = self.rolling_std(period) * standard_deviation
+        return simple_moving_average + width, simple_moving_average, simple_moving_average - width
+
+
+def _rolling_mean(values, period):
+    """
+    Rolling mean of a non-negative series from blocked prefix sums.
+
+    The series is cut into overlapping chunks of _BLOCK_SIZE windows with
+    their own prefix sums, which keeps the sums small enough that
+    differencing them stays accurate to ~1e-14.
+    """
+    length = len(values)
+    mean = np.empty(length)
+    mean[:period - 1] = np.nan
+    windows = length - period + 1
+    if windows <= 0:
+        mean[:] = np.nan
+        return mean
+
+    rows = -(-windows // _BLOCK_SIZE)
+    padded = np.empty(rows * _BLOCK_SIZE + period - 1)
+    padded[:length] = values
+    padded[length:] = values[-1]
+    chunks = sliding_window_view(padded, _BLOCK_SIZE + period - 1)[::_BLOCK_SIZE]
+
+    prefix = np.zeros((rows, chunks.shape[1] + 1))
+    np.cumsum(chunks, axis=1, out=prefix[:, 1:])
+    sums = np.subtract(prefix[:, period:], prefix[:, :-period])
+    sums /= period
+    mean[period - 1:] = sums.ravel()[:windows]
+    return mean
+
+
+def _ewm_mean(values, period):
+    """
+    EMA equivalent to pd.Series(values).ewm(span=period, adjust=False).mean().
+
+    Within each block the recurrence is solved in closed form with a scaled
+    cumulative sum, and only the carry between blocks is sequential.
+    """
+    alpha = 2.0 / (period + 1)
+    decay = 1.0 - alpha
+    length = len(values)
+    if length == 0 or decay <= 0:
+        return np.array(values, dtype=np.float64)
+    if np.isnan(values).any():
+        return pd.Series(values, copy=False).ewm(span=period, adjust=False).mean().to_numpy()
+    if jit.active():
+        return _ewm_kernel(np.ascontiguousarray(values, dtype=np.float64), alpha)
+
+    # Keep decay ** -block well inside the float64 range
+    block = int(min(_BLOCK_SIZE, max(1, 200 / np.log10(1 / decay))))
+    rows = -(-length // block)
+    powers = decay ** np.arange(block)
+    weights = alpha / powers
+    scaled = np.empty((rows, block))
+    full_rows = length // block
+    np.multiply(values[:full_rows * block].reshape(full_rows, block), weights, out=scaled[:full_rows])
+    if full_rows < rows:
+        tail = length - full_rows * block
+        scaled[-1, :tail] = values[full_rows * block:] * weights[:tail]
+        scaled[-1, tail:] = 0.0
+    np.cumsum(scaled, axis=1, out=scaled)
+    scaled *= powers
+
+    carry_weight = powers * decay
+    carry = values[0]
+    for row in scaled:
+        row += carry_weight * carry
+        carry = row[-1]
+    return scaled.ravel()[:length]
+
+
+def _warm_up_values():
+    values = np.linspace(1.0, 2.0, 64)
+    return values, jit.read_only(values)
+
+
+@jit.kernel(warm_up=lambda: [(values, 0.1) for values in _warm_up_values()])
+def _ewm_kernel(values, alpha):
+    """The adjust=False EMA recurrence, one sequential pass"""
+    smoothed = np.empty(len(values))
+    if len(values) == 0:
+        return smoothed
+    decay = 1.0 - alpha
+    previous = values[0]
+    smoothed[0] = previous
+    for index in range(1, len(values)):
+        previous = decay * previous + alpha * values[index]
+        smoothed[index] = previous
+    return smoothed
+
+
+@jit.kernel(warm_up=lambda: [(values, 2 / 13, 2 / 27, 2 / 10) for values in _warm_up_values()])
+def _macd_kernel(values, fast_alpha, slow_alpha, signal_alpha):
+    """MACD, signal and histogram in one pass of the _ewm_kernel recurrences"""
+    length = len(values)
+    macd_line = np.empty(length)
+    signal_line = np.empty(length)
+    histogram = np.empty(length)
+    if length == 0:
+        return macd_line, signal_line, histogram
+    fast = slow = values[0]
+    signal = 0.0
+    for index in range(length):
+        if index > 0:
+            fast = (1.0 - fast_alpha) * fast + fast_alpha * values[index]
+            slow = (1.0 - slow_alpha) * slow + slow_alpha * values[index]
+        line = fast - slow
+        signal = line if index == 0 else (1.0 - signal_alpha) * signal + signal_alpha * line
+        macd_line[index] = line
+        signal_line[index] = signal
+        histogram[index] = line - signal
+    return macd_line, signal_line, histogram
+
+
+@jit.kernel(warm_up=lambda: [(values, 14) for values in _warm_up_values()], error_model='numpy')
+def _wilder_rsi_kernel(values, period):
+    """Wilder RSI in one pass; matches calculate_wilder_relative_strength_index"""
+    length = len(values)
+    relative_strength_index = np.full(length, np.nan)
+    if length <= period:
+        return relative_strength_index
+
+    alpha = 1.0 / period
+    decay = 1.0 - alpha
+    gain = 0.0
+    loss = 0.0
+    for index in range(1, period + 1):
+        delta = values[index] - values[index - 1]
+        if delta > 0:
+            gain += delta
+        else:
+            loss -= delta
+    gain /= period
+    loss /= period
+
+    for index in range(period, length):
+        if index > period:
+            delta = values[index] - values[index - 1]
+            gain = decay * gain + alpha * (delta if delta > 0 else 0.0)
+            loss = decay * loss + alpha * (-delta if delta < 0 else 0.0)
+        relative_strength_index[index] = 100.0 - 100.0 / (1.0 + gain / loss)
+    return relative_strength_index
+
+
+# State of a pandas-style rolling mean: observations, sum, negative values,
+# Kahan compensations of additions and removals, length of the current run
+# of equal values and the last value added. A tuple keeps it in registers.
+_EMPTY_MEAN_STATE = (0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0)
+
+
+@jit.kernel(warm_up=lambda: [(values, 20) for values in _warm_up_values()])
+def _rolling_mean_kernel(values, period):
+    """
+    pandas' rolling mean without NaNs: Kahan-compensated running sums, with
+    runs of one value returned as that value and the sign kept for windows of
+    one sign. Matches calculate_simple_moving_average bit for bit.
+    """
+    mean = np.empty(len(values))
+    state = _EMPTY_MEAN_STATE
+    for index in range(len(values)):
+        if index >= period:
+            state = _remove_from_mean(state, values[index - period])
+        state = _add_to_mean(state, values[index])
+        mean[index] = _window_mean(state) if index >= period - 1 else np.nan
+    return mean
+
+
+@jit.kernel(warm_up=lambda: [(values, 14) for values in _warm_up_values()], error_model='numpy')
+def _relative_strength_index_kernel(values, period):
+    """
+    calculate_relative_strength_index in one pass, the rolling gain and loss
+    means kept like pandas does so the result matches it bit for bit
+    """
+    length = len(values)
+    relative_strength_index = np.empty(length)
+    gains = losses = _EMPTY_MEAN_STATE
+    for index in range(length):
+        if index >= period:
+            delta = values[index - period] - values[index - period - 1] if index > period else 0.0
+            gains = _remove_from_mean(gains, max(delta, 0.0))
+            losses = _remove_from_mean(losses, -min(delta, 0.0))
+        delta = values[index] - values[index - 1] if index > 0 else 0.0
+        gains = _add_to_mean(gains, max(delta, 0.0))
+        losses = _add_to_mean(losses, -min(delta, 0.0))
+        if index >= period - 1:
+            relative_strength_index[index] = 100.0 - 100.0 / (1.0 + _window_mean(gains) / _window_mean(losses))
+        else:
+            relative_strength_index[index] = np.nan
+    return relative_strength_index
+
+
+@jit.kernel(inline='always')
+def _add_to_mean(state, value):
+    count, total, negatives, added, removed, run, last = state
+    compensated = value - added
+    updated = total + compensated
+    # Branch-free counting, gains and losses flip sign and run bar to bar
+    return (count + 1, updated, negatives + np.signbit(value), updated - total - compensated, removed,
+            1 + run * (value == last), value)
+
+
+@jit.kernel(inline='always')
+def _remove_from_mean(state, value):
+    count, total, negatives, added, removed, run, last = state
+    compensated = -value - removed
+    updated = total + compensated
+    return (count - 1, updated, negatives - np.signbit(value), added, updated - total - compensated, run, last)
+
+
+@jit.kernel(inline='always')
+def _window_mean(state):
+    count, total, negatives, _, _, run, last = state
+    mean = total / count
+    if run >= count:
+        return last
+    if negatives == 0 and mean < 0:
+        return 0.0
+    if negatives == count and mean > 0:
+        return 0.0
+    return mean
+
+
+@jit.kernel(warm_up=lambda: [(values, values, 2.0) for values in _warm_up_values()])
+def _bollinger_kernel(mean, variance, standard_deviation):
+    """Upper and lower bands from the rolling mean and variance, as calculate_bollinger_bands does"""
+    upper = np.empty(len(mean))
+    lower = np.empty(len(mean))
+    for index in range(len(mean)):
+        width = np.sqrt(variance[index]) * standard_deviation
+        upper[index] = mean[index] + width
+        lower[index] = mean[index] - width
+    return upper, lower
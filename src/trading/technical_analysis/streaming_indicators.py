@@ -0,0 +1,196 @@
+import math
+from collections import deque
+
+NAN = float('nan')
+
+
+class StreamingIndicator:
+    """
+    Base class for indicators that update in O(1) per bar.
+
+    ``update(value)`` commits a closed bar, so the following update starts a
+    new one. ``update(value, is_closed=False)`` evaluates the indicator for an
+    in-progress candle without committing it, so the next update revises the
+    same bar.
+    """
+
+    def __init__(self):
+        self.value = None
+
+    def update(self, value, is_closed=True):
+        """
+        Feed the latest close of the current bar.
+
+        :param value: Latest close price
+        :param is_closed: Whether the bar is final
+        :return: Indicator value for the bar
+        """
+        self.value = self._update(float(value), is_closed)
+        return self.value
+
+    def update_kline(self, kline):
+        """Feed a Kline record as emitted by BinanceWebSocket, or a kline dict"""
+        if isinstance(kline, dict):
+            return self.update(kline['close'], kline.get('isClosed', True))
+        return self.update(kline.close, kline.is_closed)
+
+    def extend(self, values):
+        """Feed a history of closed bars and return the last value"""
+        for value in values:
+            self.update(value)
+        return self.value
+
+    def _update(self, value, is_closed):
+        raise NotImplementedError
+
+
+class _RollingWindow:
+    """Fixed-size window with running mean and sliding Welford variance."""
+
+    def __init__(self, period):
+        self.period = period
+        self.values = deque()
+        self.mean = 0.0
+        self.m2 = 0.0
+        self.same_run = 0
+        self.pushes = 0
+
+    def update(self, value, is_closed):
+        """
+        Evaluate the window with value appended, committing it when closed.
+
+        :return: Tuple of (count, mean, m2)
+        """
+        count, mean, m2 = self._evaluate(value)
+        last = self.values[-1] if self.values else None
+        same_run = self.same_run + 1 if value == last else 1
+        if same_run >= count:
+            # Whole window holds one value, report it exactly like pandas does
+            mean, m2 = value, 0.0
+
+        if is_closed:
+            self.values.append(value)
+            if len(self.values) > self.period:
+                self.values.popleft()
+            self.mean, self.m2, self.same_run = mean, m2, same_run
+            self.pushes += 1
+            if self.pushes % self.period == 0:
+                self._resync()
+        return count, mean, m2
+
+    def _evaluate(self, value):
+        count = len(self.values)
+        if count < self.period:
+            count += 1
+            delta = value - self.mean
+            mean = self.mean + delta / count
+            return count, mean, self.m2 + delta * (value - mean)
+
+        removed = self.values[0]
+        mean = self.mean + (value - removed) / count
+        m2 = self.m2 + (value - removed) * (value - mean + removed - self.mean)
+        return count, mean, max(m2, 0.0)
+
+    def _resync(self):
+        """Recompute mean and m2 exactly to stop running-sum drift"""
+        count = len(self.values)
+        mean = math.fsum(self.values) / count
+        self.mean = mean
+        self.m2 = math.fsum((value - mean) ** 2 for value in self.values)
+
+
+class StreamingSimpleMovingAverage(StreamingIndicator):
+    """Streaming counterpart of calculate_simple_moving_average"""
+
+    def __init__(self, period=20):
+        super().__init__()
+        self.period = period
+        self._window = _RollingWindow(period)
+
+    def _update(self, value, is_closed):
+        count, mean, _ = self._window.update(value, is_closed)
+        return mean if count == self.period else NAN
+
+
+class StreamingExponentialMovingAverage(StreamingIndicator):
+    """Streaming counterpart of calculate_exponential_moving_average"""
+
+    def __init__(self, period=20):
+        super().__init__()
+        self.period = period
+        self.alpha = 2.0 / (period + 1)
+        self._ema = None
+
+    def _update(self, value, is_closed):
+        if self._ema is None:
+            ema = value
+        else:
+            ema = self.alpha * value + (1 - self.alpha) * self._ema
+        if is_closed:
+            self._ema = ema
+        return ema
+
+
+class StreamingRelativeStrengthIndex(StreamingIndicator):
+    """
+    Streaming counterpart of calculate_relative_strength_index.
+
+    The batch version averages gains and losses with a simple rolling mean,
+    so this keeps running window sums rather than Wilder smoothing.
+    """
+
+    def __init__(self, period=14):
+        super().__init__()
+        self.period = period
+        self._previous_close = None
+        self._gains = _RollingWindow(period)
+        self._losses = _RollingWindow(period)
+
+    def _update(self, value, is_closed):
+        delta = 0.0 if self._previous_close is None else value - self._previous_close
+        count, gain, _ = self._gains.update(max(delta, 0.0), is_closed)
+        _, loss, _ = self._losses.update(max(-delta, 0.0), is_closed)
+        if is_closed:
+            self._previous_close = value
+
+        if count < self.period:
+            return NAN
+        if loss == 0:
+            return NAN if gain == 0 else 100.0
+        return 100 - (100 / (1 + gain / loss))
+
+
+class StreamingMovingAverageConvergenceDivergence(StreamingIndicator):
+    """Streaming counterpart of calculate_moving_average_convergence_divergence"""
+
+    def __init__(self, fast_period=12, slow_period=26, signal_period=9):
+        super().__init__()
+        self._fast = StreamingExponentialMovingAverage(fast_period)
+        self._slow = StreamingExponentialMovingAverage(slow_period)
+        self._signal = StreamingExponentialMovingAverage(signal_period)
+
+    def _update(self, value, is_closed):
+        """:return: Tuple of (macd_line, signal_line, macd_histogram)"""
+        macd_line = self._fast.update(value, is_closed) - self._slow.update(value, is_closed)
+        signal_line = self._signal.update(macd_line, is_closed)
+        return macd_line, signal_line, macd_line - signal_line
+
+
+class StreamingBollingerBands(StreamingIndicator):
+    """Streaming counterpart of calculate_bollinger_bands"""
+
+    def __init__(self, period=20, standard_deviation=2):
+        super().__init__()
+        self.period = period
+        self.standard_deviation = standard_deviation
+        self._window = _RollingWindow(period)
+
+    def _update(self, value, is_closed):
+        """:return: Tuple of (upper_band, simple_moving_average, lower_band)"""
+        count, mean, m2 = self._window.update(value, is_closed)
+        if count < self.period:
+            return NAN, NAN, NAN
+        if count < 2:
+            return NAN, mean, NAN
+        width = math.sqrt(m2 / (count - 1)) * self.standard_deviation
+        return mean + width, mean, mean - width
@@ -1,14 +1,66 @@
-from flask import Flask, render_template, request, jsonify
+from flask import Flask, Response, abort, g, render_template, request, jsonify, stream_with_context
 
 from src.data.data_fetch.binance_data_fetch.binance_client import BinanceClient
 from src.data.data_fetch.binance_data_fetch.data_fetcher import DataFetcher
-from src.data.data_fetch.binance_data_fetch.websocket_client import BinanceWebSocket
+from src.data.data_fetch.binance_data_fetch.kline_downloader import INTERVAL_MILLISECONDS
+from src.data.data_processing.data_formatter import DataFormatter
+from src.data.data_processing.intervals import interval_period_ids, period_open_times
+from src.data.data_processing.resampler import resample_candles
+from src.data.storage.candle_store import CandleStore
+from src.services.live_feed import LiveFeedHub
+from src.services.trading_pairs import TradingPairsSnapshot
+from src.trading.backtesting.backtest_jobs import BacktestJobService, resolve_strategy_params
+from src.utils import jit
 from src.utils.logging_service import LoggingService
+from src.utils.metrics import metrics
+from src.utils.profiler import SamplingProfiler
 import json
+import os
+import threading
+import time
 
 app = Flask(__name__, static_folder='static')
 data_fetcher = DataFetcher()
+candle_store = CandleStore()
+backtest_jobs = BacktestJobService(candle_store)
+trading_pairs = TradingPairsSnapshot()
 logger = LoggingService()
+profiler = SamplingProfiler()
+
+def warm_up_kernels():
+    """Compile the JIT kernels, or load them from Numba's cache, before the first backtest"""
+    seconds = jit.warm_up()
+    if seconds:
+        logger.info("Compute kernels ready on the %s backend in %.2fs", jit.backend(), seconds)
+
+threading.Thread(target=warm_up_kernels, name='kernel-warm-up', daemon=True).start()
+
+MAX_PROFILE_SECONDS = 300
+LOOPBACK_ADDRESSES = ('127.0.0.1', '::1')
+
+@app.before_request
+def start_request_timer():
+    if metrics.enabled:
+        g.request_started = time.perf_counter()
+
+@app.after_request
+def record_request_latency(response):
+    started = g.pop('request_started', None)
+    if started is not None:
+        # The URL rule keeps label cardinality bounded (/api/klines/<symbol>, not every symbol)
+        route = request.url_rule.rule if request.url_rule is not None else 'unmatched'
+        metrics.observe('http_request_duration_seconds', time.perf_counter() - started,
+                        route=route, method=request.method, status=response.status_code)
+    return response
+
+def require_admin():
+    """Admin endpoints need the ADMIN_TOKEN header, or a loopback client when no token is set"""
+    token = os.environ.get('ADMIN_TOKEN')
+    if token:
+        if request.headers.get('X-Admin-Token') != token:
+            abort(403)
+    elif request.remote_addr not in LOOPBACK_ADDRESSES:
+        abort(403)
 
 @app.route('/')
 def index():
@@ -50,15 +102,27 @@ def toggle_trading():
 @app.route('/api/trading-pairs')
 def get_trading_pairs():
     try:
-        client = BinanceClient()
-        pairs = client.get_trading_pairs()
-        logger.debug(f"Raw trading pairs data: {pairs[:5]}...")  # Log first 5 pairs
-        return jsonify(pairs)
+        query = request.args.get('q', '')
+        page = int(request.args.get('page', 1))
+        page_size = int(request.args.get('page_size', 50))
+        # The ETag and the body must come from the same snapshot
+        snapshot = trading_pairs.snapshot()
+        etag = trading_pairs.etag(query, page, page_size, snapshot)
+        if request.if_none_match.contains(etag):
+            return Response(status=304, headers={'ETag': f'"{etag}"'})
+        response = jsonify(trading_pairs.search(query, page, page_size, snapshot))
+        response.set_etag(etag)
+        response.headers['Cache-Control'] = 'no-cache'
+        return response
     except Exception as e:
-        logger.error(f"Detailed error in /api/trading-pairs: {str(e)}")
+        logger.error("Detailed error in /api/trading-pairs: %s", e)
         logger.exception("Full traceback:")
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/cache-stats')
+def get_cache_stats():
+    return jsonify(BinanceClient.cache_stats())
+
 @app.route('/api/historical-data/<symbol>')
 def get_historical_data(symbol):
     try:
@@ -67,25 +131,125 @@ def get_historical_data(symbol):
         data = data_fetcher.fetch_historical_data(symbol, interval, limit)
         return jsonify(data)
     except Exception as e:
-        logger.error(f"Error fetching historical data: {str(e)}")
+        logger.error("Error fetching historical data: %s", e)
         return jsonify({"error": str(e)}), 500
 
+# Charts up to this many 1m candles are resampled locally instead of downloaded per interval
+MAX_RESAMPLED_BASE_CANDLES = 100_000
+
+def recent_candles(symbol, interval, limit):
+    """Newest `limit` closed candles from the store, formatted for charting"""
+    # Only candles closed since the last request are downloaded. Aligning the start down to a
+    # period open covers `limit` closed candles plus the in-progress one, which both paths leave out
+    start_time = int(time.time() * 1000) - limit * INTERVAL_MILLISECONDS[interval]
+    start_time = int(period_open_times(interval_period_ids([start_time], interval), interval)[0])
+    base_candles = limit * INTERVAL_MILLISECONDS[interval] // INTERVAL_MILLISECONDS['1m']
+    if interval not in ('1s', '1m') and base_candles <= MAX_RESAMPLED_BASE_CANDLES:
+        # Every interval shares the stored 1m history, so switching intervals needs no download
+        candle_store.sync(symbol, '1m', start_time=start_time)
+        candles = resample_candles(candle_store.read_candles(symbol, '1m', start_time), interval, complete_only=True)
+        return candles[-limit:].to_dicts()
+    candle_store.sync(symbol, interval, start_time=start_time)
+    return DataFormatter.format_candle_columns(candle_store.read_last(symbol, interval, limit))
+
+def base_candles_since(symbol, start_time):
+    """Closed 1m candles since start_time, which seed the in-progress bar of a resampled live channel"""
+    candle_store.sync(symbol, '1m', start_time=start_time)
+    return candle_store.read_candles(symbol, '1m', start_time)
+
+live_feed = LiveFeedHub(history=recent_candles, base_history=base_candles_since)
+
 @app.route('/api/klines/<symbol>')
 def get_klines(symbol):
     try:
         interval = request.args.get('interval', '1h')
         limit = int(request.args.get('limit', 1000))
-        data_fetcher = DataFetcher()
-        klines = data_fetcher.fetch_klines_data(symbol, interval, limit)
-        return jsonify(klines)
+        return jsonify(recent_candles(symbol, interval, limit))
     except Exception as e:
-        logger.error(f"Error fetching klines: {str(e)}")
+        logger.error("Error fetching klines: %s", e)
         return jsonify({"error": str(e)}), 500
 
+@app.route('/api/backtest', methods=['POST'])
+def submit_backtest():
+    try:
+        payload = request.json or {}
+        interval = payload.get('interval', '1h')
+        limit = int(payload.get('limit', 1000))
+        end_time = payload.get('end_time')
+        start_time = payload.get('start_time')
+        if start_time is None:
+            start_time = (end_time or int(time.time() * 1000)) - limit * INTERVAL_MILLISECONDS[interval]
+        strategy_params = resolve_strategy_params(payload.get('strategy'), payload.get('parameters'))
+        job_id = backtest_jobs.submit(payload.get('symbols', []), interval, strategy_params, start_time, end_time)
+        return jsonify({"job_id": job_id, "status": "pending"}), 202
+    except (KeyError, ValueError) as e:
+        return jsonify({"error": str(e)}), 400
+
+@app.route('/api/backtest/<job_id>')
+def get_backtest(job_id):
+    status = backtest_jobs.status(job_id)
+    if status is None:
+        return jsonify({"error": "Unknown backtest job"}), 404
+    return jsonify(status)
+
+@app.route('/api/backtest/<job_id>', methods=['DELETE'])
+def cancel_backtest(job_id):
+    if not backtest_jobs.cancel(job_id):
+        return jsonify({"error": "Backtest job is not running"}), 409
+    return jsonify({"status": "cancelled"})
+
 @app.route('/api/realtime-data/<symbol>')
 def get_realtime_data(symbol):
-    callback = lambda data: print(data)  # Replace with actual callback
-    return data_fetcher.fetch_realtime_data(symbol, callback)
+    """Server-Sent Events: a snapshot of recent candles, then every live update"""
+    interval = request.args.get('interval', '1m')
+    if interval not in INTERVAL_MILLISECONDS:
+        return jsonify({"error": f"Unsupported interval '{interval}'"}), 400
+    return Response(stream_with_context(live_feed.listen(symbol, interval)), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/realtime-stats')
+def get_realtime_stats():
+    return jsonify(live_feed.stats())
+
+@app.route('/metrics')
+def get_metrics():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/admin/profiler/start', methods=['POST'])
+def start_profiler():
+    require_admin()
+    try:
+        seconds = float(request.args.get('seconds', 10))
+        interval_ms = float(request.args.get('interval_ms', 5))
+    except ValueError:
+        return jsonify({"error": "seconds and interval_ms must be numbers"}), 400
+    if not 0 < seconds <= MAX_PROFILE_SECONDS or interval_ms <= 0:
+        return jsonify({"error": f"seconds must be in (0, {MAX_PROFILE_SECONDS}] and interval_ms positive"}), 400
+    if not profiler.start(seconds, interval_ms / 1000):
+        return jsonify({"error": "Profiler is already running"}), 409
+    logger.info("Sampling profiler started for %.1fs", seconds)
+    return jsonify(profiler.status()), 202
+
+@app.route('/admin/profiler/stop', methods=['POST'])
+def stop_profiler():
+    require_admin()
+    profiler.stop()
+    return profiler_dump()
+
+@app.route('/admin/profiler')
+def get_profiler_status():
+    require_admin()
+    return jsonify(profiler.status())
+
+@app.route('/admin/profiler/dump')
+def get_profiler_dump():
+    require_admin()
+    return profiler_dump()
+
+def profiler_dump():
+    """Collapsed stacks of the latest run, ready for flamegraph.pl or speedscope"""
+    return Response(profiler.folded(), mimetype='text/plain',
+                    headers={'Content-Disposition': 'attachment; filename="profile.folded"'})
 
 if __name__ == '__main__':
     app.run(debug=True)
@@ -1,6 +1,12 @@
 class CryptoSearch {
     constructor() {
         this.cryptoData = [];
+        this.query = '';
+        this.page = 1;
+        this.pageSize = 50;
+        this.total = 0;
+        this.searchTimer = null;
+        this.pendingRequest = null;
         this.searchInput = document.getElementById('cryptoSearch');
         this.searchResults = document.createElement('div');
         this.searchResults.className = 'search-results absolute w-full bg-gray-700 mt-1 rounded-lg shadow-lg z-50 max-h-96 overflow-y-auto';
@@ -25,6 +31,15 @@ class CryptoSearch {
             if (event.target.type === 'checkbox') event.stopPropagation();
         });
 
+        // Load the next page of matches when scrolled near the bottom
+        this.searchResults.addEventListener('scroll', () => {
+            const nearBottom = this.searchResults.scrollTop + this.searchResults.clientHeight
+                >= this.searchResults.scrollHeight - 50;
+            if (nearBottom && !this.pendingRequest && this.cryptoData.length < this.total) {
+                this.fetchCryptoData(this.query, this.page + 1);
+            }
+        });
+
         if (this.filterButton) {
             this.filterButton.addEventListener('click', this.handleFilterClick.bind(this));
         }
@@ -52,32 +67,55 @@ class CryptoSearch {
         event.stopPropagation();
     }
 
-    async fetchCryptoData() {
+    async fetchCryptoData(query = '', page = 1) {
+        // Only the latest search matters, so an older request still in flight is dropped
+        if (this.pendingRequest) {
+            this.pendingRequest.abort();
+        }
+        const controller = new AbortController();
+        this.pendingRequest = controller;
+
         try {
-            const response = await fetch('/api/trading-pairs');
+            const params = new URLSearchParams({ q: query, page, page_size: this.pageSize });
+            // The server answers unchanged pages with 304, which the browser serves from its cache
+            const response = await fetch(`/api/trading-pairs?${params}`, { signal: controller.signal });
             const data = await response.json();
 
-            this.cryptoData = data.map(pair => ({
-                symbol: pair.symbol.replace('USDT', ''),
+            const pairs = data.items.map(pair => ({
+                symbol: pair.base,
                 name: pair.symbol,
-                price: parseFloat(pair.lastPrice),
-                change24h: parseFloat(pair.priceChangePercent),
+                price: pair.price,
+                change24h: pair.change24h,
                 volume: this.formatVolume(pair.volume)
             }));
+            this.cryptoData = page === 1 ? pairs : this.cryptoData.concat(pairs);
+            this.query = query;
+            this.page = page;
+            this.total = data.total;
+
+            if (this.isDropdownOpen) {
+                const scrollTop = this.searchResults.scrollTop;
+                this.displayResults(this.cryptoData);
+                this.searchResults.scrollTop = page === 1 ? 0 : scrollTop;
+            }
         } catch (error) {
+            if (error.name === 'AbortError') return;
             console.error('Error fetching crypto data:', error);
             this.cryptoData = [];
+        } finally {
+            if (this.pendingRequest === controller) {
+                this.pendingRequest = null;
+            }
         }
     }
 
     filterResults() {
-        const searchTerm = this.searchInput.value.toLowerCase();
-        const filteredResults = this.cryptoData.filter(crypto =>
-            crypto.symbol.toLowerCase().includes(searchTerm) ||
-            crypto.name.toLowerCase().includes(searchTerm)
-        );
-        this.displayResults(filteredResults);
-        this.searchResults.scrollTop = 0;
+        const searchTerm = this.searchInput.value.trim();
+        clearTimeout(this.searchTimer);
+        this.searchTimer = setTimeout(async () => {
+            await this.fetchCryptoData(searchTerm, 1);
+            this.searchResults.scrollTop = 0;
+        }, 150);
     }
 
     displayResults(results) {
@@ -4,13 +4,12 @@ class TradeLab {
         this.charts = new Map(); // Stores chart data
         this.activeSymbols = new Set(); // Tracks currently displayed symbols
         this.chartData = new Map(); // Stores the latest chart data for symbols
-        this.websocket = null; // WebSocket for live updates
+        this.feeds = new Map(); // Live candle EventSource per symbol
+        this.backtestJobId = null; // Backtest job currently being polled
 
         // Initialize all components
         this.initializeEventListeners();
         this.initializeBacktestingPanel();
-        this.initializeWebSocket();
-        this.initializeDataRefresh();
     }
 
     initializeEventListeners() {
@@ -33,15 +32,6 @@ class TradeLab {
         });
     }
 
-    initializeDataRefresh() {
-        // Refresh data every minute
-        setInterval(() => {
-            this.charts.forEach((chart, symbol) => {
-                this.fetchAndDisplayData(symbol, chart);
-            });
-        }, 60000); // Set to 60 seconds
-    }
-
     initializeBacktestingPanel() {
         const backtestPanel = document.getElementById('backtestPanel');
         const toggleButton = document.getElementById('toggleBacktest');
@@ -59,14 +49,12 @@ class TradeLab {
         });
     }
 
-    async addChart(symbol) {
+    addChart(symbol) {
         if (this.activeSymbols.has(symbol)) {
             alert('This symbol is already displayed');
             return;
         }
 
-        const symbolWithPair = symbol + this.baseSymbol;
-
         // Create widget (container for each chart)
         const chartContainer = document.createElement('div');
         chartContainer.className = 'bg-gray-800 p-2 rounded-lg flex flex-col shadow-lg';
@@ -99,10 +87,9 @@ class TradeLab {
         const chart = this.createChart(chartDiv, symbol);
         this.charts.set(symbol, chart);
         this.activeSymbols.add(symbol);
-        this.subscribeToSymbol(symbolWithPair);
 
-        // Fetch historical data for the chart
-        await this.fetchAndDisplayData(symbol, chart);
+        // Stream recent history and live candles for the chart
+        this.subscribeToSymbol(symbol, chart);
 
         // Adjust the grid layout dynamically
         this.updateChartGrid();
@@ -153,72 +140,55 @@ class TradeLab {
         return { chart, candleSeries };
     }
 
-    async fetchAndDisplayData(symbol, chart) {
-        try {
-            const symbolWithPair = symbol + this.baseSymbol;
-            const response = await fetch(`/api/historical-data/${symbolWithPair}`);
-            const data = await response.json();
-            const formattedData = data.map(d => ({
-                time: d.time,
-                open: parseFloat(d.open),
-                high: parseFloat(d.high),
-                low: parseFloat(d.low),
-                close: parseFloat(d.close),
-            }));
-            if (formattedData.length > 0) {
-                chart.candleSeries.setData(formattedData);
-                this.chartData.set(symbol, formattedData[formattedData.length - 1]);
-                this.updateChartTitle(symbol, formattedData[formattedData.length - 1].close);
+    subscribeToSymbol(symbol, chart) {
+        // The server sends its buffered candles on connect and then every update;
+        // EventSource reconnects by itself and receives a fresh snapshot
+        const source = new EventSource(`/api/realtime-data/${symbol + this.baseSymbol}?interval=1m`);
+
+        source.addEventListener('snapshot', (event) => {
+            const candles = JSON.parse(event.data).map(this.toChartCandle);
+            chart.candleSeries.setData(candles);
+            if (candles.length > 0) {
+                const latest = candles[candles.length - 1];
+                this.chartData.set(symbol, latest);
+                this.updateChartTitle(symbol, latest.close);
             }
-        } catch (error) {
-            console.error('Error fetching data:', error);
-        }
-    }
-
-    initializeWebSocket() {
-        this.websocket = new WebSocket('wss://stream.binance.com:9443/ws');
+        });
 
-        this.websocket.onmessage = (event) => {
-            const data = JSON.parse(event.data);
-            if (data.e === 'kline') {
-                this.updateChartData(data);
-            }
-        };
+        source.addEventListener('candle', (event) => {
+            this.updateChartData(symbol, JSON.parse(event.data));
+        });
 
-        this.websocket.onerror = (error) => {
-            console.error('WebSocket error:', error);
-            setTimeout(() => this.initializeWebSocket(), 5000); // Attempt reconnect
+        source.onerror = (error) => {
+            console.error(`Live feed error for ${symbol}:`, error);
         };
 
-        this.websocket.onclose = () => {
-            setTimeout(() => this.initializeWebSocket(), 5000);
-        };
+        this.feeds.set(symbol, source);
     }
 
-    subscribeToSymbol(symbol) {
-        if (this.websocket && this.websocket.readyState === WebSocket.OPEN) {
-            const subscription = {
-                method: 'SUBSCRIBE',
-                params: [`${symbol.toLowerCase()}@kline_1m`],
-                id: Date.now(),
-            };
-            this.websocket.send(JSON.stringify(subscription));
+    unsubscribeFromSymbol(symbol) {
+        const source = this.feeds.get(symbol);
+        if (source) {
+            source.close();
+            this.feeds.delete(symbol);
         }
     }
 
-    updateChartData(data) {
-        const symbol = data.s.replace(this.baseSymbol, '');
+    toChartCandle(candle) {
+        return {
+            time: candle.time,
+            open: candle.open,
+            high: candle.high,
+            low: candle.low,
+            close: candle.close,
+        };
+    }
+
+    updateChartData(symbol, candle) {
         const chart = this.charts.get(symbol);
 
         if (chart) {
-            const candleData = {
-                time: data.k.t / 1000,
-                open: parseFloat(data.k.o),
-                high: parseFloat(data.k.h),
-                low: parseFloat(data.k.l),
-                close: parseFloat(data.k.c),
-            };
-
+            const candleData = this.toChartCandle(candle);
             this.updateChartTitle(symbol, candleData.close);
             chart.candleSeries.update(candleData);
             this.chartData.set(symbol, candleData);
@@ -235,26 +205,56 @@ class TradeLab {
 
     async runBacktest() {
         const strategy = document.getElementById('strategy').value;
+        const interval = document.getElementById('timeframe').value;
         const parameters = this.getStrategyParameters();
 
+        // Cancel a backtest still running from a previous click
+        if (this.backtestJobId) {
+            fetch(`/api/backtest/${this.backtestJobId}`, { method: 'DELETE' });
+        }
+
         try {
             const response = await fetch('/api/backtest', {
                 method: 'POST',
                 headers: { 'Content-Type': 'application/json' },
                 body: JSON.stringify({
                     strategy,
+                    interval,
                     parameters,
-                    symbols: Array.from(this.activeSymbols),
+                    symbols: Array.from(this.activeSymbols, symbol => symbol + this.baseSymbol),
                 }),
             });
 
-            const results = await response.json();
-            this.displayBacktestResults(results);
+            const job = await response.json();
+            if (!response.ok) {
+                throw new Error(job.error);
+            }
+            this.backtestJobId = job.job_id;
+            const results = await this.pollBacktest(job.job_id);
+            if (results && results.status === 'completed') {
+                this.displayBacktestResults(results.summary);
+            } else if (results) {
+                console.error('Backtest failed:', results.errors);
+            }
         } catch (error) {
             console.error('Backtest error:', error);
         }
     }
 
+    async pollBacktest(jobId) {
+        // Poll until the job finishes; null means a newer backtest replaced it
+        while (this.backtestJobId === jobId) {
+            const response = await fetch(`/api/backtest/${jobId}`);
+            const job = await response.json();
+            if (['completed', 'failed', 'cancelled'].includes(job.status)) {
+                this.backtestJobId = null;
+                return job;
+            }
+            await new Promise(resolve => setTimeout(resolve, 500));
+        }
+        return null;
+    }
+
     displayBacktestResults(results) {
         const modal = document.getElementById('resultsModal');
         const content = document.getElementById('resultsContent');
@@ -289,6 +289,8 @@ class TradeLab {
     }
 
     clearAllCharts() {
+        this.feeds.forEach((source) => source.close());
+        this.feeds.clear();
         this.charts.forEach((chart) => chart.chart.remove());
         this.charts.clear();
         this.activeSymbols.clear();
@@ -298,6 +300,7 @@ class TradeLab {
     removeChart(symbol) {
         const chart = this.charts.get(symbol);
         if (chart) {
+            this.unsubscribeFromSymbol(symbol);
             chart.chart.remove(); // Remove the chart instance
             this.charts.delete(symbol);
             this.activeSymbols.delete(symbol);
@@ -0,0 +1,16 @@
+import os
+
+import yaml
+
+DEFAULT_CONFIG_PATH = os.path.join('config', 'config.yaml')
+
+
+def load_config(path=DEFAULT_CONFIG_PATH):
+    """
+    Load the bot configuration.
+
+    :param path: Path to a YAML config file
+    :return: Dict of configuration values
+    """
+    with open(path) as config_file:
+        return yaml.safe_load(config_file) or {}
@@ -0,0 +1,107 @@
+import time
+
+try:
+    import numba
+except ImportError:
+    numba = None
+
+BACKENDS = ('numba', 'numpy')
+
+# (compiled kernel, callable returning example argument tuples) pairs compiled by warm_up
+_warm_ups = []
+_backend = 'numpy'
+
+
+def kernel(warm_up=None, **options):
+    """
+    Compile a loop kernel with numba.njit when Numba is installed.
+
+    Kernels are plain Python over NumPy arrays; without Numba the function
+    is returned unchanged. Callers pick the JIT kernel or their NumPy/pandas
+    path with ``active()``, so outputs never depend on Numba being present.
+
+    :param warm_up: Callable returning a list of example argument tuples, one per
+                    specialization that warm_up() should compile
+    :param options: Extra numba.njit options
+    """
+    def decorate(function):
+        if numba is None:
+            return function
+        compiled = numba.njit(cache=True, nogil=True, **options)(function)
+        if warm_up is not None:
+            _warm_ups.append((compiled, warm_up))
+        return compiled
+    return decorate
+
+
+def python_function(compiled):
+    """The uncompiled Python function behind a kernel"""
+    return getattr(compiled, 'py_func', compiled)
+
+
+def set_backend(name='auto'):
+    """
+    Select the compute backend.
+
+    :param name: 'numba', 'numpy', or 'auto' for Numba when it is installed
+    :return: The selected backend
+    """
+    global _backend
+    if name == 'auto':
+        name = 'numba' if numba is not None else 'numpy'
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown compute backend '{name}', expected one of {BACKENDS} or 'auto'")
+    if name == 'numba' and numba is None:
+        raise ValueError("The numba compute backend needs Numba installed")
+    _backend = name
+    return _backend
+
+
+def backend():
+    return _backend
+
+
+def active():
+    """Whether JIT kernels should be used"""
+    return _backend == 'numba'
+
+
+def warm_up():
+    """
+    Compile every registered kernel (or load it from Numba's on-disk cache)
+    so the first backtest or indicator call does not pay for compilation.
+
+    :return: Seconds spent, 0 when the numpy backend is selected
+    """
+    if not active():
+        return 0.0
+    started = time.perf_counter()
+    for compiled, example_arguments in _warm_ups:
+        for arguments in example_arguments():
+            compiled(*arguments)
+    return time.perf_counter() - started
+
+
+def read_only(array):
+    """
+    Read-only view of an array for warm-up arguments: pandas and memory-mapped
+    stores hand out read-only arrays, which Numba compiles separately.
+    """
+    view = array.view()
+    view.flags.writeable = False
+    return view
+
+
+def _configured_backend():
+    """compute.backend from config.yaml, 'auto' when it cannot be read"""
+    try:
+        from .config_loader import load_config
+        return load_config().get('compute', {}).get('backend', 'auto')
+    except Exception:
+        return 'auto'
+
+
+try:
+    set_backend(_configured_backend())
+except ValueError:
+    set_backend('auto')
@@ -0,0 +1,94 @@
+import math
+import threading
+
+# Bucket upper bounds in microseconds: 1us, 2us, 4us ... ~67s
+BUCKET_BOUNDS_US = tuple(2 ** exponent for exponent in range(27))
+
+
+class LatencyHistogram:
+    """Thread-safe log2-bucketed latency histogram with percentile estimates."""
+
+    def __init__(self, name=None):
+        self.name = name
+        self.counts = [0] * (len(BUCKET_BOUNDS_US) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, seconds):
+        """Add one observation given in seconds"""
+        microseconds = seconds * 1e6
+        bucket = 0 if microseconds <= 1 else min(math.ceil(math.log2(microseconds)), len(BUCKET_BOUNDS_US))
+        with self._lock:
+            self.counts[bucket] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds > self.max:
+                self.max = seconds
+
+    def percentile(self, fraction):
+        """
+        Upper bound of the bucket holding the given fraction of observations.
+
+        :param fraction: Between 0 and 1, e.g. 0.99
+        :return: Latency in seconds, or None without observations
+        """
+        with self._lock:
+            if self.count == 0:
+                return None
+            target = max(1, math.ceil(fraction * self.count))
+            seen = 0
+            for bucket, bucket_count in enumerate(self.counts):
+                seen += bucket_count
+                if seen >= target:
+                    if bucket == len(BUCKET_BOUNDS_US):
+                        return self.max
+                    return min(BUCKET_BOUNDS_US[bucket] / 1e6, self.max)
+        return self.max
+
+    def reset(self):
+        """Drop every observation"""
+        with self._lock:
+            self.counts = [0] * (len(BUCKET_BOUNDS_US) + 1)
+            self.count = 0
+            self.total = 0.0
+            self.max = 0.0
+
+    def cumulative_buckets(self):
+        """
+        Prometheus-style histogram state.
+
+        :return: (list of (upper bound in seconds, cumulative count), count, sum in seconds)
+        """
+        with self._lock:
+            counts, count, total = list(self.counts), self.count, self.total
+        cumulative = []
+        seen = 0
+        for bound, bucket_count in zip(BUCKET_BOUNDS_US, counts):
+            seen += bucket_count
+            cumulative.append((bound / 1e6, seen))
+        return cumulative, count, total
+
+    def snapshot(self):
+        """Count, mean, max and p50/p90/p99 in milliseconds plus the non-empty buckets"""
+        with self._lock:
+            count, total, maximum = self.count, self.total, self.max
+            buckets = {
+                (f"le_{BUCKET_BOUNDS_US[bucket]}us" if bucket < len(BUCKET_BOUNDS_US) else "inf"): bucket_count
+                for bucket, bucket_count in enumerate(self.counts) if bucket_count
+            }
+
+        def milliseconds(value):
+            return None if value is None else value * 1e3
+
+        return {
+            'name': self.name,
+            'count': count,
+            'mean_ms': milliseconds(total / count) if count else None,
+            'max_ms': milliseconds(maximum) if count else None,
+            'p50_ms': milliseconds(self.percentile(0.5)),
+            'p90_ms': milliseconds(self.percentile(0.9)),
+            'p99_ms': milliseconds(self.percentile(0.99)),
+            'buckets': buckets,
+        }
@@ -1,48 +1,144 @@
+import atexit
 import logging
-import sys
-from datetime import datetime
+import logging.handlers
 import os
+import queue
+import sys
+import threading
+import time
+
+LOG_DIRECTORY = 'logs'
+LOG_FILE = os.path.join(LOG_DIRECTORY, 'crypto_bot.log')
+LOG_RETENTION_DAYS = 14
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler that leaves %-formatting to the listener thread.
+
+    The stock handler formats every record on the calling thread before
+    queueing it. Records here keep their msg and args, so callers must not
+    mutate objects passed as arguments after logging them.
+    """
+
+    def prepare(self, record):
+        return record
+
 
 class LoggingService:
+    """
+    Process-wide logger whose handlers run on a background thread.
+
+    Callers only put records on an in-memory queue; a QueueListener writes
+    them to stdout and to a file rotated at midnight. Messages take lazy
+    %-style arguments, so nothing is formatted for disabled levels; callers
+    guard costly arguments with ``is_enabled``. The ``*_every`` methods
+    rate-limit per-message events such as stream frames.
+    """
+
     _instance = None
-    
+
     def __new__(cls):
         if cls._instance is None:
             cls._instance = super(LoggingService, cls).__new__(cls)
             cls._instance._initialize_logger()
         return cls._instance
-    
+
     def _initialize_logger(self):
         self.logger = logging.getLogger('CryptoTradingBot')
-        self.logger.setLevel(logging.DEBUG)
-        
+        self.logger.setLevel(self._configured_level())
+        self.logger.propagate = False
+        self._last_emitted = {}
+        self._suppressed = {}
+        self._rate_lock = threading.Lock()
+
         # Create logs directory if it doesn't exist
-        if not os.path.exists('logs'):
-            os.makedirs('logs')
-            
+        os.makedirs(LOG_DIRECTORY, exist_ok=True)
+
         # Console handler
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.INFO)
-        console_format = logging.Formatter('%(levelname)s - %(message)s')
-        console_handler.setFormatter(console_format)
-        
-        # File handler
-        file_handler = logging.FileHandler(f'logs/crypto_bot_{datetime.now().strftime("%Y%m%d")}.log')
+        console_handler.setFormatter(logging.Formatter('%(levelname)s - %(message)s'))
+
+        # File handler, rolled over to crypto_bot.log.YYYY-MM-DD every midnight
+        file_handler = logging.handlers.TimedRotatingFileHandler(
+            LOG_FILE, when='midnight', backupCount=LOG_RETENTION_DAYS, encoding='utf-8', delay=True
+        )
         file_handler.setLevel(logging.DEBUG)
-        file_format = logging.Formatter('%(asctime)s - %(levelname)s - %(message)s')
-        file_handler.setFormatter(file_format)
-        
-        self.logger.addHandler(console_handler)
-        self.logger.addHandler(file_handler)
-    
-    def info(self, message):
-        self.logger.info(message)
-    
-    def debug(self, message):
-        self.logger.debug(message)
-    
-    def error(self, message):
-        self.logger.error(message)
-    
-    def warning(self, message):
-        self.logger.warning(message)
+        file_handler.setFormatter(logging.Formatter('%(asctime)s - %(levelname)s - %(message)s'))
+
+        self._queue = queue.SimpleQueue()
+        self.listener = logging.handlers.QueueListener(
+            self._queue, console_handler, file_handler, respect_handler_level=True
+        )
+        self.listener.start()
+        self._listening = True
+        atexit.register(self.shutdown)
+        self.logger.addHandler(_DeferredQueueHandler(self._queue))
+
+    def shutdown(self):
+        """Flush queued records and stop the listener thread"""
+        if self._listening:
+            self._listening = False
+            self.listener.stop()
+
+    @staticmethod
+    def _configured_level():
+        """The logging.level from config.yaml, DEBUG when it cannot be read"""
+        try:
+            from .config_loader import load_config
+            level = load_config().get('logging', {}).get('level', 'DEBUG')
+        except Exception:
+            return logging.DEBUG
+        level = logging.getLevelName(str(level).upper())
+        return level if isinstance(level, int) else logging.DEBUG
+
+    def is_enabled(self, level):
+        """Whether records of ``level`` are kept; guard costly argument building with it"""
+        return self.logger.isEnabledFor(level)
+
+    def info(self, message, *args):
+        self.logger.info(message, *args)
+
+    def debug(self, message, *args):
+        self.logger.debug(message, *args)
+
+    def error(self, message, *args):
+        self.logger.error(message, *args)
+
+    def warning(self, message, *args):
+        self.logger.warning(message, *args)
+
+    def exception(self, message, *args):
+        """Log an error with the traceback of the exception being handled"""
+        self.logger.exception(message, *args)
+
+    def log_every(self, level, key, seconds, message, *args):
+        """
+        Log at most once per ``seconds`` for ``key``; the next record that
+        gets through reports how many were suppressed in between.
+
+        :param level: logging level
+        :param key: Identifies the event being rate-limited
+        :param seconds: Minimum interval between records for the key
+        :param message: %-style message
+        """
+        if not self.logger.isEnabledFor(level):
+            return
+        now = time.monotonic()
+        with self._rate_lock:
+            if now - self._last_emitted.get(key, float('-inf')) < seconds:
+                self._suppressed[key] = self._suppressed.get(key, 0) + 1
+                return
+            self._last_emitted[key] = now
+            suppressed = self._suppressed.pop(key, 0)
+        if suppressed:
+            message = f"{message} (%d similar suppressed)"
+            args = args + (suppressed,)
+        self.logger.log(level, message, *args)
+
+    def debug_every(self, key, seconds, message, *args):
+        self.log_every(logging.DEBUG, key, seconds, message, *args)
+
+    def warning_every(self, key, seconds, message, *args):
+        self.log_every(logging.WARNING, key, seconds, message, *args)
@@ -0,0 +1,207 @@
+import functools
+import threading
+import time
+
+from .latency_histogram import LatencyHistogram
+
+COUNTER = 'counter'
+GAUGE = 'gauge'
+HISTOGRAM = 'histogram'
+
+# Metrics the bot exports, name -> (type, help)
+METRIC_DESCRIPTIONS = {
+    'http_request_duration_seconds': (HISTOGRAM, "Flask request latency per route"),
+    'binance_rest_request_duration_seconds': (HISTOGRAM, "Binance REST call latency per endpoint"),
+    'binance_used_weight_1m': (GAUGE, "Request weight used in the current minute, from X-MBX-USED-WEIGHT-1M"),
+    'stream_messages_total': (COUNTER, "WebSocket kline frames received per stream"),
+    'stream_message_lag_seconds': (HISTOGRAM, "Delay between a frame's event time and its dispatch"),
+    'stream_frames_coalesced_total': (COUNTER, "In-progress frames replaced by a newer one before dispatch"),
+    'indicator_compute_duration_seconds': (HISTOGRAM, "TechnicalIndicators.compute_indicators run time"),
+    'backtest_duration_seconds': (HISTOGRAM, "Backtest run time per engine"),
+    'backtest_bars_total': (COUNTER, "Bars processed by backtests per engine"),
+    'backtest_bars_per_second': (GAUGE, "Throughput of the latest backtest per engine"),
+    'order_submit_to_ack_seconds': (HISTOGRAM, "TradeExecutor latency from submission to acknowledgement"),
+    'strategy_tick_to_order_seconds': (HISTOGRAM, "StrategyRuntime latency from closed kline to queued order"),
+}
+
+
+class _NullTimer:
+    """Shared no-op context returned by timer() while metrics are disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class _Timer:
+    __slots__ = ('registry', 'name', 'labels', 'started')
+
+    def __init__(self, registry, name, labels):
+        self.registry = registry
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.registry.observe(self.name, time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+def _label_key(labels):
+    return tuple(sorted((name, str(value)) for name, value in labels.items())) if labels else ()
+
+
+def _format_labels(key, extra=()):
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ''
+    escaped = (str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n') for _, value in pairs)
+    return '{' + ','.join(f'{name}="{value}"' for (name, _), value in zip(pairs, escaped)) + '}'
+
+
+class MetricsRegistry:
+    """
+    In-process counters, gauges and latency histograms, rendered in the
+    Prometheus text format for the /metrics endpoint.
+
+    Histograms are LatencyHistograms (log2 microsecond buckets). While
+    ``enabled`` is False every recording call returns after one attribute
+    check and timer() hands out a shared no-op context.
+    """
+
+    def __init__(self, enabled=True, descriptions=None):
+        self.enabled = enabled
+        self._descriptions = dict(descriptions or {})
+        self._values = {}
+        self._histograms = {}
+        self._lock = threading.Lock()
+
+    def describe(self, name, metric_type, help_text):
+        """Declare a metric's type and help line"""
+        self._descriptions[name] = (metric_type, help_text)
+
+    def increment(self, name, value=1, **labels):
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + value
+
+    def set_gauge(self, name, value, **labels):
+        if not self.enabled:
+            return
+        self._values[(name, _label_key(labels))] = value
+
+    def observe(self, name, seconds, **labels):
+        """Add a duration to a histogram"""
+        if not self.enabled:
+            return
+        key = (name, _label_key(labels))
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(key, LatencyHistogram(name))
+        histogram.record(seconds)
+
+    def timer(self, name, **labels):
+        """Context manager observing the duration of its block"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self, name, labels)
+
+    def timed(self, name, **labels):
+        """Decorator observing the duration of every call"""
+        def decorate(function):
+            @functools.wraps(function)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return function(*args, **kwargs)
+                started = time.perf_counter()
+                try:
+                    return function(*args, **kwargs)
+                finally:
+                    self.observe(name, time.perf_counter() - started, **labels)
+            return wrapper
+        return decorate
+
+    def reset(self):
+        """Drop every recorded value"""
+        with self._lock:
+            self._values.clear()
+            self._histograms.clear()
+
+    def snapshot(self):
+        """Recorded values as a dict, histograms summarized in milliseconds"""
+        with self._lock:
+            values = dict(self._values)
+            histograms = dict(self._histograms)
+        result = {}
+        for (name, key), value in values.items():
+            result.setdefault(name, []).append({'labels': dict(key), 'value': value})
+        for (name, key), histogram in histograms.items():
+            result.setdefault(name, []).append({'labels': dict(key), **histogram.snapshot()})
+        return result
+
+    def render(self):
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            values = sorted(self._values.items())
+            histograms = sorted(self._histograms.items(), key=lambda item: item[0])
+
+        lines = []
+        described = set()
+
+        def header(name, default_type):
+            if name in described:
+                return
+            described.add(name)
+            metric_type, help_text = self._descriptions.get(name, (default_type, name))
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} {metric_type}")
+
+        for (name, key), value in values:
+            header(name, GAUGE)
+            lines.append(f"{name}{_format_labels(key)} {value}")
+
+        for (name, key), histogram in histograms:
+            header(name, HISTOGRAM)
+            buckets, count, total = histogram.cumulative_buckets()
+            for bound, cumulative in buckets:
+                lines.append(f"{name}_bucket{_format_labels(key, [('le', repr(bound))])} {cumulative}")
+            lines.append(f"{name}_bucket{_format_labels(key, [('le', '+Inf')])} {count}")
+            lines.append(f"{name}_sum{_format_labels(key)} {total}")
+            lines.append(f"{name}_count{_format_labels(key)} {count}")
+        return '\n'.join(lines) + '\n'
+
+
+def _configured_enabled():
+    """metrics.enabled from config.yaml, on when it cannot be read"""
+    try:
+        from .config_loader import load_config
+        return bool(load_config().get('metrics', {}).get('enabled', True))
+    except Exception:
+        return True
+
+
+# Process-wide registry shared by the instrumented modules
+metrics = MetricsRegistry(_configured_enabled(), METRIC_DESCRIPTIONS)
+
+
+def record_backtest(engine, bars, seconds):
+    """Export one backtest run's duration, bar count and bars/sec"""
+    if not metrics.enabled:
+        return
+    metrics.observe('backtest_duration_seconds', seconds, engine=engine)
+    metrics.increment('backtest_bars_total', bars, engine=engine)
+    if seconds > 0:
+        metrics.set_gauge('backtest_bars_per_second', bars / seconds, engine=engine)
@@ -0,0 +1,99 @@
+import collections
+import os
+import sys
+import threading
+import time
+
+
+class SamplingProfiler:
+    """
+    Wall-clock sampling profiler for every thread in the process.
+
+    A background thread snapshots all stacks every ``interval`` seconds and
+    counts identical stacks. ``folded`` returns them in the collapsed format
+    (``thread;outer;...;inner count``) read by flamegraph.pl, speedscope
+    and inferno.
+    """
+
+    def __init__(self):
+        self._stacks = collections.Counter()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self.samples = 0
+        self.interval = None
+        self.started_at = None
+        self.stopped_at = None
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, seconds=10.0, interval=0.005):
+        """
+        Sample for ``seconds`` (or until stop) in the background.
+
+        :param seconds: Maximum profiling duration
+        :param interval: Seconds between samples
+        :return: False if a run is already in progress
+        """
+        with self._lock:
+            if self.running:
+                return False
+            self._stacks = collections.Counter()
+            self.samples = 0
+            self.interval = interval
+            self.started_at = time.time()
+            self.stopped_at = None
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._sample, args=(seconds, interval),
+                                            name='sampling-profiler', daemon=True)
+            self._thread.start()
+        return True
+
+    def stop(self):
+        """Stop sampling and wait for the sampler thread"""
+        self._stop.set()
+        thread = self._thread
+        if thread is not None:
+            thread.join()
+
+    def _sample(self, seconds, interval):
+        own_id = threading.get_ident()
+        deadline = time.monotonic() + seconds
+        labels = {}
+        while not self._stop.is_set() and time.monotonic() < deadline:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    label = labels.get(code)
+                    if label is None:
+                        label = labels[code] = f"{os.path.basename(code.co_filename)}:{code.co_name}"
+                    stack.append(label)
+                    frame = frame.f_back
+                stack.append(names.get(thread_id, str(thread_id)).replace(';', ':'))
+                stack.reverse()
+                self._stacks[';'.join(stack)] += 1
+            self.samples += 1
+            self._stop.wait(interval)
+        self.stopped_at = time.time()
+
+    def folded(self):
+        """Collapsed stacks, one 'frame;frame;frame count' line each, heaviest first"""
+        with self._lock:
+            stacks = self._stacks.most_common()
+        return ''.join(f"{stack} {count}\n" for stack, count in stacks)
+
+    def status(self):
+        return {
+            'running': self.running,
+            'samples': self.samples,
+            'interval_ms': self.interval * 1e3 if self.interval else None,
+            'started_at': self.started_at,
+            'stopped_at': self.stopped_at,
+            'distinct_stacks': len(self._stacks),
+        }
@@ -0,0 +1,118 @@
+import os
+
+import pandas as pd
+import pytest
+
+from src.data.storage import candle_export
+from src.data.storage.candle_export import ExportJob
+
+MINUTE_MS = 60_000
+START = 1_700_000_000_000 // MINUTE_MS * MINUTE_MS
+PAGE_ROWS = 40
+CHUNK_ROWS = 100
+
+
+class StubDownloader:
+    """
+    iter_pages over generated 1m candles. With ``fail_after`` set, the stream
+    breaks after that many pages, like a dropped connection would.
+    """
+
+    def __init__(self, fail_after=None):
+        self.fail_after = fail_after
+        self.calls = []
+
+    def iter_pages(self, symbol, interval, start_time, end_time):
+        self.calls.append((symbol, interval, start_time, end_time))
+        # Like Binance, the first candle is the first one opening at or after start_time
+        open_times = list(range(-(-start_time // MINUTE_MS) * MINUTE_MS, end_time, MINUTE_MS))
+        for number, first in enumerate(range(0, len(open_times), PAGE_ROWS)):
+            if number == self.fail_after:
+                raise ConnectionError("stream dropped")
+            yield [[open_time, "1.0", "2.0", "0.5", f"{1 + (open_time - START) / MINUTE_MS / 1000:.3f}", "10.0",
+                    open_time + MINUTE_MS - 1, "0", 1, "0", "0", "0"]
+                   for open_time in open_times[first:first + PAGE_ROWS]]
+
+
+@pytest.fixture
+def now(monkeypatch):
+    """Settable clock for the export, starting well after the exported ranges"""
+    clock = {'ms': START + 10_000 * MINUTE_MS}
+    monkeypatch.setattr(candle_export.time, 'time', lambda: clock['ms'] / 1000)
+    return clock
+
+
+def read_export(job):
+    if job.export_format == 'parquet':
+        import pyarrow.parquet
+        return pyarrow.parquet.read_table(job.path).to_pandas()
+    return pd.read_csv(job.path)
+
+
+def interrupted_then_resumed(directory, export_format, end_time):
+    job = ExportJob(directory, 'btcusdt', '1m', START, end_time, export_format)
+    with pytest.raises(ConnectionError):
+        job.run(StubDownloader(fail_after=4), chunk_rows=CHUNK_ROWS)
+    checkpoint = job.load_checkpoint()
+    assert checkpoint['rows'] == CHUNK_ROWS and not checkpoint['complete']
+
+    # A crash mid-write leaves bytes (or a part file) past the checkpoint
+    if export_format == 'parquet':
+        with open(os.path.join(job.path, f"part-{checkpoint['parts']:05d}.parquet"), 'wb') as part:
+            part.write(b'torn')
+    else:
+        with open(job.path, 'ab') as output:
+            output.write(b'1700000000000,1.0,torn')
+
+    downloader = StubDownloader()
+    checkpoint = job.run(downloader, chunk_rows=CHUNK_ROWS)
+    assert downloader.calls == [('BTCUSDT', '1m', START + (CHUNK_ROWS - 1) * MINUTE_MS + 1, end_time)]
+    return job, checkpoint
+
+
+@pytest.mark.parametrize('export_format', ['csv', 'csv.gz'])
+def test_resumed_export_matches_uninterrupted_one(tmp_path, now, export_format):
+    end_time = START + 350 * MINUTE_MS
+    job, checkpoint = interrupted_then_resumed(str(tmp_path / 'resumed'), export_format, end_time)
+    assert checkpoint['rows'] == 350 and checkpoint['complete']
+
+    clean = ExportJob(str(tmp_path / 'clean'), 'BTCUSDT', '1m', START, end_time, export_format)
+    clean.run(StubDownloader(), chunk_rows=CHUNK_ROWS)
+    resumed_rows, clean_rows = read_export(job), read_export(clean)
+    assert resumed_rows['open_time'].tolist() == list(range(START, end_time, MINUTE_MS))
+    pd.testing.assert_frame_equal(resumed_rows, clean_rows)
+
+
+def test_parquet_export_resumes(tmp_path, now):
+    pytest.importorskip('pyarrow')
+    end_time = START + 350 * MINUTE_MS
+    job, checkpoint = interrupted_then_resumed(str(tmp_path), 'parquet', end_time)
+    assert checkpoint['parts'] == 4 and checkpoint['rows'] == 350
+    rows = read_export(job).sort_values('open_time')
+    assert rows['open_time'].tolist() == list(range(START, end_time, MINUTE_MS))
+
+
+def test_finished_export_is_skipped(tmp_path, now):
+    job = ExportJob(str(tmp_path), 'BTCUSDT', '1m', START, START + 50 * MINUTE_MS, 'csv')
+    job.run(StubDownloader(), chunk_rows=CHUNK_ROWS)
+    downloader = StubDownloader()
+    assert job.run(downloader, chunk_rows=CHUNK_ROWS)['complete']
+    assert downloader.calls == []
+    assert len(read_export(job)) == 50
+
+
+@pytest.mark.parametrize('export_format', ['csv', 'csv.gz'])
+def test_open_range_extends_the_same_file(tmp_path, now, export_format):
+    now['ms'] = START + 250 * MINUTE_MS
+    job = ExportJob(str(tmp_path), 'BTCUSDT', '1m', START, None, export_format)
+    assert job.path.endswith(f"{START}_open.{export_format}")
+    checkpoint = job.run(StubDownloader(), chunk_rows=CHUNK_ROWS)
+    assert checkpoint['rows'] == 250 and not checkpoint['complete']
+
+    # The candle still open at the second run is left for the next one
+    now['ms'] = START + 400 * MINUTE_MS + 30_000
+    downloader = StubDownloader()
+    checkpoint = job.run(downloader, chunk_rows=CHUNK_ROWS)
+    assert downloader.calls == [('BTCUSDT', '1m', START + 249 * MINUTE_MS + 1, now['ms'])]
+    assert checkpoint['rows'] == 400 and not checkpoint['complete']
+    assert read_export(job)['open_time'].tolist() == list(range(START, START + 400 * MINUTE_MS, MINUTE_MS))
@@ -0,0 +1,65 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.trading.technical_analysis.indicators import TechnicalIndicators
+
+
+def make_closes(count=5_000, seed=7):
+    """Random-walk closes with flat stretches, where inexact means flip price vs SMA comparisons"""
+    rng = np.random.default_rng(seed)
+    close = np.round(30000 * np.exp(np.cumsum(rng.normal(0, 0.001, count))), 2)
+    for start in range(100, count, 700):
+        close[start:start + 60] = 30123.45
+    close[count // 2:count // 2 + 30] = 0.15
+    return pd.DataFrame({'close': close})
+
+
+@pytest.fixture
+def df():
+    return make_closes()
+
+
+def test_sma_matches_reference_exactly(df):
+    spec = {'SMA': {'indicator': 'sma', 'period': 20}}
+    actual = TechnicalIndicators.compute_indicators(df, spec)['SMA']
+    expected = TechnicalIndicators.calculate_simple_moving_average(df['close'], 20)
+    np.testing.assert_array_equal(actual.to_numpy(), expected.to_numpy())
+    np.testing.assert_array_equal((df['close'] > actual).to_numpy(), (df['close'] > expected).to_numpy())
+
+
+def test_bollinger_matches_reference_exactly(df):
+    spec = {'BB': {'indicator': 'bollinger', 'period': 20, 'standard_deviation': 2}}
+    actual = TechnicalIndicators.compute_indicators(df, spec)
+    expected = TechnicalIndicators.calculate_bollinger_bands(df['close'], 20, 2)
+    for column, reference in zip(['BB_upper', 'BB_middle', 'BB_lower'], expected):
+        np.testing.assert_array_equal(actual[column].to_numpy(), reference.to_numpy())
+
+
+@pytest.mark.parametrize('indicator, period, reference', [
+    ('ema', 20, TechnicalIndicators.calculate_exponential_moving_average),
+    ('rsi', 14, TechnicalIndicators.calculate_relative_strength_index),
+    ('rsi_wilder', 14, TechnicalIndicators.calculate_wilder_relative_strength_index),
+])
+def test_single_output_indicators_match_reference(df, indicator, period, reference):
+    actual = TechnicalIndicators.compute_indicators(df, {'X': {'indicator': indicator, 'period': period}})['X']
+    expected = reference(df['close'], period)
+    np.testing.assert_allclose(actual.to_numpy(), expected.to_numpy(), rtol=0, atol=1e-8, equal_nan=True)
+
+
+def test_macd_matches_reference(df):
+    spec = {'MACD': {'indicator': 'macd', 'fast_period': 12, 'slow_period': 26, 'signal_period': 9}}
+    actual = TechnicalIndicators.compute_indicators(df, spec)
+    expected = TechnicalIndicators.calculate_moving_average_convergence_divergence(df['close'], 12, 26, 9)
+    for column, reference in zip(['MACD', 'MACD_signal', 'MACD_histogram'], expected):
+        np.testing.assert_allclose(actual[column].to_numpy(), reference.to_numpy(), rtol=0, atol=1e-8)
+
+
+def test_nan_input_falls_back_to_reference(df):
+    df.loc[10:12, 'close'] = np.nan
+    actual = TechnicalIndicators.compute_indicators(df)
+    np.testing.assert_array_equal(actual['SMA'].to_numpy(),
+                                  TechnicalIndicators.calculate_simple_moving_average(df['close'], 20).to_numpy())
+    np.testing.assert_allclose(actual['RSI'].to_numpy(),
+                               TechnicalIndicators.calculate_relative_strength_index(df['close'], 14).to_numpy(),
+                               rtol=0, atol=1e-8, equal_nan=True)
@@ -0,0 +1,101 @@
+import math
+
+import numpy as np
+import pytest
+
+from src.data.data_processing.synthetic_candles import make_minute_candles
+from src.trading.backtesting.backtest_engine import BacktestEngine
+from src.trading.backtesting.replay_engine import ReplayEngine
+from src.trading.technical_analysis.indicators import TechnicalIndicators
+from src.utils import jit
+from src.utils.config_loader import load_config
+
+pytestmark = pytest.mark.skipif(jit.numba is None, reason="Numba is not installed")
+
+BARS = 20_000
+CHUNK_SIZE = 5_000
+# Float recurrences (EMA, Wilder smoothing) may differ from pandas in the last bits;
+# the tolerance is relative to the price level since MACD hovers around zero
+INDICATOR_TOLERANCE = 1e-9
+
+INDICATOR_SPEC = {
+    'SMA': {'indicator': 'sma', 'period': 20},
+    'EMA': {'indicator': 'ema', 'period': 20},
+    'RSI': {'indicator': 'rsi', 'period': 14},
+    'RSI_WILDER': {'indicator': 'rsi_wilder', 'period': 14},
+    'MACD': {'indicator': 'macd', 'fast_period': 12, 'slow_period': 26, 'signal_period': 9},
+    'BB': {'indicator': 'bollinger', 'period': 20, 'standard_deviation': 2},
+}
+STRATEGY_PARAMS = {'sma': True, 'sma_period': 50, 'rsi': True, 'rsi_period': 14}
+
+
+def on_backend(backend, function, *args):
+    previous = jit.backend()
+    jit.set_backend(backend)
+    try:
+        return function(*args)
+    finally:
+        jit.set_backend(previous)
+
+
+def assert_same_results(expected, actual):
+    """Exact comparison of result dicts, ignoring timings"""
+    for key in expected:
+        if key in ('elapsed_seconds', 'bars_per_second'):
+            continue
+        left, right = expected[key], actual[key]
+        if isinstance(left, float) and math.isnan(left) and isinstance(right, float) and math.isnan(right):
+            continue
+        assert left == right, f"'{key}' differs"
+
+
+@pytest.fixture(scope='module')
+def candles():
+    return make_minute_candles(BARS)
+
+
+def test_indicator_kernels_match_numpy_and_pandas(candles):
+    df = candles.to_dataframe()
+    tolerance = INDICATOR_TOLERANCE * float(np.abs(df['close']).max())
+    numpy_columns = on_backend('numpy', TechnicalIndicators.compute_indicators, df, INDICATOR_SPEC)
+    numba_columns = on_backend('numba', TechnicalIndicators.compute_indicators, df, INDICATOR_SPEC)
+    for column in ['SMA', 'BB_upper', 'BB_middle', 'BB_lower']:
+        np.testing.assert_array_equal(numba_columns[column].to_numpy(), numpy_columns[column].to_numpy(),
+                                      err_msg=column)
+    for column in ['EMA', 'RSI', 'RSI_WILDER', 'MACD', 'MACD_signal', 'MACD_histogram']:
+        np.testing.assert_allclose(numba_columns[column].to_numpy(), numpy_columns[column].to_numpy(),
+                                   rtol=0, atol=tolerance, equal_nan=True, err_msg=column)
+
+    reference = {'RSI_WILDER': TechnicalIndicators.calculate_wilder_relative_strength_index(df['close'], 14),
+                 'EMA': TechnicalIndicators.calculate_exponential_moving_average(df['close'], 20)}
+    for column, expected in reference.items():
+        np.testing.assert_allclose(numpy_columns[column].to_numpy(), expected.to_numpy(),
+                                   rtol=0, atol=tolerance, equal_nan=True, err_msg=column)
+
+
+def test_backtest_kernel_matches_numpy(candles):
+    df = candles.to_dataframe()
+    results = [on_backend(backend, BacktestEngine(vectorized=True).run_backtest, df, STRATEGY_PARAMS)
+               for backend in ('numpy', 'numba')]
+    assert_same_results(*results)
+
+
+def test_backtest_kernel_matches_loop(candles):
+    df = candles.to_dataframe()[:2_000]
+    expected = BacktestEngine(vectorized=False).run_backtest(df, STRATEGY_PARAMS)
+    assert_same_results(expected, on_backend('numba', BacktestEngine(vectorized=True).run_backtest,
+                                             df, STRATEGY_PARAMS))
+
+
+@pytest.mark.parametrize('settings', [
+    {'stop_loss': 0.02, 'take_profit': 0.04, 'fee_rate': 0.001, 'slippage_bps': 1.0},
+    {'signal_interval': '15m', 'stop_loss': 0.01, 'position_size': 0.5},
+    {'signal_interval': '1m', 'stop_loss': 0.002, 'take_profit': 0.003},
+])
+def test_replay_kernel_matches_numpy(candles, settings):
+    strategies = load_config().get('strategies', [])
+
+    def replay():
+        chunks = (candles[first:first + CHUNK_SIZE] for first in range(0, len(candles), CHUNK_SIZE))
+        return ReplayEngine(strategies, **settings).replay(chunks)
+    assert_same_results(on_backend('numpy', replay), on_backend('numba', replay))
@@ -0,0 +1,128 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import requests
+
+from src.data.data_fetch.binance_data_fetch.kline_downloader import KlineDownloader, RateLimiter
+
+MINUTE_MS = 60_000
+START = 1_700_000_000_000 // MINUTE_MS * MINUTE_MS
+
+
+class StubBinance(ThreadingHTTPServer):
+    """
+    /klines on localhost serving 1m candles like Binance. Each page also
+    repeats the candle before startTime, so the downloader has duplicates to
+    drop; ``failures`` holds (status, headers) answers returned before any page.
+    """
+
+    daemon_threads = True
+
+    def __init__(self):
+        super().__init__(('127.0.0.1', 0), _Handler)
+        self.requests = []
+        self.failures = []
+        self.lock = threading.Lock()
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {name: values[0] for name, values in parse_qs(url.query).items()}
+        with self.server.lock:
+            self.server.requests.append(params)
+            failure = self.server.failures.pop(0) if self.server.failures else None
+        if failure is not None:
+            status, headers = failure
+            self._reply(status, {'code': -1003, 'msg': 'Too many requests'}, headers)
+            return
+
+        start_time, end_time, limit = int(params['startTime']), int(params['endTime']), int(params['limit'])
+        first = max(START, start_time - MINUTE_MS)
+        candles = [[open_time, "1.0", "2.0", "0.5", "1.5", "10.0", open_time + MINUTE_MS - 1]
+                   for open_time in range(first, end_time + 1, MINUTE_MS)][:limit + 1]
+        self._reply(200, candles, {'X-MBX-USED-WEIGHT-1M': str(len(self.server.requests))})
+
+    def _reply(self, status, body, headers):
+        data = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class RecordingRateLimiter(RateLimiter):
+    """RateLimiter whose backoff is recorded and kept short"""
+
+    def __init__(self):
+        super().__init__()
+        self.backoffs = []
+
+    def backoff(self, attempt, base_delay=1.0, max_delay=60.0):
+        self.backoffs.append(attempt)
+        super().backoff(attempt, base_delay=0.01, max_delay=0.05)
+
+
+@pytest.fixture
+def server():
+    stub = StubBinance()
+    thread = threading.Thread(target=stub.serve_forever, kwargs={'poll_interval': 0.01}, daemon=True)
+    thread.start()
+    yield stub
+    stub.shutdown()
+    stub.server_close()
+
+
+@pytest.fixture
+def downloader(server):
+    with requests.Session() as session:
+        yield KlineDownloader(base_url=f"http://127.0.0.1:{server.server_address[1]}", max_workers=3, limit=100,
+                              max_retries=3, rate_limiter=RecordingRateLimiter(), session=session)
+
+
+def test_split_windows_covers_range_in_pages(downloader):
+    windows = downloader.split_windows('1m', START, START + 250 * MINUTE_MS)
+    assert windows == [(START, START + 100 * MINUTE_MS - 1),
+                       (START + 100 * MINUTE_MS, START + 200 * MINUTE_MS - 1),
+                       (START + 200 * MINUTE_MS, START + 250 * MINUTE_MS - 1)]
+
+
+def test_download_merges_pages_without_duplicates(server, downloader):
+    candles = downloader.download('btcusdt', '1m', START, START + 250 * MINUTE_MS)
+    assert [candle[0] for candle in candles] == list(range(START, START + 250 * MINUTE_MS, MINUTE_MS))
+    assert len(server.requests) == 3
+    assert {params['symbol'] for params in server.requests} == {'BTCUSDT'}
+    assert downloader.rate_limiter.used_weight >= 1
+
+
+def test_iter_pages_yields_ordered_pages(downloader):
+    pages = list(downloader.iter_pages('BTCUSDT', '1m', START, START + 1000 * MINUTE_MS))
+    open_times = [candle[0] for page in pages for candle in page]
+    assert len(pages) == 10
+    assert open_times == list(range(START, START + 1000 * MINUTE_MS, MINUTE_MS))
+
+
+def test_rate_limited_pages_are_retried(server, downloader):
+    server.failures = [(429, {'Retry-After': '0.05'}), (418, {})]
+    candles = downloader.download('BTCUSDT', '1m', START, START + 50 * MINUTE_MS)
+    assert len(candles) == 50
+    assert len(server.requests) == 3
+    # Retry-After is honoured as is; only the 418 without it backs off
+    assert downloader.rate_limiter.backoffs == [1]
+
+
+def test_gives_up_after_max_retries(server, downloader):
+    server.failures = [(429, {})] * (downloader.max_retries + 1)
+    with pytest.raises(requests.HTTPError):
+        downloader.download('BTCUSDT', '1m', START, START + 50 * MINUTE_MS)
+    assert len(server.requests) == downloader.max_retries + 1
+    assert downloader.rate_limiter.backoffs == [0, 1, 2]
@@ -0,0 +1,105 @@
+import numpy as np
+import pytest
+
+from src.data.data_processing.candle_frame import CandleFrame
+from src.data.data_processing.kline_decoder import Kline
+from src.services import live_feed
+from src.services.live_feed import LiveFeedHub
+
+MINUTE_MS = 60_000
+HOUR_MS = 60 * MINUTE_MS
+# 90 minutes into a 4h period that opens at an hour aligned to 4h
+PERIOD_OPEN = 1_700_000_000_000 // (4 * HOUR_MS) * (4 * HOUR_MS)
+NOW = PERIOD_OPEN + 90 * MINUTE_MS + 30_000
+
+
+class RecordingManager:
+    """Stands in for BinanceStreamManager, keeping the callbacks per stream"""
+
+    def __init__(self):
+        self.callbacks = {}
+
+    def subscribe(self, symbol, interval="1m", callback=None):
+        self.callbacks.setdefault((symbol, interval), []).append(callback)
+
+    def unsubscribe(self, symbol, interval="1m", callback=None):
+        self.callbacks[(symbol, interval)].remove(callback)
+        if not self.callbacks[(symbol, interval)]:
+            del self.callbacks[(symbol, interval)]
+
+    def send(self, kline):
+        for callback in list(self.callbacks.get((kline.symbol, kline.interval), [])):
+            callback(kline)
+
+
+def minute_candles(start_time, end_time):
+    open_time = np.arange(start_time, end_time, MINUTE_MS, dtype=np.int64)
+    close = 100.0 + np.arange(len(open_time), dtype=np.float64)
+    return CandleFrame(open_time, close - 0.5, close + 1.0, close - 1.0, close, np.ones(len(open_time)),
+                       open_time + MINUTE_MS - 1)
+
+
+@pytest.fixture
+def manager():
+    return RecordingManager()
+
+
+@pytest.fixture
+def hub(manager, monkeypatch):
+    monkeypatch.setattr(live_feed.time, 'time', lambda: NOW / 1000)
+    history = lambda symbol, interval, limit: [{'time': (PERIOD_OPEN - 4 * HOUR_MS) / 1000, 'open': 1.0,
+                                                'high': 1.0, 'low': 1.0, 'close': 1.0, 'volume': 1.0}]
+    base_history = lambda symbol, start_time: minute_candles(start_time, NOW - 30_000)
+    return LiveFeedHub(history=history, manager=manager, base_history=base_history)
+
+
+def drain(subscription):
+    updates = []
+    while not subscription.updates.empty():
+        updates.append(subscription.updates.get_nowait())
+    return updates
+
+
+def test_higher_timeframes_share_the_base_stream(hub, manager):
+    hourly = hub.subscribe('btcusdt', '1h')
+    four_hourly = hub.subscribe('BTCUSDT', '4h')
+    assert list(manager.callbacks) == [('BTCUSDT', '1m')]
+    assert len(manager.callbacks[('BTCUSDT', '1m')]) == 2
+
+    hub.unsubscribe(hourly)
+    hub.unsubscribe(four_hourly)
+    assert manager.callbacks == {}
+
+
+def test_base_and_finer_intervals_stream_natively(hub, manager):
+    hub.subscribe('BTCUSDT', '1m')
+    hub.subscribe('BTCUSDT', '1s')
+    assert sorted(manager.callbacks) == [('BTCUSDT', '1m'), ('BTCUSDT', '1s')]
+
+
+def test_snapshot_includes_the_seeded_partial_bar(hub):
+    subscription = hub.subscribe('BTCUSDT', '4h')
+    seeded = minute_candles(PERIOD_OPEN, NOW - 30_000)
+    history_bar, partial = subscription.snapshot
+    assert history_bar['time'] == (PERIOD_OPEN - 4 * HOUR_MS) / 1000
+    assert partial['time'] == PERIOD_OPEN / 1000 and not partial['isClosed']
+    assert partial['open'] == seeded.open[0] and partial['close'] == seeded.close[-1]
+    assert partial['high'] == seeded.high.max() and partial['volume'] == 90
+
+
+def test_base_klines_update_the_partial_bar(hub, manager):
+    subscription = hub.subscribe('BTCUSDT', '1h')
+    minute = NOW - 30_000
+    manager.send(Kline('BTCUSDT', '1m', minute, 190.0, 250.0, 189.0, 240.0, 2.0, False))
+    manager.send(Kline('BTCUSDT', '1m', minute, 190.0, 250.0, 189.0, 230.0, 3.0, True))
+    revised, closed_minute = drain(subscription)
+    # 1h bar from 01:00, 30 seeded minutes plus the live one
+    assert revised['interval'] == '1h' and revised['time'] == (PERIOD_OPEN + HOUR_MS) / 1000
+    assert (revised['high'], revised['close'], revised['volume']) == (250.0, 240.0, 32.0)
+    assert (closed_minute['close'], closed_minute['volume'], closed_minute['isClosed']) == (230.0, 33.0, False)
+
+    # The minute ending the hour closes the 1h bar
+    last_minute = PERIOD_OPEN + 2 * HOUR_MS - MINUTE_MS
+    manager.send(Kline('BTCUSDT', '1m', last_minute, 230.0, 231.0, 229.0, 229.5, 1.0, True))
+    (bar,) = drain(subscription)
+    assert bar['isClosed'] and bar['volume'] == 34.0 and bar['close'] == 229.5
@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.data.data_processing.candle_frame import CandleFrame
+from src.data.data_processing.kline_decoder import Kline
+from src.data.data_processing.resampler import CandleResampler, check_resampleable, resample_candles
+
+MINUTE_MS = 60_000
+# A Wednesday afternoon, so the first week and month are partial
+START = int(pd.Timestamp('2024-01-17 13:37', tz='UTC').value // 1_000_000)
+INTERVALS = ['5m', '4h', '1d', '1w', '1M']
+PANDAS_RULES = {'5m': '5min', '4h': '4h', '1d': '1D', '1w': 'W-MON', '1M': 'MS'}
+
+
+def make_minute_candles(count=100_000, seed=5):
+    """Random-walk 1m candles over about ten weeks, with a missing day and a half"""
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.0008, count)))
+    open_ = np.concatenate(([close[0]], close[:-1]))
+    wick = np.abs(rng.normal(0, 0.0005, count)) * close
+    open_time = START + np.arange(count, dtype=np.int64) * MINUTE_MS
+    keep = np.ones(count, dtype=bool)
+    keep[40_000:42_160] = False
+    return CandleFrame(open_time[keep], open_[keep], (np.maximum(open_, close) + wick)[keep],
+                       (np.minimum(open_, close) - wick)[keep], close[keep], rng.uniform(0, 5, count)[keep],
+                       open_time[keep] + MINUTE_MS - 1)
+
+
+def pandas_resample(candles, interval):
+    df = candles.to_dataframe()
+    df.index = pd.to_datetime(df['open_time'], unit='ms', utc=True)
+    resampled = df.resample(PANDAS_RULES[interval], closed='left', label='left').agg(
+        {'open': 'first', 'high': 'max', 'low': 'min', 'close': 'last', 'volume': 'sum', 'open_time': 'count'})
+    return resampled[resampled['open_time'] > 0]
+
+
+def klines(candles, revise_every=0):
+    """Candles as closed Klines, every revise_every-th one preceded by an in-progress revision"""
+    for index, (open_time, open_, high, low, close, volume) in enumerate(zip(
+            candles.open_time.tolist(), candles.open.tolist(), candles.high.tolist(), candles.low.tolist(),
+            candles.close.tolist(), candles.volume.tolist())):
+        if revise_every and index % revise_every == 0:
+            yield Kline('BTCUSDT', '1m', open_time, open_, high * 1.01, low, close * 1.005, volume / 2, False)
+        yield Kline('BTCUSDT', '1m', open_time, open_, high, low, close, volume, True)
+
+
+def closed_bars(updates, interval):
+    closed = [kline for kline in updates if kline.interval == interval and kline.is_closed]
+    return CandleFrame([kline.open_time for kline in closed], [kline.open for kline in closed],
+                       [kline.high for kline in closed], [kline.low for kline in closed],
+                       [kline.close for kline in closed], [kline.volume for kline in closed])
+
+
+def assert_same_candles(actual, expected):
+    np.testing.assert_array_equal(actual.open_time, expected.open_time)
+    for column in ('open', 'high', 'low', 'close'):
+        np.testing.assert_array_equal(actual[column], expected[column], err_msg=column)
+    np.testing.assert_allclose(actual.volume, expected.volume, rtol=1e-12)
+
+
+@pytest.fixture(scope='module')
+def candles():
+    return make_minute_candles()
+
+
+@pytest.mark.parametrize('interval', INTERVALS)
+def test_resample_matches_pandas(candles, interval):
+    resampled = resample_candles(candles, interval)
+    expected = pandas_resample(candles, interval)
+    np.testing.assert_array_equal(resampled.open_time, expected.index.as_unit('ms').asi8)
+    for column in ('open', 'high', 'low', 'close'):
+        np.testing.assert_array_equal(resampled[column], expected[column].to_numpy(), err_msg=column)
+    np.testing.assert_allclose(resampled.volume, expected['volume'].to_numpy(), rtol=1e-12)
+    # Close times are the nominal ones, the next period's open minus 1ms
+    next_open = expected.index + pd.tseries.frequencies.to_offset(PANDAS_RULES[interval])
+    np.testing.assert_array_equal(resampled.close_time, next_open.as_unit('ms').asi8 - 1)
+
+
+def test_complete_only_drops_the_partial_last_candle(candles):
+    assert len(resample_candles(candles, '1w', complete_only=True)) == len(resample_candles(candles, '1w')) - 1
+    whole_days = candles[:-(int(candles.open_time[-1]) // MINUTE_MS % 1440 + 1)]
+    assert len(resample_candles(whole_days, '1d', complete_only=True)) == len(resample_candles(whole_days, '1d'))
+
+
+def test_rejects_intervals_not_built_from_whole_candles():
+    for base, interval in (('1m', '1s'), ('3m', '5m'), ('3d', '1w'), ('1h', '2x')):
+        with pytest.raises(ValueError):
+            check_resampleable(base, interval)
+    check_resampleable('5m', '1M')
+
+
+def test_on_kline_closed_bars_match_resample(candles):
+    resampler = CandleResampler(INTERVALS)
+    # The bars cut short by the missing minutes are closed by the first kline after them
+    updates = [update for kline in klines(candles, revise_every=7) for update in resampler.on_kline(kline)]
+    for interval in INTERVALS:
+        assert_same_candles(closed_bars(updates, interval), resample_candles(candles, interval, complete_only=True))
+
+
+def test_on_kline_reports_the_partial_bar(candles):
+    resampler = CandleResampler(['4h'])
+    minutes = candles[:100]
+    for kline in klines(minutes[:-1]):
+        resampler.on_kline(kline)
+    revision = next(klines(minutes[-1:], revise_every=1))
+    (update,) = resampler.on_kline(revision)
+    expected = resample_candles(minutes, '4h')
+    assert not update.is_closed
+    assert update.open_time == expected.open_time[-1] and update.open == expected.open[-1]
+    assert update.high == max(expected.high[-1], revision.high)
+    assert update.close == revision.close
+    # The revision shows on top of the closed minutes without being kept
+    assert update.volume == pytest.approx(resample_candles(minutes[:-1], '4h').volume[-1] + revision.volume)
+    (partial,) = resampler.partial_bars('BTCUSDT')
+    assert partial.volume == pytest.approx(resample_candles(minutes[:-1], '4h').volume[-1])
+
+
+def test_seeded_resampler_continues_the_period(candles):
+    split = 50_000
+    resampler = CandleResampler(INTERVALS)
+    resampler.seed('BTCUSDT', candles[:split])
+    partial_bars = {kline.interval: kline for kline in resampler.partial_bars('BTCUSDT')}
+    assert {'4h', '1d', '1w', '1M'} <= set(partial_bars)
+    for interval, partial in partial_bars.items():
+        expected = resample_candles(candles[:split], interval)
+        assert partial.open_time == expected.open_time[-1] and partial.low == expected.low[-1]
+        assert partial.volume == pytest.approx(expected.volume[-1])
+
+    updates = [update for kline in klines(candles[split:]) for update in resampler.on_kline(kline)]
+    for interval in INTERVALS:
+        expected = resample_candles(candles, interval, complete_only=True)
+        expected = expected[int(np.searchsorted(expected.close_time, candles.open_time[split])):]
+        assert_same_candles(closed_bars(updates, interval), expected)
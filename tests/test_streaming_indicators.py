@@ -0,0 +1,128 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.trading.technical_analysis.indicators import TechnicalIndicators
+from src.trading.technical_analysis.streaming_indicators import (
+    StreamingBollingerBands,
+    StreamingExponentialMovingAverage,
+    StreamingMovingAverageConvergenceDivergence,
+    StreamingRelativeStrengthIndex,
+    StreamingSimpleMovingAverage,
+    _RollingWindow,
+)
+
+# Running sums drift from pandas' compensated ones in the last bits; the
+# relative part covers pandas' own variance residue next to flat windows
+TOLERANCE = 1e-8
+RELATIVE_TOLERANCE = 1e-12
+# Bars whose in-progress values are also checked against a batch run on the revised closes
+REVISED_BARS = range(0, 3_000, 211)
+
+
+def make_closes(count=3_000, seed=11):
+    """Random-walk closes with flat stretches, which take the same-value path of the windows"""
+    rng = np.random.default_rng(seed)
+    close = np.round(30000 * np.exp(np.cumsum(rng.normal(0, 0.001, count))), 2)
+    for start in range(150, count, 650):
+        close[start:start + 45] = 30123.45
+    return pd.Series(close)
+
+
+def make_indicators():
+    return {
+        'sma': StreamingSimpleMovingAverage(20),
+        'ema': StreamingExponentialMovingAverage(20),
+        'rsi': StreamingRelativeStrengthIndex(14),
+        'macd': StreamingMovingAverageConvergenceDivergence(12, 26, 9),
+        'bollinger': StreamingBollingerBands(20, 2),
+    }
+
+
+def reference(close):
+    """Batch outputs as (bars, lines) arrays, keyed like make_indicators"""
+    return {
+        'sma': TechnicalIndicators.calculate_simple_moving_average(close, 20).to_numpy()[:, None],
+        'ema': TechnicalIndicators.calculate_exponential_moving_average(close, 20).to_numpy()[:, None],
+        'rsi': TechnicalIndicators.calculate_relative_strength_index(close, 14).to_numpy()[:, None],
+        'macd': np.column_stack(TechnicalIndicators.calculate_moving_average_convergence_divergence(close, 12, 26, 9)),
+        'bollinger': np.column_stack(TechnicalIndicators.calculate_bollinger_bands(close, 20, 2)),
+    }
+
+
+def flat_windows(close, period=20):
+    """Bars whose window holds a single value"""
+    rolling = close.rolling(period)
+    return (rolling.max() == rolling.min()).to_numpy()
+
+
+def assert_matches(name, actual, expected, flat):
+    if name == 'bollinger':
+        # Flat windows have exactly zero width here; pandas' variance can leave a residual
+        np.testing.assert_array_equal(actual[flat, 0], actual[flat, 1])
+        np.testing.assert_array_equal(actual[flat, 2], actual[flat, 1])
+        actual, expected = actual[~flat], expected[~flat]
+    np.testing.assert_allclose(actual, expected, rtol=RELATIVE_TOLERANCE, atol=TOLERANCE, equal_nan=True,
+                               err_msg=name)
+
+
+@pytest.fixture(scope='module')
+def close():
+    return make_closes()
+
+
+@pytest.fixture(scope='module')
+def streamed(close):
+    """
+    Every bar fed as two in-progress revisions followed by its final close;
+    returns the closed values and, for REVISED_BARS, the last revision's values
+    """
+    indicators = make_indicators()
+    closed = {name: [] for name in indicators}
+    revised = {name: {} for name in indicators}
+    for bar, value in enumerate(close):
+        for revision in (value * 1.003, value * 0.996):
+            for name, indicator in indicators.items():
+                revised[name][bar] = indicator.update(revision, is_closed=False)
+        for name, indicator in indicators.items():
+            closed[name].append(indicator.update(value))
+    return ({name: np.array(values, dtype=np.float64).reshape(len(close), -1) for name, values in closed.items()},
+            revised)
+
+
+@pytest.mark.parametrize('name', ['sma', 'ema', 'rsi', 'macd', 'bollinger'])
+def test_closed_bars_match_batch(close, streamed, name):
+    closed, _ = streamed
+    assert_matches(name, closed[name], reference(close)[name], flat_windows(close))
+
+
+@pytest.mark.parametrize('name', ['sma', 'ema', 'rsi', 'macd', 'bollinger'])
+def test_in_progress_bars_match_batch_on_revised_close(close, streamed, name):
+    _, revised = streamed
+    for bar in REVISED_BARS:
+        history = close.iloc[:bar + 1].copy()
+        history.iloc[-1] = close.iloc[bar] * 0.996
+        expected = reference(history)[name][-1:]
+        actual = np.array(revised[name][bar], dtype=np.float64).reshape(1, -1)
+        assert_matches(name, actual, expected, flat_windows(history)[-1:])
+
+
+def test_rolling_window_resync_clears_drift():
+    period = 20
+    window = _RollingWindow(period)
+    # Prices around 1e12 leave cancellation error in the running sums once the
+    # window moves down to small values; resyncing every period clears it
+    values = [1e12 + 0.37 * index for index in range(5 * period)] + [1.0 + 0.01 * math.sin(index)
+                                                                      for index in range(5 * period)]
+    for index, value in enumerate(values):
+        window.update(value, is_closed=True)
+        if (index + 1) % period == 0:
+            mean = math.fsum(window.values) / period
+            assert window.mean == mean
+            assert window.m2 == math.fsum((item - mean) ** 2 for item in window.values)
+
+    assert window.pushes == len(values)
+    sma = StreamingSimpleMovingAverage(period)
+    assert sma.extend(values) == pytest.approx(math.fsum(values[-period:]) / period, rel=1e-12)
@@ -0,0 +1,68 @@
+import pytest
+
+from src.trading.execution.simulated_exchange import FILLED, PARTIALLY_FILLED, SimulatedExchange
+from src.trading.execution.trade_executor import TradeExecutor
+
+SYMBOL = 'BTCUSDT'
+
+
+@pytest.fixture
+def executor():
+    def make(**exchange_options):
+        exchange = SimulatedExchange(**exchange_options)
+        exchange.update_price(SYMBOL, 30000.0)
+        created.append(TradeExecutor(exchange, max_workers=1))
+        return created[-1]
+    created = []
+    yield make
+    for trade_executor in created:
+        trade_executor.shutdown()
+
+
+def test_marketable_limit_buy_opens_position(executor):
+    trade_executor = executor()
+    order = trade_executor.place_limit_order(SYMBOL, 'BUY', 0.5, 30100.0)
+    assert order['status'] == FILLED and order['executedQty'] == 0.5
+    position = trade_executor.get_position(SYMBOL)
+    assert position['quantity'] == 0.5
+    assert position['entry_price'] == pytest.approx(order['avgPrice'])
+
+
+def test_resting_limit_buy_opens_no_position(executor):
+    trade_executor = executor()
+    order = trade_executor.place_limit_order(SYMBOL, 'BUY', 0.5, 29000.0)
+    assert order['executedQty'] == 0
+    assert trade_executor.get_position(SYMBOL) is None
+
+
+def test_buys_add_to_position_at_average_price(executor):
+    trade_executor = executor()
+    first = trade_executor.place_market_order(SYMBOL, 'BUY', 0.5)
+    second = trade_executor.place_limit_order(SYMBOL, 'BUY', 0.25, 30100.0)
+    position = trade_executor.get_position(SYMBOL)
+    assert position['quantity'] == pytest.approx(0.75)
+    expected = (first['avgPrice'] * 0.5 + second['avgPrice'] * 0.25) / 0.75
+    assert position['entry_price'] == pytest.approx(expected)
+
+
+def test_partial_close_keeps_remainder(executor):
+    # Levels 50% apart leave only two bid levels above zero, 0.4 BTC of depth
+    trade_executor = executor(impact_bps=5000.0, level_quantity=0.2)
+    trade_executor.place_market_order(SYMBOL, 'BUY', 0.5)
+    order = trade_executor.close_position(SYMBOL)
+    assert order['status'] == PARTIALLY_FILLED
+    assert order['executedQty'] == pytest.approx(0.4)
+    assert trade_executor.get_position(SYMBOL)['quantity'] == pytest.approx(0.1)
+
+    # The rest goes once the book can take it
+    order = trade_executor.close_position(SYMBOL)
+    assert order['status'] == FILLED
+    assert trade_executor.get_position(SYMBOL) is None
+
+
+def test_full_close_removes_position(executor):
+    trade_executor = executor()
+    trade_executor.place_market_order(SYMBOL, 'BUY', 0.5)
+    assert trade_executor.close_position(SYMBOL)['status'] == FILLED
+    assert trade_executor.get_position(SYMBOL) is None
+    assert trade_executor.close_position(SYMBOL) == {'error': 'No position found'}